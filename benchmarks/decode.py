@@ -0,0 +1,39 @@
+"""Benchmark the decoding of the synthetic Web Server responses in tests/fixtures.
+
+Run from the repository root with `python -m benchmarks.decode`.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+from pathlib import Path
+
+from custom_components.delios.client import ParametersData, SensorsData, json_loads
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+CASES = {
+    "dashboard": ("dashboard.json", SensorsData),
+    "info/system": ("info_system.json", ParametersData),
+}
+NUMBER = 20000
+
+
+def main() -> None:
+    """Compare the text and the bytes decoding paths."""
+    for endpoint, (name, data_class) in CASES.items():
+        body = (FIXTURES / name).read_bytes()
+        text = timeit.timeit(
+            lambda: data_class(json.loads(body.decode("utf-8"))), number=NUMBER
+        )
+        raw = timeit.timeit(lambda: data_class(json_loads(body)), number=NUMBER)
+        print(
+            f"{endpoint:12} {len(body):6d} bytes  "
+            f"text {text / NUMBER * 1e6:7.2f}us  "
+            f"bytes {raw / NUMBER * 1e6:7.2f}us  "
+            f"x{text / raw:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark the memory held by the entities of a fleet of inverters.
+
+Run from the repository root with `python -m benchmarks.memory`.
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from types import SimpleNamespace
+
+from custom_components.delios.coordinator import DeliosBinarySensor, DeliosSensor
+from custom_components.delios.entity import (
+    SENSORS,
+    SETTINGS,
+    DeliosEntityType,
+    sample_attributes,
+)
+from custom_components.delios.inverter import DeliosInverter
+
+INVERTERS = 100
+
+
+def build(count: int) -> list:
+    """Create the entities of `count` inverters."""
+    entities = []
+    for index in range(count):
+        inverter = DeliosInverter(name=f"inverter {index}", model="IBRIDO DLS")
+        coordinator = SimpleNamespace(inverter=inverter, data=None)
+        for attribute in [*SENSORS, *SETTINGS, *sample_attributes((60, 300))]:
+            if attribute.type == DeliosEntityType.BINARY_SENSOR:
+                entities.append(DeliosBinarySensor(coordinator, attribute))
+            else:
+                entities.append(DeliosSensor(coordinator, attribute))
+    return entities
+
+
+def main() -> None:
+    """Report the memory allocated per inverter."""
+    build(1)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = build(INVERTERS)
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(
+        f"{INVERTERS} inverters, {len(entities)} entities: "
+        f"{size / 1024:.0f} KiB, {size / INVERTERS / 1024:.1f} KiB per inverter"
+    )
+    for stat in after.compare_to(before, "lineno")[:5]:
+        print(f"  {stat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,36 +4,258 @@ from __future__ import annotations
 
 import contextlib
 import logging
+import time
 
+import attr
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import slugify
 
-from .const import DOMAIN
+from .burst import DeliosBurst
+from .const import (
+    CONF_FLEET,
+    CONF_FRESHNESS,
+    CONF_PROFILE,
+    DATA_BURST,
+    DATA_EXPORTER,
+    DATA_FLEET_COORDINATOR,
+    DATA_JOURNAL,
+    DATA_METRICS,
+    DATA_SAMPLES_COORDINATOR,
+    DATA_SENSORS_COORDINATOR,
+    DATA_STATISTICS,
+    DATA_SYSTEM_COORDINATOR,
+    DOMAIN,
+    SIGNAL_MEMBERS,
+)
+from .coordinator import (
+    DeliosCoordinator,
+    DeliosSensorsCoordinator,
+    async_cache_token,
+    async_connect,
+    async_probe_profile,
+    async_set_profile,
+    async_setup_coordinators,
+    async_shutdown_coordinators,
+)
+from .export import DeliosExporter
+from .fleet import DeliosFleetCoordinator
+from .ingest import DeliosIngestView
+from .inverter import DeliosInverter, inverter_from_data
+from .journal import DeliosJournal
+from .metrics import DeliosMetrics, DeliosMetricsView
+from .profile import profile_from_data
+from .services import async_setup_services
+from .statistics import DeliosStatistics
+from .websocket import async_setup_websocket
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 PLATFORMS: list[str] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+FLEET_PLATFORMS: list[str] = [Platform.SENSOR]
+
+# Inverter settings applied without reloading the entry.
+LIVE_SETTINGS = {
+    "host",
+    "username",
+    "password",
+    "scan_interval",
+    "publish_interval",
+    "stale_grace",
+    "worker",
+}
+# Live settings needing a new client, the credentials only need a new login.
+CONNECTION_SETTINGS = {"host", "worker"}
+# Live settings the journal capacity depends on, a reload resizes it.
+JOURNAL_SETTINGS = {"scan_interval"}
 
 
 # pylint: disable=unused-argument
 async def async_setup(hass: HomeAssistant, config: ConfigType):
     """Set up the Delios integration."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    hass.http.register_view(DeliosMetricsView())
+    hass.http.register_view(DeliosIngestView())
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    if entry.data.get(CONF_FLEET):
+        return await _async_setup_fleet(hass, entry)
+    inverter = inverter_from_data({**entry.data, **entry.options})
+    previous = profile_from_data(entry.data.get(CONF_PROFILE), inverter)
+    coordinators = await async_setup_coordinators(hass, inverter)
+    # A failed probe keeps the previous profile, left out entities stay in
+    # the registry and are unavailable until the inverter reports them.
+    if profile := async_probe_profile(coordinators, previous) or previous:
+        async_set_profile(coordinators, coordinators[0].client, profile)
+        if profile != previous:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_PROFILE: attr.asdict(profile)}
+            )
+    data = hass.data[DOMAIN][inverter.unique_id]
+    metrics = DeliosMetrics(inverter, coordinators)
+    data[DATA_METRICS] = metrics
+    entry.async_on_unload(metrics.async_attach())
+    if "recorder" in hass.config.components:
+        statistics = DeliosStatistics(hass, inverter)
+        data[DATA_STATISTICS] = statistics
+        entry.async_on_unload(
+            statistics.async_attach(
+                data[DATA_SENSORS_COORDINATOR], data[DATA_SYSTEM_COORDINATOR]
+            )
+        )
+    if inverter.journal_hours > 0:
+        await _async_setup_journal(hass, entry, inverter, data)
+    if not inverter.push:
+        burst = DeliosBurst(hass, entry, inverter, data[DATA_SENSORS_COORDINATOR])
+        data[DATA_BURST] = burst
+        entry.async_on_unload(burst.async_cancel)
+        if inverter.burst_on_alarm:
+            entry.async_on_unload(burst.async_attach_alarms())
+    if inverter.export:
+        exporter = DeliosExporter(
+            hass, hass.config.path(DOMAIN, "export", slugify(inverter.name))
+        )
+        data[DATA_EXPORTER] = exporter
+        entry.async_on_unload(
+            exporter.async_attach(
+                data[DATA_SENSORS_COORDINATOR], data[DATA_SYSTEM_COORDINATOR]
+            )
+        )
+        entry.async_on_unload(exporter.async_flush)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_MEMBERS)
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options live, reloading only for structural changes."""
+    inverter = inverter_from_data({**entry.data, **entry.options})
+    data = hass.data[DOMAIN][inverter.unique_id]
+    coordinators: list[DeliosCoordinator] = [
+        data[key]
+        for key in (
+            DATA_SENSORS_COORDINATOR,
+            DATA_SYSTEM_COORDINATOR,
+            DATA_SAMPLES_COORDINATOR,
+        )
+        if key in data
+    ]
+    old = attr.asdict(coordinators[0].inverter)
+    changed = {key for key, value in attr.asdict(inverter).items() if old[key] != value}
+    if not changed:
+        return
+    live = LIVE_SETTINGS
+    if inverter.journal_hours > 0:
+        live = LIVE_SETTINGS - JOURNAL_SETTINGS
+    if changed - live:
+        _LOGGER.debug("Reloading %s to apply %s", inverter.name, sorted(changed))
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    client = coordinators[0].client
+    if client is not None and changed & CONNECTION_SETTINGS:
+        await client.close()
+        client = await async_connect(hass, inverter)
+    elif client is not None and changed & {"username", "password"}:
+        if await client.login(inverter.username, inverter.password):
+            async_cache_token(hass, inverter, client)
+    if client is not None and changed & CONNECTION_SETTINGS:
+        async_set_profile(coordinators, client, coordinators[0].profile)
+    for coordinator in coordinators:
+        coordinator.async_set_client(client)
+        coordinator.async_update_inverter(inverter)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry."""
-    await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    """Unload a config entry and release everything it holds."""
+    if not await hass.config_entries.async_unload_platforms(
+        entry, FLEET_PLATFORMS if entry.data.get(CONF_FLEET) else PLATFORMS
+    ):
+        return False
+    unique_id = inverter_from_data(entry.data).unique_id
+    data = hass.data.get(DOMAIN, {}).pop(unique_id, {})
+    if not entry.data.get(CONF_FLEET):
+        async_dispatcher_send(hass, SIGNAL_MEMBERS)
+    await async_shutdown_coordinators(data)
+    data.clear()
     return True
+
+
+async def _async_setup_fleet(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up the aggregate of every loaded inverter."""
+    inverter = inverter_from_data(entry.data)
+    coordinator = DeliosFleetCoordinator(hass, inverter, entry.data[CONF_FRESHNESS])
+    hass.data[DOMAIN][inverter.unique_id] = {DATA_FLEET_COORDINATOR: coordinator}
+    await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_detach)
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_MEMBERS, coordinator.async_sync_members)
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, FLEET_PLATFORMS)
+    return True
+
+
+async def _async_setup_journal(
+    hass: HomeAssistant, entry: ConfigEntry, inverter: DeliosInverter, data: dict
+) -> None:
+    """Journal every dashboard sample to a memory-mapped ring file."""
+    coordinator: DeliosSensorsCoordinator = data[DATA_SENSORS_COORDINATOR]
+    if not coordinator.data or coordinator.data.get("sensors") is None:
+        # Pushed inverters have no sample yet, wait for the first one.
+        remove_listener = None
+
+        @callback
+        def async_first_sample() -> None:
+            nonlocal remove_listener
+            if not coordinator.data or coordinator.data.get("sensors") is None:
+                return
+            remove_listener()
+            remove_listener = None
+            entry.async_create_task(
+                hass, _async_setup_journal(hass, entry, inverter, data)
+            )
+
+        @callback
+        def async_cancel() -> None:
+            if remove_listener:
+                remove_listener()
+
+        remove_listener = coordinator.async_add_listener(async_first_sample)
+        entry.async_on_unload(async_cancel)
+        return
+    names = coordinator.data["sensors"].names
+    journal = DeliosJournal(
+        hass.config.path(DOMAIN, f"{inverter.unique_id}.journal"),
+        names,
+        inverter.journal_hours * 3600 // max(inverter.scan_interval, 1),
+    )
+    await hass.async_add_executor_job(journal.open)
+    data[DATA_JOURNAL] = journal
+
+    @callback
+    def async_journal_sample() -> None:
+        sensors = (coordinator.data or {}).get("sensors")
+        if sensors is None:
+            return
+        journal.append(time.time(), sensors.values(names))
+
+    async def async_close_journal() -> None:
+        data.pop(DATA_JOURNAL, None)
+        await hass.async_add_executor_job(journal.close)
+
+    entry.async_on_unload(coordinator.async_add_listener(async_journal_sample))
+    entry.async_on_unload(async_close_journal)
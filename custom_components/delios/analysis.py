@@ -0,0 +1,192 @@
+"""Delios historical sample analysis."""
+
+from __future__ import annotations
+
+import csv
+import glob
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import numpy as np
+
+from .export import TIMESTAMP
+from .journal import DeliosJournal
+
+try:
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+_LOGGER = logging.getLogger(__name__)
+
+Columns = dict[str, np.ndarray]
+
+# NumPy 2 renamed trapz, which later releases remove.
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+CLIPPING_RATIO = 0.98
+IMBALANCE_MIN_POWER = 100.0
+RISO_VARIABLES = ("Riso1", "Riso2", "RisoM")
+
+
+def _read_file(path: str) -> dict[str, list]:
+    """Read an export file into columns."""
+    if path.endswith(".parquet"):
+        if pyarrow is None:
+            _LOGGER.warning("Skipping %s, pyarrow is not installed", path)
+            return {}
+        return pyarrow.parquet.read_table(path).to_pydict()
+    with gzip.open(path, "rt", newline="") as file:
+        columns: dict[str, list] = {}
+        for row in csv.DictReader(file):
+            for column, value in row.items():
+                columns.setdefault(column, []).append(value or "nan")
+        return columns
+
+
+def _concat(chunks: list[dict[str, list]]) -> Columns:
+    """Join column chunks into float arrays sorted by timestamp."""
+    names = {name for chunk in chunks for name in chunk}
+    if TIMESTAMP not in names:
+        return {}
+    columns = {
+        name: np.concatenate(
+            [
+                np.asarray(chunk.get(name, [np.nan] * len(chunk[TIMESTAMP])), float)
+                for chunk in chunks
+            ]
+        )
+        for name in names
+    }
+    order = np.argsort(columns[TIMESTAMP], kind="stable")
+    return {name: column[order] for name, column in columns.items()}
+
+
+def load_export(directory: str, kind: str, start: float, end: float) -> Columns:
+    """Load the exported samples of a kind between two timestamps."""
+    chunks = []
+    day = datetime.fromtimestamp(start, timezone.utc).date()
+    while day <= datetime.fromtimestamp(end, timezone.utc).date():
+        pattern = os.path.join(directory, day.isoformat(), f"{kind}-*")
+        for path in sorted(glob.glob(pattern)):
+            if chunk := _read_file(path):
+                chunks.append(chunk)
+        day += timedelta(days=1)
+    columns = _concat(chunks)
+    if not columns:
+        return {}
+    mask = (columns[TIMESTAMP] >= start) & (columns[TIMESTAMP] <= end)
+    return {name: column[mask] for name, column in columns.items()}
+
+
+def load_journal(journal: DeliosJournal, start: float, end: float) -> Columns:
+    """Load the journaled samples between two timestamps."""
+    records = np.asarray(journal.read(start, end), float)
+    if not len(records):
+        return {}
+    columns = {TIMESTAMP: records[:, 0]}
+    for index, name in enumerate(journal.variables, start=1):
+        columns[name] = records[:, index]
+    return columns
+
+
+def _energy(columns: Columns, name: str) -> float | None:
+    """Integrate a kW column over time, in kWh."""
+    if name not in columns or len(columns[name]) < 2:
+        return None
+    power = np.nan_to_num(columns[name])
+    return float(_trapezoid(power, columns[TIMESTAMP]) / 3600)
+
+
+def _self_consumption(totalizer: Columns) -> float | None:
+    """Return the self-consumed share of the photovoltaic energy."""
+    if "photovoltaic" not in totalizer or len(totalizer["photovoltaic"]) < 2:
+        return None
+    produced = np.nanmax(totalizer["photovoltaic"]) - np.nanmin(
+        totalizer["photovoltaic"]
+    )
+    consumed = np.nanmax(totalizer["self_consumed"]) - np.nanmin(
+        totalizer["self_consumed"]
+    )
+    return float(consumed / produced) if produced > 0 else None
+
+
+def _clipping(sensors: Columns, limit: float | None) -> dict[str, Any] | None:
+    """Return how long photovoltaic power sat at the clipping limit."""
+    if "PowerPV" not in sensors or len(sensors["PowerPV"]) < 2:
+        return None
+    power = sensors["PowerPV"]
+    if limit is None:
+        limit = float(np.nanmax(power)) * CLIPPING_RATIO
+    durations = np.diff(sensors[TIMESTAMP], append=sensors[TIMESTAMP][-1])
+    clipped = power >= limit
+    producing = power > 0
+    return {
+        "limit": limit,
+        "hours": float(durations[clipped].sum() / 3600),
+        "ratio": (
+            float(durations[clipped].sum() / durations[producing].sum())
+            if durations[producing].sum() > 0
+            else None
+        ),
+    }
+
+
+def _string_imbalance(sensors: Columns) -> dict[str, Any] | None:
+    """Return the relative power imbalance between the two PV strings."""
+    if not {"IS1", "VS1", "IS2", "VS2"} <= sensors.keys():
+        return None
+    string_1 = sensors["IS1"] * sensors["VS1"]
+    string_2 = sensors["IS2"] * sensors["VS2"]
+    total = string_1 + string_2
+    mask = total > IMBALANCE_MIN_POWER
+    if not mask.any():
+        return None
+    imbalance = np.abs(string_1[mask] - string_2[mask]) / total[mask]
+    return {
+        "mean": float(np.mean(imbalance)),
+        "p95": float(np.percentile(imbalance, 95)),
+        "string_1_share": float(string_1[mask].sum() / total[mask].sum()),
+    }
+
+
+def _riso_drift(parameters: Columns) -> dict[str, Any] | None:
+    """Return the insulation resistance trend, in KOhm per day."""
+    drift = {}
+    for name in RISO_VARIABLES:
+        if name not in parameters:
+            continue
+        mask = ~np.isnan(parameters[name])
+        if mask.sum() < 2:
+            continue
+        days = parameters[TIMESTAMP][mask] / 86400
+        values = parameters[name][mask]
+        slope = np.polyfit(days - days[0], values, 1)[0]
+        drift[name] = {
+            "first": float(values[0]),
+            "last": float(values[-1]),
+            "min": float(values.min()),
+            "slope_per_day": float(slope),
+        }
+    return drift or None
+
+
+def analyze(
+    sensors: Columns,
+    parameters: Columns,
+    totalizer: Columns,
+    clipping_limit: float | None = None,
+) -> dict[str, Any]:
+    """Compute the summary report of a sample range."""
+    return {
+        "samples": len(sensors.get(TIMESTAMP, ())),
+        "photovoltaic_energy": _energy(sensors, "PowerPV"),
+        "house_energy": _energy(sensors, "PowerHouse"),
+        "self_consumption_ratio": _self_consumption(totalizer),
+        "clipping": _clipping(sensors, clipping_limit),
+        "string_imbalance": _string_imbalance(sensors),
+        "riso_drift": _riso_drift(parameters),
+    }
@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
-from .coordinator import DeliosSensorsCoordinator, DeliosSystemCoordinator
+from .coordinator import async_get_coordinators
 from .entity import DeliosEntityType
 from .inverter import inverter_from_data
 
@@ -23,20 +23,14 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add binary sensors for passed config_entry in HA."""
-    inverter = inverter_from_data(config_entry.data)
+    inverter = inverter_from_data({**config_entry.data, **config_entry.options})
     hass.data.setdefault(DOMAIN, {})
     if inverter.unique_id not in hass.data[DOMAIN]:
         hass.data[DOMAIN][inverter.unique_id] = {}
     if BINARY_SENSOR_DOMAIN not in hass.data[DOMAIN][inverter.unique_id]:
         hass.data[DOMAIN][inverter.unique_id][BINARY_SENSOR_DOMAIN] = {}
-    sensors_coordinator = DeliosSensorsCoordinator(hass, inverter)
-    await sensors_coordinator.setup()
-    await sensors_coordinator.async_config_entry_first_refresh()
-    sensors_coordinator.add_entities(async_add_entities, DeliosEntityType.BINARY_SENSOR)
-    system_coordinator = DeliosSystemCoordinator(hass, inverter)
-    await system_coordinator.setup()
-    await system_coordinator.async_config_entry_first_refresh()
-    system_coordinator.add_entities(async_add_entities, DeliosEntityType.BINARY_SENSOR)
+    for coordinator in await async_get_coordinators(hass, inverter):
+        coordinator.add_entities(async_add_entities, DeliosEntityType.BINARY_SENSOR)
 
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
@@ -0,0 +1,146 @@
+"""Delios burst sampling."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import logging
+import math
+import os
+import time
+from typing import Any
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .client import InvalidAttribute, UnauthorizedClient
+from .const import DEFAULT_BURST_DURATION, DEFAULT_BURST_INTERVAL, DOMAIN
+from .coordinator import DeliosCoordinator
+from .inverter import DeliosInverter
+
+_LOGGER = logging.getLogger(__name__)
+
+BURST_ALARMS: tuple[str, ...] = ("InvAlarm", "PVAlarm", "BattAlarm")
+
+
+class DeliosBurst:
+    """Short high-rate capture of the dashboard to a CSV file.
+
+    Bursts poll the web server through the client of the sensors
+    coordinator without touching its data, so entities and listeners
+    only see the regular polls.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        inverter: DeliosInverter,
+        coordinator: DeliosCoordinator,
+    ) -> None:
+        """Initialize burst sampling."""
+        self._hass = hass
+        self._entry = entry
+        self._inverter = inverter
+        self._coordinator = coordinator
+        self._task: asyncio.Task | None = None
+        self._alarms: dict[str, float] = {}
+
+    @property
+    def running(self) -> bool:
+        """Return whether a burst is in progress."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def async_start(self, interval: float, duration: float) -> asyncio.Task:
+        """Start a burst in the background."""
+        self._task = self._entry.async_create_background_task(
+            self._hass,
+            self._async_capture(interval, duration),
+            f"{DOMAIN} burst {self._inverter.name}",
+        )
+        return self._task
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop the running burst, keeping the samples read so far."""
+        if self._task is not None:
+            self._task.cancel()
+
+    @callback
+    def async_attach_alarms(self) -> CALLBACK_TYPE:
+        """Start a burst when an alarm of the sensors data becomes active."""
+        return self._coordinator.async_add_listener(self._async_alarm_updated)
+
+    @callback
+    def _async_alarm_updated(self) -> None:
+        """Check the alarms for a rising edge."""
+        sensors = (self._coordinator.data or {}).get("sensors")
+        if sensors is None:
+            return
+        alarms = dict(zip(BURST_ALARMS, sensors.values(BURST_ALARMS)))
+        raised = [
+            name
+            for name, value in alarms.items()
+            if value and not math.isnan(value) and not self._alarms.get(name)
+        ]
+        self._alarms = {
+            name: 0.0 if math.isnan(value) else value for name, value in alarms.items()
+        }
+        if raised and not self.running:
+            _LOGGER.info("%s raised %s, starting a burst", self._inverter.name, raised)
+            self.async_start(DEFAULT_BURST_INTERVAL, DEFAULT_BURST_DURATION)
+
+    async def _async_capture(self, interval: float, duration: float) -> dict[str, Any]:
+        """Poll the dashboard every `interval` seconds for `duration` seconds."""
+        start = time.time()
+        path = self._hass.config.path(
+            DOMAIN, "bursts", f"{slugify(self._inverter.name)}-{int(start)}.csv"
+        )
+        names: list[str] = []
+        rows: list[list[float]] = []
+        errors = 0
+        deadline = time.monotonic()
+        end = deadline + duration
+        try:
+            while deadline < end:
+                client = self._coordinator.client
+                try:
+                    sensors = await client.sensors()
+                except (
+                    UnauthorizedClient,
+                    InvalidAttribute,
+                    aiohttp.ClientError,
+                    asyncio.TimeoutError,
+                ) as exception:
+                    errors += 1
+                    _LOGGER.debug("Burst sample failed: %r", exception)
+                    sensors = None
+                if sensors is not None:
+                    if not names:
+                        names = sensors.names
+                    rows.append([time.time(), *sensors.values(names)])
+                # Keep the cadence, skipping the slots a slow response overran.
+                now = time.monotonic()
+                deadline += interval * max(1, math.ceil((now - deadline) / interval))
+                await asyncio.sleep(max(deadline - now, 0))
+        finally:
+            await self._hass.async_add_executor_job(_write, path, names, rows)
+            _LOGGER.debug(
+                "Burst of %s wrote %d samples to %s",
+                self._inverter.name,
+                len(rows),
+                path,
+            )
+        return {"file": path, "samples": len(rows), "errors": errors}
+
+
+def _write(path: str, names: list[str], rows: list[list[float]]) -> None:
+    """Write the burst samples as CSV."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", *names])
+        writer.writerows(rows)
@@ -4,37 +4,133 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Any, Optional
+import math
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection, Iterable
+from typing import TYPE_CHECKING, Any, Optional
 
 import aiohttp
 from attr import dataclass
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+
+from .profiler import stage
+
+if TYPE_CHECKING:
+    from .profiler import DeliosProfiler
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # delios_collector runs without Home Assistant installed.
+    from json import loads as json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
 VALIDATE_STRUCTURE = "http://{}/"
 ENDPOINT_STRUCTURE = "http://{}/api/v1/{}"
 DEFAULT_TIMEOUT = 10
+MIN_TIMEOUT = 1
+LATENCY_GAIN = 0.125
+DEVIATION_GAIN = 0.25
+TIMEOUT_DEVIATIONS = 4
+MAX_BACKOFF = 4
+
+
+class DeliosTransport(ABC):
+    """Transport reading decoded data from a Delios inverter."""
+
+    # Dashboard and parameter variables to decode, None for every variable.
+    variables: Optional[frozenset[str]] = None
+    # Profile timing the decoding, if running.
+    profiler: Optional[DeliosProfiler] = None
+
+    @abstractmethod
+    async def validate(self) -> bool:
+        """Check the inverter is reachable."""
+
+    @abstractmethod
+    async def login(self, username: str, password: str) -> bool:
+        """Authenticate to the inverter."""
+
+    async def close(self) -> None:
+        """Release the transport resources."""
+
+    @abstractmethod
+    async def sensors(self) -> SensorsData | None:
+        """Read sensors data."""
+
+    @abstractmethod
+    async def status(self) -> StatusData | None:
+        """Read status data."""
+
+    @abstractmethod
+    async def parameters(self) -> ParametersData | None:
+        """Read parameters data."""
+
+    @abstractmethod
+    async def totalizer(self) -> TotalizerData | None:
+        """Read totalizer data."""
+
+    @abstractmethod
+    async def firmware(self) -> FirmwareData | None:
+        """Read firmware data."""
 
 
-class DeliosClient:
-    """Client for Delios Web Server."""
+class DeliosClient(DeliosTransport):
+    """Client for Delios Web Server.
 
-    def __init__(self, hass: HomeAssistant, host: str) -> None:
+    The client only needs an aiohttp session, so it runs with or without
+    Home Assistant.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, host: str) -> None:
         """Initialize a new Client."""
-        self._hass = hass
+        self._session = session
         self._host = host
         self._token = None
+        self.latency: dict[str, RequestLatency] = {}
+        self._responses: dict[str, CachedResponse] = {}
+        self._variables: Optional[frozenset[str]] = None
+
+    @property
+    def host(self) -> str:
+        """Return the Web Server host."""
+        return self._host
+
+    @property
+    def token(self) -> AccessToken | None:
+        """Return the access token."""
+        return self._token
+
+    @token.setter
+    def token(self, token: AccessToken | None) -> None:
+        """Reuse an access token obtained by another client."""
+        self._token = token
+
+    @property
+    def variables(self) -> Optional[frozenset[str]]:
+        """Return the variables to decode, None for every variable."""
+        return self._variables
+
+    @variables.setter
+    def variables(self, variables: Optional[frozenset[str]]) -> None:
+        """Decode only `variables` from the next responses."""
+        self._variables = variables
+        self._responses.clear()
+
+    @property
+    def authenticated(self) -> bool:
+        """Return whether the client holds an access token."""
+        return self._token is not None
+
+    def logout(self) -> None:
+        """Drop the access token."""
+        self._token = None
 
     async def validate(self) -> bool:
         """Validate the configured Host to check if it is a valid Delios Web Server."""
         try:
             endpoint = VALIDATE_STRUCTURE.format(self._host)
-            session = aiohttp_client.async_get_clientsession(
-                self._hass, verify_ssl=False
-            )
-            async with session.get(endpoint, timeout=DEFAULT_TIMEOUT) as response:
+            async with self._session.get(endpoint, timeout=DEFAULT_TIMEOUT) as response:
                 if response.status == 200:
                     return True
         except asyncio.TimeoutError:
@@ -48,10 +144,7 @@ class DeliosClient:
         try:
             endpoint = ENDPOINT_STRUCTURE.format(self._host, "token")
             auth = aiohttp.BasicAuth(login=username, password=password)
-            session = aiohttp_client.async_get_clientsession(
-                self._hass, verify_ssl=False
-            )
-            async with session.get(
+            async with self._session.get(
                 endpoint, timeout=DEFAULT_TIMEOUT, auth=auth
             ) as response:
                 if response.status == 200:
@@ -72,51 +165,117 @@ class DeliosClient:
 
     async def sensors(self) -> SensorsData | None:
         """Request sensors data to Delios Web Server."""
-        data = await self.__request("dashboard")
-        if data is not None:
-            return SensorsData(data)
+        return await self.__request(
+            "dashboard", lambda data: SensorsData(data, self._variables)
+        )
 
     async def status(self) -> StatusData | None:
         """Request status data to Delios Web Server."""
-        data = await self.__request("system/status")
-        if data is not None:
-            return StatusData(data)
+        return await self.__request("system/status", StatusData)
 
     async def parameters(self) -> ParametersData | None:
         """Request parameters data to Delios Web Server."""
-        data = await self.__request("info/system")
-        if data is not None:
-            return ParametersData(data)
+        return await self.__request(
+            "info/system", lambda data: ParametersData(data, self._variables)
+        )
 
     async def totalizer(self) -> TotalizerData | None:
         """Request totalizer data to Delios Web Server."""
-        data = await self.__request("info/totalizer")
-        if data is not None:
-            return TotalizerData(data)
+        return await self.__request("info/totalizer", TotalizerData)
 
     async def firmware(self) -> FirmwareData | None:
         """Request firmware data to Delios Web Server."""
-        data = await self.__request("info/firmware")
-        if data is not None:
-            return FirmwareData(data)
+        return await self.__request("info/firmware", FirmwareData)
+
+    async def __request(self, endpoint: str, decode: Callable[[dict], Any]) -> Any:
+        """Make a request to Delios Web Server.
 
-    async def __request(self, endpoint: str) -> dict | None:
-        """Make a request to Delios Web Server."""
+        A response identical to the previous one, or a 304 to a conditional
+        request, returns the previously decoded object without decoding.
+        """
         if self._token is None:
             raise UnauthorizedClient
-        session = aiohttp_client.async_get_clientsession(self._hass, verify_ssl=False)
-        endpoint = ENDPOINT_STRUCTURE.format(self._host, endpoint)
+        latency = self.latency.setdefault(endpoint, RequestLatency())
+        cached = self._responses.get(endpoint)
         headers = {"x-access-token": self._token.api_key}
-        async with session.get(
-            endpoint, timeout=DEFAULT_TIMEOUT, headers=headers
-        ) as response:
-            if response.status == 401:
-                raise UnauthorizedClient
-            elif response.status == 200:
-                return await response.json()
+        if cached is not None and cached.etag is not None:
+            headers[aiohttp.hdrs.IF_NONE_MATCH] = cached.etag
+        if cached is not None and cached.last_modified is not None:
+            headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+        start = time.monotonic()
+        try:
+            async with self._session.get(
+                ENDPOINT_STRUCTURE.format(self._host, endpoint),
+                timeout=latency.timeout,
+                headers=headers,
+            ) as response:
+                if response.status == 401:
+                    raise UnauthorizedClient
+                elif response.status == 304 and cached is not None:
+                    latency.observe(time.monotonic() - start)
+                    return cached.data
+                elif response.status == 200:
+                    body = await response.read()
+                    latency.observe(time.monotonic() - start)
+                    digest = hash(body)
+                    if cached is None or cached.digest != digest:
+                        with stage(self.profiler, "decode"):
+                            cached = CachedResponse(digest, decode(json_loads(body)))
+                        self._responses[endpoint] = cached
+                    cached.etag = response.headers.get(aiohttp.hdrs.ETAG)
+                    cached.last_modified = response.headers.get(
+                        aiohttp.hdrs.LAST_MODIFIED
+                    )
+                    return cached.data
+        except asyncio.TimeoutError:
+            latency.backoff = min(latency.backoff + 1, MAX_BACKOFF)
+            raise
+
+
+@dataclass(slots=True)
+class RequestLatency:
+    """Smoothed latency of an endpoint.
+
+    The request timeout follows the TCP retransmission timer: the smoothed
+    latency plus four mean deviations, clamped between `MIN_TIMEOUT` and
+    `DEFAULT_TIMEOUT` and doubled after each timeout until a response.
+    """
+
+    average: Optional[float] = None
+    deviation: float = 0.0
+    backoff: int = 0
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout of the next request."""
+        if self.average is None:
+            return DEFAULT_TIMEOUT
+        timeout = self.average + TIMEOUT_DEVIATIONS * self.deviation
+        return min(max(timeout, MIN_TIMEOUT) * 2**self.backoff, DEFAULT_TIMEOUT)
+
+    def observe(self, seconds: float) -> None:
+        """Update the estimate with the latency of a response."""
+        if self.average is None:
+            self.average, self.deviation = seconds, seconds / 2
+        else:
+            self.deviation += DEVIATION_GAIN * (
+                abs(seconds - self.average) - self.deviation
+            )
+            self.average += LATENCY_GAIN * (seconds - self.average)
+        self.backoff = 0
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """Last response of an endpoint and the object decoded from it."""
 
+    digest: int
+    data: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class AccessToken:
     """Access token representation for Delios Web Server."""
 
@@ -129,12 +288,29 @@ class AccessToken:
 class SensorsData:
     """Sensors data from Delios Web Server."""
 
-    def __init__(self, data: dict) -> None:
-        """Initialize sensors data from JSON."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict, names: Optional[Collection[str]] = None) -> None:
+        """Initialize sensors data from JSON, keeping only `names` if given."""
         self._data = {}
         if "variables" in data:
             for variable in data["variables"]:
-                self._data[variable["ctrl_name"]] = variable["value"]
+                if names is None or variable["ctrl_name"] in names:
+                    self._data[variable["ctrl_name"]] = variable["value"]
+
+    @classmethod
+    def from_values(cls, names: Iterable[str], values: Iterable[float]) -> SensorsData:
+        """Build sensors data from decoded values, leaving out the NaN ones."""
+        data = cls({})
+        data._data = {
+            name: value for name, value in zip(names, values) if not math.isnan(value)
+        }
+        return data
+
+    @property
+    def names(self) -> list[str]:
+        """Return the reported sensor names."""
+        return list(self._data)
 
     def get(self, name: str) -> Any:
         """Read a single sensor value."""
@@ -142,10 +318,16 @@ class SensorsData:
             return float(self._data[name])
         raise InvalidAttribute(name)
 
+    def values(self, names: Iterable[str]) -> list[float]:
+        """Read several sensor values, NaN for the missing or non numeric ones."""
+        return [_float(self._data.get(name)) for name in names]
+
 
 class StatusData:
     """Status data from Delios Web Server."""
 
+    __slots__ = ("usb", "wifi", "lan")
+
     def __init__(self, data: dict) -> None:
         """Initialize status data from JSON."""
         self.usb = data["usb"]
@@ -156,12 +338,31 @@ class StatusData:
 class ParametersData:
     """Parameters data from Delios Web Server."""
 
-    def __init__(self, data: dict) -> None:
-        """Initialize paramters data from JSON."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict, names: Optional[Collection[str]] = None) -> None:
+        """Initialize paramters data from JSON, keeping only `names` if given."""
         self._data = {}
         if "variables" in data:
             for variable in data["variables"]:
-                self._data[variable["ctrl_name"]] = variable["value"]
+                if names is None or variable["ctrl_name"] in names:
+                    self._data[variable["ctrl_name"]] = variable["value"]
+
+    @classmethod
+    def from_values(
+        cls, names: Iterable[str], values: Iterable[float]
+    ) -> ParametersData:
+        """Build parameters data from decoded values, leaving out the NaN ones."""
+        data = cls({})
+        data._data = {
+            name: value for name, value in zip(names, values) if not math.isnan(value)
+        }
+        return data
+
+    @property
+    def names(self) -> list[str]:
+        """Return the reported parameter names."""
+        return list(self._data)
 
     def get(self, name: str) -> Any:
         """Read a single parameter value."""
@@ -169,10 +370,16 @@ class ParametersData:
             return float(self._data[name])
         raise InvalidAttribute(name)
 
+    def values(self, names: Iterable[str]) -> list[float]:
+        """Read several parameter values, NaN for the missing or non numeric ones."""
+        return [_float(self._data.get(name)) for name in names]
+
 
 class TotalizerData:
     """Totalizer data from Delios Web Server."""
 
+    __slots__ = ("photovoltaic", "buyed", "injected", "self_consumed")
+
     def __init__(self, data: dict) -> None:
         """Initialize totalizer data from JSON."""
         self.photovoltaic = float(data["totalizers"]["TotalEnergyPV"])
@@ -180,12 +387,25 @@ class TotalizerData:
         self.injected = float(data["totalizers"]["TotalEnergyInjected"])
         self.self_consumed = float(data["totalizers"]["TotalEnergySelfConsumed"])
 
+    @property
+    def names(self) -> list[str]:
+        """Return the totalizer names."""
+        return list(self.__slots__)
+
+    def values(self, names: Iterable[str]) -> list[float]:
+        """Read several totalizers, NaN for the unknown ones."""
+        return [getattr(self, name, math.nan) for name in names]
+
 
 class FirmwareData:
     """Firmware data from Delios Web Server."""
 
+    __slots__ = ("machine", "grid", "photovoltaic", "battery", "firmware")
+
     def __init__(self, data: dict) -> None:
         """Initialize firmware data from JSON."""
+        self.machine = self.grid = self.photovoltaic = self.battery = None
+        self.firmware = None
         if "variables" in data:
             for variable in data["variables"]:
                 if variable["ctrl_name"] == "MachineFW":
@@ -200,6 +420,14 @@ class FirmwareData:
                     self.firmware = variable["value"]
 
 
+def _float(value: Any) -> float:
+    """Convert a raw value to float, NaN when missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
 class UnauthorizedClient(Exception):
     """Unauthorized client exception."""
 
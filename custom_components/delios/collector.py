@@ -0,0 +1,257 @@
+"""Headless Delios collector.
+
+Polls several inverters without Home Assistant and writes the decoded
+samples as JSON lines or InfluxDB line protocol:
+
+    python -m delios_collector 192.168.1.10 user:secret@192.168.1.11
+
+Only HA-free modules may be imported here, see delios_collector.
+
+`--bench` hammers every inverter with back-to-back requests instead and
+reports the request rate and latency percentiles per host.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from collections.abc import Callable, Iterable
+from typing import IO, Any
+
+import aiohttp
+from attr import dataclass
+
+from .client import DeliosClient, UnauthorizedClient
+from .const import DEFAULT_SCAN_INTERVAL, DEFAULT_USERNAME
+from .samples import percentile
+
+_LOGGER = logging.getLogger(__name__)
+
+KINDS = ("sensors", "parameters", "totalizer")
+FORMAT_JSONL = "jsonl"
+FORMAT_LINE = "line"
+DEFAULT_PARALLEL = 4
+DEFAULT_BENCH_REQUESTS = 100
+
+
+@dataclass
+class CollectorTarget:
+    """Inverter polled by the collector."""
+
+    host: str = ""
+    username: str = DEFAULT_USERNAME
+    password: str = ""
+
+
+def parse_target(value: str, username: str, password: str) -> CollectorTarget:
+    """Parse a `[username[:password]@]host` target."""
+    credentials, _, host = value.rpartition("@")
+    if credentials:
+        username, _, secret = credentials.partition(":")
+        password = secret or password
+    return CollectorTarget(host=host, username=username, password=password)
+
+
+def sample_fields(data: Any) -> dict[str, float]:
+    """Return the numeric fields of a decoded sample."""
+    names = data.names
+    return {
+        name: value
+        for name, value in zip(names, data.values(names))
+        if not math.isnan(value)
+    }
+
+
+def format_jsonl(
+    host: str, kind: str, timestamp: float, fields: dict[str, float]
+) -> str:
+    """Format a sample as a JSON line."""
+    return json.dumps({"timestamp": timestamp, "host": host, "kind": kind, **fields})
+
+
+def _escape(value: str) -> str:
+    """Escape a line protocol tag or field key."""
+    return value.replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def format_line(
+    host: str, kind: str, timestamp: float, fields: dict[str, float]
+) -> str:
+    """Format a sample in InfluxDB line protocol."""
+    values = ",".join(f"{_escape(name)}={value!r}" for name, value in fields.items())
+    return f"delios,host={_escape(host)},kind={kind} {values} {int(timestamp * 1e9)}"
+
+
+FORMATS: dict[str, Callable[[str, str, float, dict[str, float]], str]] = {
+    FORMAT_JSONL: format_jsonl,
+    FORMAT_LINE: format_line,
+}
+
+
+async def _async_poll(
+    client: DeliosClient,
+    target: CollectorTarget,
+    kinds: Iterable[str],
+    formatter: Callable[[str, str, float, dict[str, float]], str],
+    output: IO[str],
+) -> None:
+    """Poll an inverter once and write its samples."""
+    try:
+        if not client.authenticated and not await client.login(
+            target.username, target.password
+        ):
+            _LOGGER.error("Unable to login to %s", target.host)
+            return
+        for kind in kinds:
+            data = await getattr(client, kind)()
+            if data is None or not (fields := sample_fields(data)):
+                continue
+            output.write(formatter(target.host, kind, time.time(), fields) + "\n")
+    except UnauthorizedClient:
+        # The token expired, login again on the next poll.
+        client.logout()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+        _LOGGER.warning("Unable to poll %s: %r", target.host, exception)
+
+
+async def async_collect(
+    targets: list[CollectorTarget],
+    kinds: Iterable[str] = ("sensors",),
+    output_format: str = FORMAT_JSONL,
+    output: IO[str] = sys.stdout,
+    interval: float = DEFAULT_SCAN_INTERVAL,
+    count: int | None = None,
+    parallel: int = DEFAULT_PARALLEL,
+) -> None:
+    """Poll the inverters every `interval` seconds, `parallel` at a time."""
+    semaphore = asyncio.Semaphore(parallel)
+    formatter = FORMATS[output_format]
+
+    async def async_poll(client: DeliosClient, target: CollectorTarget) -> None:
+        async with semaphore:
+            await _async_poll(client, target, kinds, formatter, output)
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False)
+    ) as session:
+        clients = [(DeliosClient(session, target.host), target) for target in targets]
+        polls = 0
+        while count is None or polls < count:
+            start = time.monotonic()
+            await asyncio.gather(*(async_poll(*client) for client in clients))
+            output.flush()
+            polls += 1
+            if count is None or polls < count:
+                await asyncio.sleep(max(interval - (time.monotonic() - start), 0))
+
+
+async def async_bench(
+    targets: list[CollectorTarget],
+    kind: str = "sensors",
+    requests: int = DEFAULT_BENCH_REQUESTS,
+    parallel: int = DEFAULT_PARALLEL,
+) -> dict[str, dict[str, Any]]:
+    """Send back-to-back requests to every inverter and measure them."""
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def async_bench_target(
+        session: aiohttp.ClientSession, target: CollectorTarget
+    ) -> dict[str, Any]:
+        client = DeliosClient(session, target.host)
+        latencies: list[float] = []
+        errors = 0
+        async with semaphore:
+            if not await client.login(target.username, target.password):
+                return {"requests": 0, "errors": requests}
+            start = time.monotonic()
+            for _ in range(requests):
+                request_start = time.monotonic()
+                try:
+                    if await getattr(client, kind)() is None:
+                        errors += 1
+                        continue
+                except (UnauthorizedClient, aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                    continue
+                latencies.append(time.monotonic() - request_start)
+            elapsed = time.monotonic() - start
+        latencies.sort()
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / elapsed if elapsed > 0 else None,
+            **{
+                f"p{q}_ms": percentile(latencies, q) * 1000 if latencies else None
+                for q in (50, 95, 99)
+            },
+        }
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False)
+    ) as session:
+        results = await asyncio.gather(
+            *(async_bench_target(session, target) for target in targets)
+        )
+    return {target.host: result for target, result in zip(targets, results)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the collector from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m delios_collector", description=__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "targets", nargs="+", metavar="[USER[:PASSWORD]@]HOST", help="Inverters"
+    )
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default="")
+    parser.add_argument(
+        "--kind", action="append", choices=KINDS, help="Data to poll (sensors)"
+    )
+    parser.add_argument("--format", choices=list(FORMATS), default=FORMAT_JSONL)
+    parser.add_argument("--output", help="File to append to instead of stdout")
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_SCAN_INTERVAL, help="Seconds"
+    )
+    parser.add_argument("--count", type=int, help="Number of polls (forever)")
+    parser.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL)
+    parser.add_argument(
+        "--bench", action="store_true", help="Measure request rate and latency"
+    )
+    parser.add_argument("--requests", type=int, default=DEFAULT_BENCH_REQUESTS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    targets = [
+        parse_target(target, args.username, args.password) for target in args.targets
+    ]
+    kinds = args.kind or ["sensors"]
+    if args.bench:
+        results = asyncio.run(
+            async_bench(targets, kinds[0], args.requests, args.parallel)
+        )
+        print(json.dumps(results, indent=2))
+        return 0
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        asyncio.run(
+            async_collect(
+                targets,
+                kinds,
+                args.format,
+                output,
+                args.interval,
+                args.count,
+                args.parallel,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
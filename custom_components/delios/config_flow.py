@@ -7,22 +7,49 @@ import logging
 
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers import config_validation as cv
 from homeassistant.core import callback
 
 from .client import DeliosClient
 from .const import (
+    CONF_BURST_ON_ALARM,
+    CONF_EXPORT,
+    CONF_FLEET,
+    CONF_FRESHNESS,
     CONF_HOST,
+    CONF_JOURNAL_HOURS,
     CONF_MODEL,
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_PUBLISH_INTERVAL,
+    CONF_PUSH,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_WINDOWS,
     CONF_SCAN_INTERVAL,
+    CONF_STALE_GRACE,
     CONF_USERNAME,
+    CONF_WORKER,
+    DEFAULT_BURST_ON_ALARM,
+    DEFAULT_EXPORT,
+    DEFAULT_FLEET_NAME,
+    DEFAULT_FRESHNESS,
+    DEFAULT_JOURNAL_HOURS,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_PUSH,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_WINDOWS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_GRACE,
     DEFAULT_USERNAME,
+    DEFAULT_WORKER,
     DOMAIN,
+    FLEET_MODEL,
     MODELS,
 )
+from .coordinator import async_cache_token
+from .discovery import async_discover, network_hosts
+from .inverter import inverter_from_data, parse_windows
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,6 +64,19 @@ class DeliosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None):
         """User config flow."""
+        entries = self._async_current_entries()
+        if (
+            user_input is None
+            and entries
+            and not any(entry.data.get(CONF_FLEET) for entry in entries)
+        ):
+            return self.async_show_menu(
+                step_id="user", menu_options=["inverter", "fleet"]
+            )
+        return await self.async_step_inverter(user_input)
+
+    async def async_step_inverter(self, user_input=None):
+        """Inverter config flow."""
         errors = {}
         name_opts = {}
         model_opts = {}
@@ -53,9 +93,20 @@ class DeliosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             scan_interval_opts["default"] = int(user_input[CONF_SCAN_INTERVAL])
             if len(user_input[CONF_NAME]) < 3:
                 errors[CONF_NAME] = "name_too_short"
-            delios = DeliosClient(self.hass, user_input[CONF_HOST])
-            if await delios.validate() is not True:
-                errors[CONF_HOST] = "invalid_device"
+            if "/" in user_input[CONF_HOST] and not errors:
+                try:
+                    network_hosts(user_input[CONF_HOST])
+                except ValueError:
+                    errors[CONF_HOST] = "invalid_subnet"
+                else:
+                    self.data = user_input
+                    return await self.async_step_discover()
+            delios = DeliosClient(
+                aiohttp_client.async_get_clientsession(self.hass, verify_ssl=False),
+                user_input[CONF_HOST],
+            )
+            if errors.get(CONF_HOST) or await delios.validate() is not True:
+                errors.setdefault(CONF_HOST, "invalid_device")
             elif (
                 await delios.login(user_input[CONF_USERNAME], user_input[CONF_PASSWORD])
                 is not True
@@ -65,6 +116,7 @@ class DeliosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             elif int(user_input[CONF_SCAN_INTERVAL] < 0):
                 errors[CONF_SCAN_INTERVAL] = "invalid_scan_interval"
             else:
+                async_cache_token(self.hass, inverter_from_data(user_input), delios)
                 unique_id = hashlib.sha1(user_input[CONF_NAME].encode()).hexdigest()
                 await self.async_set_unique_id(unique_id)
                 user_input["unique_id"] = unique_id
@@ -89,6 +141,65 @@ class DeliosConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_discover(self, user_input=None):
+        """Pick one of the Delios web servers found in the entered subnet."""
+        if user_input is not None:
+            return await self.async_step_user({**self.data, **user_input})
+        configured = {
+            entry.data.get(CONF_HOST) for entry in self._async_current_entries()
+        }
+        hosts = [
+            host
+            for host in await async_discover(
+                aiohttp_client.async_get_clientsession(self.hass, verify_ssl=False),
+                self.data[CONF_HOST],
+            )
+            if host not in configured
+        ]
+        if not hosts:
+            return self.async_abort(reason="no_devices_found")
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema({vol.Required(CONF_HOST): vol.In(hosts)}),
+        )
+
+    async def async_step_fleet(self, user_input=None):
+        """Fleet aggregate config flow."""
+        if user_input is not None:
+            await self.async_set_unique_id(CONF_FLEET)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=user_input[CONF_NAME],
+                data={
+                    **user_input,
+                    CONF_MODEL: FLEET_MODEL,
+                    CONF_HOST: "",
+                    CONF_USERNAME: "",
+                    CONF_PASSWORD: "",
+                    CONF_FLEET: True,
+                },
+            )
+        return self.async_show_form(
+            step_id="fleet",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME, default=DEFAULT_FLEET_NAME): cv.string,
+                    vol.Required(
+                        CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
+                    ): cv.positive_int,
+                    vol.Required(
+                        CONF_FRESHNESS, default=DEFAULT_FRESHNESS
+                    ): cv.positive_int,
+                }
+            ),
+        )
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry) -> bool:
+        """Fleets have no options."""
+        return not config_entry.data.get(CONF_FLEET)
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -112,10 +223,17 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         config = {**self.config_entry.data, **self.config_entry.options}
         if user_input is not None:
             config = {**config, **user_input}
-            delios = DeliosClient(self.hass, config.get(CONF_HOST, ""))
-            if await delios.validate() is not True:
+            # The form is validated on the shared session, starting a worker
+            # process is left to the reload or the live update.
+            delios = DeliosClient(
+                aiohttp_client.async_get_clientsession(self.hass, verify_ssl=False),
+                config[CONF_HOST],
+            )
+            # A pushed inverter may only be reachable by its gateway.
+            push = config.get(CONF_PUSH, DEFAULT_PUSH)
+            if not push and await delios.validate() is not True:
                 errors[CONF_HOST] = "invalid_device"
-            elif (
+            elif not push and (
                 await delios.login(
                     config.get(CONF_USERNAME, ""), config.get(CONF_PASSWORD, "")
                 )
@@ -125,7 +243,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 errors[CONF_PASSWORD] = "invalid_password"
             elif int(user_input[CONF_SCAN_INTERVAL] < 0):
                 errors[CONF_SCAN_INTERVAL] = "invalid_scan_interval"
-            else:
+            elif not _valid_windows(user_input[CONF_SAMPLE_WINDOWS]):
+                errors[CONF_SAMPLE_WINDOWS] = "invalid_sample_windows"
+            if not errors and not push:
+                async_cache_token(self.hass, inverter_from_data(config), delios)
+            await delios.close()
+            if not errors:
                 return self.async_create_entry(
                     title=config.get(CONF_NAME, ""), data=user_input
                 )
@@ -146,7 +269,53 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Required(
                         CONF_SCAN_INTERVAL, default=config.get(CONF_SCAN_INTERVAL, 10)
                     ): cv.positive_int,
+                    vol.Required(
+                        CONF_SAMPLE_INTERVAL,
+                        default=config.get(
+                            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                        ),
+                    ): cv.positive_int,
+                    vol.Required(
+                        CONF_SAMPLE_WINDOWS,
+                        default=config.get(CONF_SAMPLE_WINDOWS, DEFAULT_SAMPLE_WINDOWS),
+                    ): cv.string,
+                    vol.Required(
+                        CONF_PUBLISH_INTERVAL,
+                        default=config.get(
+                            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                        ),
+                    ): cv.positive_int,
+                    vol.Required(
+                        CONF_STALE_GRACE,
+                        default=config.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE),
+                    ): cv.positive_int,
+                    vol.Required(
+                        CONF_JOURNAL_HOURS,
+                        default=config.get(CONF_JOURNAL_HOURS, DEFAULT_JOURNAL_HOURS),
+                    ): cv.positive_int,
+                    vol.Required(
+                        CONF_EXPORT, default=config.get(CONF_EXPORT, DEFAULT_EXPORT)
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_BURST_ON_ALARM,
+                        default=config.get(CONF_BURST_ON_ALARM, DEFAULT_BURST_ON_ALARM),
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_PUSH, default=config.get(CONF_PUSH, DEFAULT_PUSH)
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_WORKER, default=config.get(CONF_WORKER, DEFAULT_WORKER)
+                    ): cv.boolean,
                 }
             ),
             errors=errors,
         )
+
+
+def _valid_windows(windows: str) -> bool:
+    """Check the aggregate windows are a comma separated list of seconds."""
+    try:
+        parsed = parse_windows(windows)
+    except ValueError:
+        return False
+    return bool(parsed) and all(window > 0 for window in parsed)
@@ -1,5 +1,7 @@
 """Module constants."""
 
+import os
+
 DOMAIN = "delios"
 
 MODELS: list[str] = [
@@ -13,8 +15,80 @@ CONF_HOST = "host"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_SAMPLE_INTERVAL = "sample_interval"
+CONF_SAMPLE_WINDOWS = "sample_windows"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_JOURNAL_HOURS = "journal_hours"
+CONF_EXPORT = "export"
+CONF_PUSH = "push"
+CONF_FLEET = "fleet"
+CONF_FRESHNESS = "freshness"
+CONF_STALE_GRACE = "stale_grace"
+CONF_BURST_ON_ALARM = "burst_on_alarm"
+CONF_PROFILE = "profile"
+CONF_WORKER = "worker"
 
 DEFAULT_USERNAME = "user"
 DEFAULT_SCAN_INTERVAL = 10
+DEFAULT_SAMPLE_INTERVAL = 0
+DEFAULT_SAMPLE_WINDOWS = "60,300"
+DEFAULT_PUBLISH_INTERVAL = 60
+DEFAULT_JOURNAL_HOURS = 0
+DEFAULT_EXPORT = False
+DEFAULT_PUSH = False
+DEFAULT_FLEET_NAME = "Fleet"
+DEFAULT_FRESHNESS = 60
+DEFAULT_STALE_GRACE = 300
+DEFAULT_BURST_ON_ALARM = False
+DEFAULT_BURST_INTERVAL = 1
+DEFAULT_BURST_DURATION = 60
+DEFAULT_WORKER = False
+DEFAULT_PROFILE_REFRESHES = 5
+DEFAULT_PROFILE_TIMEOUT = 600
+
+FLEET_MODEL = "Fleet"
 
 SYSTEM_UPDATE_INTERVAL = 60 * 60
+
+DATA_SENSORS_COORDINATOR = "sensors_coordinator"
+DATA_SYSTEM_COORDINATOR = "system_coordinator"
+DATA_SAMPLES_COORDINATOR = "samples_coordinator"
+DATA_FLEET_COORDINATOR = "fleet_coordinator"
+DATA_STATISTICS = "statistics"
+DATA_JOURNAL = "journal"
+DATA_EXPORTER = "exporter"
+DATA_METRICS = "metrics"
+DATA_BURST = "burst"
+DATA_LIVE_POLL = "live_poll"
+DATA_TOKENS = "delios_tokens"
+DATA_WORKERS = "delios_workers"
+DATA_PROFILER = "delios_profiler"
+
+TOKEN_TTL = 300
+
+# Poller subprocesses shared by the inverters in worker mode.
+WORKER_POOL_SIZE = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# Sent when the coordinators of an inverter are stored or dropped.
+SIGNAL_MEMBERS = f"{DOMAIN}_members"
+
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_SOURCE = "source"
+ATTR_CLIPPING_LIMIT = "clipping_limit"
+ATTR_SAVE = "save"
+ATTR_LAST_UPDATED_FROM_DEVICE = "last_updated_from_device"
+ATTR_INTERVAL = "interval"
+ATTR_DURATION = "duration"
+ATTR_REFRESHES = "refreshes"
+ATTR_TIMEOUT = "timeout"
+
+SOURCE_EXPORT = "export"
+SOURCE_JOURNAL = "journal"
+
+SERVICE_READ_JOURNAL = "read_journal"
+SERVICE_EXPORT = "export"
+SERVICE_ANALYZE = "analyze"
+SERVICE_BURST_SAMPLE = "burst_sample"
+SERVICE_PROFILE = "profile"
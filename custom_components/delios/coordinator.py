@@ -2,39 +2,151 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import math
+import time
+from abc import abstractmethod
+from collections.abc import Callable
 from datetime import timedelta
+from functools import lru_cache
+from typing import Any
 
+import aiohttp
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
-from homeassistant.components.binary_sensor import (
-    BinarySensorEntity,
-    BinarySensorEntityDescription,
-)
+from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import aiohttp_client
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
 )
+from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 
-from .client import DeliosClient, UnauthorizedClient
-from .const import DOMAIN, SYSTEM_UPDATE_INTERVAL
-from .entity import SENSORS, SETTINGS, DeliosEntityType, DeliosInverterAttribute
+from .client import (
+    LATENCY_GAIN,
+    DeliosClient,
+    DeliosTransport,
+    InvalidAttribute,
+    UnauthorizedClient,
+)
+from .const import (
+    ATTR_LAST_UPDATED_FROM_DEVICE,
+    DATA_SAMPLES_COORDINATOR,
+    DATA_SENSORS_COORDINATOR,
+    DATA_SYSTEM_COORDINATOR,
+    DATA_TOKENS,
+    DOMAIN,
+    SYSTEM_UPDATE_INTERVAL,
+    TOKEN_TTL,
+)
+from .entity import (
+    SENSORS,
+    SETTINGS,
+    DeliosEntityType,
+    DeliosInverterAttribute,
+    catalogue_attributes,
+    catalogue_key,
+    sample_attributes,
+)
 from .inverter import DeliosInverter
+from .profile import DeliosProfile, decoded_variables, model_profile, probe_profile
+from .profiler import DeliosProfiler, stage
+from .samples import SAMPLE_VARIABLES, SampleRing
+from .worker import DeliosWorkerClient, async_get_worker_pool
 
 _LOGGER = logging.getLogger(__name__)
 
 ENTITY_ID_SENSOR_FORMAT = SENSOR_DOMAIN + ".{}_{}"
 ENTITY_ID_BINARY_SENSOR_FORMAT = BINARY_SENSOR_DOMAIN + ".{}_{}"
 
+# Consecutive overrunning refreshes before the interval is stretched.
+OVERRUN_POLLS = 5
+OVERRUN_HEADROOM = 1.5
+
+
+@lru_cache(maxsize=None)
+def _device_info(unique_id: str, name: str, model: str) -> DeviceInfo:
+    """Return the device info shared by the entities of an inverter."""
+    return DeviceInfo(
+        name=name,
+        identifiers={(DOMAIN, unique_id)},
+        manufacturer="Delios",
+        model=model,
+    )
+
+
+def device_info(inverter: DeliosInverter) -> DeviceInfo:
+    """Return the device info of an inverter."""
+    return _device_info(inverter.unique_id, inverter.name, inverter.model)
+
+
+# Attribute value function -> coordinator data kinds it reads. Fleet and
+# inverter attributes share keys, their value functions are distinct.
+_ATTRIBUTE_KINDS: dict[Callable[[Any], Any], frozenset[str]] = {}
+
+
+class _KindReads(dict):
+    """Coordinator data recording the kinds an attribute reads."""
+
+    __slots__ = ("kinds",)
+
+    def __init__(self, data: dict) -> None:
+        """Initialize kind reads."""
+        super().__init__(data)
+        self.kinds: set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        """Record the kind and return its data."""
+        self.kinds.add(key)
+        return super().__getitem__(key)
+
+
+def _read(attribute: DeliosInverterAttribute, data: dict) -> Any:
+    """Compute an attribute value from coordinator data.
+
+    The kinds are recorded the first time any entity of the attribute
+    computes its value, so entities can tell whether they are showing
+    data served from cache.
+    """
+    if attribute.value in _ATTRIBUTE_KINDS:
+        return attribute.value(data)
+    reads = _KindReads(data)
+    try:
+        return attribute.value(reads)
+    finally:
+        if reads.kinds:
+            _ATTRIBUTE_KINDS[attribute.value] = frozenset(reads.kinds)
+
+
+def _stale_attributes(
+    attribute: DeliosInverterAttribute, coordinator: DeliosCoordinator
+) -> dict[str, Any] | None:
+    """Return when the cached data was read, None when it is fresh."""
+    stale = _ATTRIBUTE_KINDS.get(attribute.value, frozenset()) & coordinator.stale
+    if not stale:
+        return None
+    return {
+        ATTR_LAST_UPDATED_FROM_DEVICE: dt_util.utc_from_timestamp(
+            min(coordinator.updated[kind] for kind in stale)
+        )
+    }
+
 
 class DeliosBinarySensor(CoordinatorEntity, BinarySensorEntity):
     """Delios inverter binary sensor."""
 
+    _unrecorded_attributes = frozenset({ATTR_LAST_UPDATED_FROM_DEVICE})
+
     def __init__(
         self, coordinator: DeliosCoordinator, attribute: DeliosInverterAttribute
     ) -> None:
@@ -46,35 +158,67 @@ class DeliosBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.entity_id = ENTITY_ID_BINARY_SENSOR_FORMAT.format(
             slugify(inverter.name), attribute.key
         )
-        self.entity_description = BinarySensorEntityDescription(
-            key=attribute.key,
-            name=attribute.name,
-            device_class=attribute.device_class,
-        )
+        self.entity_description = attribute.description
         self._attr_unique_id = f"{inverter.unique_id}-{attribute.key}"
-        self._attr_device_info = DeviceInfo(
-            name=inverter.name,
-            identifiers={(DOMAIN, inverter.unique_id)},
-            manufacturer="Delios",
-            model=inverter.model,
-        )
+        self._attr_device_info = device_info(inverter)
+        self._data_available = False
         if self.coordinator.data:
-            self._attr_is_on = self._attribute.value(self.coordinator.data)
+            with contextlib.suppress(KeyError, InvalidAttribute):
+                self._update_from_data(self.coordinator.data)
+
+    @property
+    def available(self) -> bool:
+        """Return whether the data read by the entity is within its grace window."""
+        return super().available and self._data_available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return binary sensor attributes."""
+
+        return _stale_attributes(self._attribute, self.coordinator)
+
+    def _update_from_data(self, data: dict) -> None:
+        """Compute value from coordinator data."""
+
+        self._attr_is_on = _read(self._attribute, data)
+        self._data_available = True
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
+        profiler = self.coordinator.profiler
         try:
-            self._attr_is_on = self._attribute.value(self.coordinator.data)
-            self.async_write_ha_state()
+            with stage(profiler, "compute"):
+                self._update_from_data(self.coordinator.data)
+            with stage(profiler, "write"):
+                self.async_write_ha_state()
         except KeyError:
+            if self._data_available:
+                self._data_available = False
+                self.async_write_ha_state()
+        except InvalidAttribute:
             pass
 
+    async def async_added_to_hass(self) -> None:
+        """Also refresh the stale attributes when the cached data ages."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_stale_listener(self._handle_stale_update)
+        )
+
+    @callback
+    def _handle_stale_update(self, kinds: set[str]) -> None:
+        """Handle data kinds turning stale or fresh without new data."""
+        if _ATTRIBUTE_KINDS.get(self._attribute.value, frozenset()) & kinds:
+            self.async_write_ha_state()
+
 
 class DeliosSensor(CoordinatorEntity, SensorEntity):
     """Delios inverter sensor."""
 
+    _unrecorded_attributes = frozenset({ATTR_LAST_UPDATED_FROM_DEVICE})
+
     def __init__(
         self, coordinator: DeliosCoordinator, attribute: DeliosInverterAttribute
     ) -> None:
@@ -83,27 +227,18 @@ class DeliosSensor(CoordinatorEntity, SensorEntity):
         super().__init__(coordinator, context=attribute)
         self._attribute = attribute
         self._internal_value = None
+        self._internal_attributes = None
+        self._data_available = False
         inverter = self.coordinator.inverter
         self.entity_id = ENTITY_ID_SENSOR_FORMAT.format(
             slugify(inverter.name), attribute.key
         )
-        self.entity_description = SensorEntityDescription(
-            key=attribute.key,
-            name=attribute.name,
-            state_class=attribute.state_class,
-            device_class=attribute.device_class,
-            native_unit_of_measurement=attribute.unit_of_measurement,
-            suggested_display_precision=attribute.suggested_display_precision,
-        )
+        self.entity_description = attribute.description
         self._attr_unique_id = f"{inverter.unique_id}-{attribute.key}"
-        self._attr_device_info = DeviceInfo(
-            name=inverter.name,
-            identifiers={(DOMAIN, inverter.unique_id)},
-            manufacturer="Delios",
-            model=inverter.model,
-        )
+        self._attr_device_info = device_info(inverter)
         if self.coordinator.data:
-            self._internal_value = self._attribute.value(self.coordinator.data)
+            with contextlib.suppress(KeyError, InvalidAttribute):
+                self._update_from_data(self.coordinator.data)
 
     @property
     def native_value(self) -> str | int | None:
@@ -111,45 +246,346 @@ class DeliosSensor(CoordinatorEntity, SensorEntity):
 
         return self._internal_value
 
+    @property
+    def available(self) -> bool:
+        """Return whether the data read by the entity is within its grace window."""
+        return super().available and self._data_available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return sensor attributes."""
+
+        stale = _stale_attributes(self._attribute, self.coordinator)
+        if stale is None:
+            return self._internal_attributes
+        return {**(self._internal_attributes or {}), **stale}
+
+    def _update_from_data(self, data: dict) -> None:
+        """Compute value and attributes from coordinator data."""
+
+        self._internal_value = _read(self._attribute, data)
+        self._data_available = True
+        if self._attribute.attributes is not None:
+            self._internal_attributes = self._attribute.attributes(data)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
+        profiler = self.coordinator.profiler
         try:
-            self._internal_value = self._attribute.value(self.coordinator.data)
-            self.async_write_ha_state()
+            with stage(profiler, "compute"):
+                self._update_from_data(self.coordinator.data)
+            with stage(profiler, "write"):
+                self.async_write_ha_state()
         except KeyError:
+            if self._data_available:
+                self._data_available = False
+                self.async_write_ha_state()
+        except InvalidAttribute:
             pass
 
+    async def async_added_to_hass(self) -> None:
+        """Also refresh the stale attributes when the cached data ages."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_stale_listener(self._handle_stale_update)
+        )
+
+    @callback
+    def _handle_stale_update(self, kinds: set[str]) -> None:
+        """Handle data kinds turning stale or fresh without new data."""
+        if _ATTRIBUTE_KINDS.get(self._attribute.value, frozenset()) & kinds:
+            self.async_write_ha_state()
+
 
 class DeliosCoordinator(DataUpdateCoordinator):
-    """Delios coordinator."""
+    """Delios coordinator, subclasses fetch the data of their kind."""
+
+    kind = "delios"
 
     def __init__(self, hass: HomeAssistant, inverter: DeliosInverter) -> None:
         """Initialize coordinator."""
+        self._inverter = inverter
+        self.profile = model_profile(inverter)
+        self.stretched_interval: int | None = None
         super().__init__(
             hass,
             _LOGGER,
             name="Delios",
-            update_interval=timedelta(seconds=inverter.scan_interval),
+            update_interval=self.base_interval,
+            always_update=False,
         )
-        self._inverter = inverter
         self._client = None
+        self.updated: dict[str, float] = {}
+        self.stale: set[str] = set()
+        self.poll_count = 0
+        self.poll_errors = 0
+        # Failures keep the last good data, so last_update_success stays True.
+        self.last_poll_success = True
+        self.poll_duration: float | None = None
+        self.profiler: DeliosProfiler | None = None
+        self._average_duration: float | None = None
+        self._overruns = 0
+        self._poll_listeners: list[CALLBACK_TYPE] = []
+        self._stale_listeners: list[Callable[[set[str]], None]] = []
+        self._unsub_expiry: CALLBACK_TYPE | None = None
 
     @property
     def inverter(self) -> DeliosInverter:
         """Return inverter."""
         return self._inverter
 
+    @property
+    def scan_interval(self) -> int:
+        """Return the configured update interval in seconds."""
+        return self._inverter.scan_interval
+
+    @property
+    def base_interval(self) -> timedelta | None:
+        """Return the configured update interval, None when data is pushed."""
+        if self._inverter.push:
+            return None
+        return timedelta(seconds=max(self.scan_interval, self.stretched_interval or 0))
+
+    @callback
+    def _async_apply_interval(self) -> None:
+        """Apply the configured or stretched interval."""
+        if self.base_interval is not None:
+            self.update_interval = self.base_interval
+
     @property
     def entities(self) -> list[DeliosSensor]:
         """Return coordinator entities."""
         return []
 
-    async def setup(self) -> None:
+    @property
+    def client(self) -> DeliosTransport | None:
+        """Return the client shared by the inverter coordinators."""
+        return self._client
+
+    @callback
+    def async_set_client(self, client: DeliosTransport | None) -> None:
         """Configure coordinator client."""
-        self._client = DeliosClient(self.hass, self._inverter.host)
-        await self._client.login(self._inverter.username, self._inverter.password)
+        self._client = client
+
+    @callback
+    def async_update_inverter(self, inverter: DeliosInverter) -> None:
+        """Apply new settings, keeping the entities and the cached data."""
+        self._inverter = inverter
+        self._async_release_interval()
+        self._async_apply_interval()
+
+    async def _async_login(self) -> None:
+        """Log in again after the inverter refused the access token."""
+        if await self._client.login(self._inverter.username, self._inverter.password):
+            async_cache_token(self.hass, self._inverter, self._client)
+
+    async def _async_update_data(self):
+        """Fetch data from API endpoint, tracking latency and errors."""
+        if (profiler := self.profiler) is not None:
+            profiler.async_refresh_started()
+        start = time.monotonic()
+        data = {}
+        try:
+            with stage(profiler, "request"):
+                data = await self._async_fetch_data() or {}
+            self.last_poll_success = True
+            # Failed polls wait for the request timeout, they say nothing
+            # about how long a refresh takes.
+            self._async_guard_interval(time.monotonic() - start)
+        except UnauthorizedClient as exception:
+            self.last_poll_success = False
+            self.poll_errors += 1
+            _LOGGER.error("Unable to retreive %s data: %s", self.kind, str(exception))
+            await self._async_login()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+            self.last_poll_success = False
+            self.poll_errors += 1
+            _LOGGER.warning("Unable to reach %s: %r", self._inverter.host, exception)
+        except Exception:
+            self.last_poll_success = False
+            self.poll_errors += 1
+            raise
+        finally:
+            self.poll_count += 1
+            self.poll_duration = time.monotonic() - start
+            if profiler is not None:
+                profiler.async_refresh_finished(self.kind, self._inverter.unique_id)
+        return self._async_merge_data(data)
+
+    @callback
+    def async_add_poll_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for every poll and push, return the remove callback.
+
+        Unlike the coordinator listeners, poll listeners also run when a
+        poll fails or returns unchanged data.
+        """
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def remove_poll_listener() -> None:
+            self._poll_listeners.remove(update_callback)
+
+        return remove_poll_listener
+
+    @callback
+    def async_add_stale_listener(
+        self, update_callback: Callable[[set[str]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for kinds turning stale or fresh, return the remove callback."""
+        self._stale_listeners.append(update_callback)
+
+        @callback
+        def remove_stale_listener() -> None:
+            self._stale_listeners.remove(update_callback)
+
+        return remove_stale_listener
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Notify the poll listeners once the refreshed data is set."""
+        super()._async_refresh_finished()
+        for update_callback in list(self._poll_listeners):
+            update_callback()
+
+    @property
+    def _issue_id(self) -> str:
+        """Return the repair issue id of a stretched interval."""
+        return f"interval_overrun_{self._inverter.unique_id}_{self.kind}"
+
+    @callback
+    def _async_guard_interval(self, duration: float) -> None:
+        """Stretch the interval when refreshes keep overrunning it."""
+        if self.base_interval is None:
+            return
+        if self._average_duration is None:
+            self._average_duration = duration
+        else:
+            self._average_duration += LATENCY_GAIN * (duration - self._average_duration)
+        interval = self.base_interval.total_seconds()
+        self._overruns = self._overruns + 1 if duration >= interval else 0
+        if self._overruns >= OVERRUN_POLLS:
+            self._overruns = 0
+            self.stretched_interval = max(
+                math.ceil(max(duration, self._average_duration) * OVERRUN_HEADROOM),
+                int(interval) + 1,
+            )
+            _LOGGER.warning(
+                "Refreshing %s data of %s takes %.1fs, polling every %ds instead",
+                self.kind,
+                self._inverter.name,
+                self._average_duration,
+                self.stretched_interval,
+            )
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                self._issue_id,
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key="interval_overrun",
+                translation_placeholders={
+                    "name": self._inverter.name,
+                    "kind": self.kind,
+                    "duration": f"{self._average_duration:.1f}",
+                    "interval": str(self.scan_interval),
+                    "stretched": str(self.stretched_interval),
+                },
+            )
+            self._async_apply_interval()
+        elif (
+            self.stretched_interval is not None
+            and self._average_duration * OVERRUN_HEADROOM < self.scan_interval
+        ):
+            self._async_release_interval()
+            self._async_apply_interval()
+
+    @callback
+    def _async_release_interval(self) -> None:
+        """Go back to the configured interval."""
+        self._overruns = 0
+        if self.stretched_interval is not None:
+            self.stretched_interval = None
+            ir.async_delete_issue(self.hass, DOMAIN, self._issue_id)
+
+    @callback
+    def async_set_device_data(self, data: dict[str, Any]) -> None:
+        """Publish data received from the inverter outside of a poll."""
+        self.async_set_updated_data(self._async_merge_data(data))
+        for update_callback in list(self._poll_listeners):
+            update_callback()
+        if self.base_interval is None:
+            self._async_schedule_expiry()
+
+    @callback
+    def _async_schedule_expiry(self) -> None:
+        """Expire the pushed data when no push refreshes it in time.
+
+        Pushed inverters are never polled, so nothing else would drop the
+        data once the other poller stops pushing.
+        """
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+        if not self.data:
+            return
+        expires = min(self.updated[kind] for kind in self.data) + self._expire_after
+        self._unsub_expiry = async_call_later(
+            self.hass, max(expires - time.time(), 0), self._async_expire_pushed
+        )
+
+    @callback
+    def _async_expire_pushed(self, _now: Any) -> None:
+        """Drop the pushed data kinds that were not pushed again."""
+        self._unsub_expiry = None
+        merged = self._async_merge_data({})
+        if merged != self.data:
+            self.async_set_updated_data(merged)
+        self._async_schedule_expiry()
+
+    async def async_shutdown(self) -> None:
+        """Cancel refreshes and the expiry of pushed data."""
+        await super().async_shutdown()
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    @property
+    def _expire_after(self) -> float:
+        """Return the seconds after its update a data kind is dropped."""
+        if self.base_interval is None:
+            # Pushed data is expected as often as it would have been polled.
+            return self._inverter.stale_grace + self.scan_interval
+        return self._inverter.stale_grace + self.base_interval.total_seconds()
+
+    @callback
+    def _async_merge_data(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Merge fresh data kinds into the last good ones.
+
+        A kind the inverter did not return keeps its last value until
+        `stale_grace` seconds after its next update was due, then it is
+        dropped and the entities reading it become unavailable.
+        """
+        now = time.time()
+        self.updated.update(dict.fromkeys(data, now))
+        stale, self.stale = self.stale, set(self.data or {}) - set(data)
+        expire = self._expire_after
+        merged = {**(self.data or {}), **data}
+        for kind in [kind for kind in self.stale if now - self.updated[kind] >= expire]:
+            _LOGGER.debug("Dropping %s data of %s", kind, self._inverter.name)
+            del merged[kind]
+            self.stale.discard(kind)
+        if self.stale != stale and merged == self.data:
+            # Unchanged data is not published, only the entities reading
+            # the kinds refresh their stale attributes.
+            for update_callback in list(self._stale_listeners):
+                update_callback(self.stale ^ stale)
+        return merged
+
+    @abstractmethod
+    async def _async_fetch_data(self):
+        """Fetch data from API endpoint."""
 
     def add_entities(
         self,
@@ -185,42 +621,276 @@ class DeliosCoordinator(DataUpdateCoordinator):
 class DeliosSensorsCoordinator(DeliosCoordinator):
     """Sensors coordinator."""
 
+    kind = "sensors"
+    endpoints = ("sensors", "parameters")
+
     @property
     def entities(self) -> list[DeliosSensor]:
         """Return coordinator entities."""
-        return SENSORS
-
-    async def _async_update_data(self):
+        return [
+            *(
+                attribute
+                for attribute in SENSORS
+                if self.profile.creates(attribute.key)
+            ),
+            *catalogue_attributes(self.profile.catalogue),
+        ]
+
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint."""
-        try:
-            return {
-                "sensors": await self._client.sensors(),
-                "parameters": await self._client.parameters(),
-            }
-        except UnauthorizedClient as exception:
-            _LOGGER.error("Unable to retreive sensors data: %s", str(exception))
+        return await _async_fetch_endpoints(self._client, self.endpoints, self.profile)
 
 
 class DeliosSystemCoordinator(DeliosCoordinator):
     """System coordinator."""
 
-    def __init__(self, hass: HomeAssistant, inverter: DeliosInverter) -> None:
-        """Initialize System coordinator."""
-        super().__init__(hass, inverter)
-        self.update_interval = timedelta(seconds=SYSTEM_UPDATE_INTERVAL)
+    kind = "system"
+    endpoints = ("status", "totalizer", "firmware")
+
+    @property
+    def scan_interval(self) -> int:
+        """Return the configured update interval in seconds."""
+        return SYSTEM_UPDATE_INTERVAL
 
     @property
     def entities(self) -> list[DeliosSensor]:
         """Return coordinator entities."""
-        return SETTINGS
+        return [
+            attribute for attribute in SETTINGS if self.profile.creates(attribute.key)
+        ]
 
-    async def _async_update_data(self):
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint."""
-        try:
-            return {
-                "status": await self._client.status(),
-                "totalizer": await self._client.totalizer(),
-                "firmware": await self._client.firmware(),
+        return await _async_fetch_endpoints(self._client, self.endpoints, self.profile)
+
+
+class DeliosSamplesCoordinator(DeliosCoordinator):
+    """High-rate samples coordinator.
+
+    Dashboard power values are polled every `sample_interval` seconds into a
+    fixed-size ring buffer, while the rolling aggregates are only published
+    to the entities every `publish_interval` seconds.
+    """
+
+    kind = "samples"
+
+    def __init__(self, hass: HomeAssistant, inverter: DeliosInverter) -> None:
+        """Initialize Samples coordinator."""
+        super().__init__(hass, inverter)
+        self.samples = SampleRing(
+            SAMPLE_VARIABLES,
+            max(inverter.sample_windows) // inverter.sample_interval + 1,
+        )
+        self._published = 0.0
+
+    @property
+    def scan_interval(self) -> int:
+        """Return the configured update interval in seconds."""
+        return self._inverter.sample_interval
+
+    @property
+    def entities(self) -> list[DeliosSensor]:
+        """Return coordinator entities."""
+        return sample_attributes(self._inverter.sample_windows)
+
+    async def _async_fetch_data(self):
+        """Fetch a sample and publish aggregates when due."""
+        sensors = await self._client.sensors()
+        now = time.time()
+        if sensors is not None:
+            values = {}
+            for variable in SAMPLE_VARIABLES:
+                try:
+                    values[variable] = sensors.get(variable)
+                except InvalidAttribute:
+                    pass
+            self.samples.append(now, values)
+        if self.data and now - self._published < (self._inverter.publish_interval):
+            return self.data
+        self._published = now
+        return {
+            window: {
+                variable: self.samples.aggregate(variable, now - window)
+                for variable in SAMPLE_VARIABLES
             }
-        except UnauthorizedClient as exception:
-            _LOGGER.error("Unable to retreive sensors data: %s", str(exception))
+            for window in self._inverter.sample_windows
+        }
+
+
+async def _async_fetch_endpoints(
+    client: DeliosTransport, endpoints: tuple[str, ...], profile: DeliosProfile
+) -> dict[str, Any]:
+    """Read the endpoints polled by the inverter profile."""
+    return _present(
+        {
+            endpoint: await getattr(client, endpoint)()
+            for endpoint in endpoints
+            if profile.polls(endpoint)
+        }
+    )
+
+
+def _present(data: dict[str, Any]) -> dict[str, Any]:
+    """Leave out the data kinds the inverter did not return.
+
+    Entities reading a missing kind keep their state, so an inverter
+    without status or firmware data only leaves those entities unknown.
+    """
+    return {key: value for key, value in data.items() if value is not None}
+
+
+async def async_setup_coordinators(
+    hass: HomeAssistant, inverter: DeliosInverter
+) -> list[DeliosCoordinator]:
+    """Create, refresh and store the coordinators shared by an inverter.
+
+    The first refresh polls and decodes everything the model may report,
+    so every setup probes the inverter again.
+    """
+    hass.data.setdefault(DOMAIN, {})
+    data = hass.data[DOMAIN].setdefault(inverter.unique_id, {})
+    coordinators = {
+        DATA_SENSORS_COORDINATOR: DeliosSensorsCoordinator(hass, inverter),
+        DATA_SYSTEM_COORDINATOR: DeliosSystemCoordinator(hass, inverter),
+    }
+    if not inverter.push and inverter.sample_interval > 0 and inverter.sample_windows:
+        coordinators[DATA_SAMPLES_COORDINATOR] = DeliosSamplesCoordinator(
+            hass, inverter
+        )
+    data.pop(DATA_SAMPLES_COORDINATOR, None)
+    client = None if inverter.push else await async_connect(hass, inverter)
+    async_set_profile(list(coordinators.values()), client, model_profile(inverter))
+    for key, coordinator in coordinators.items():
+        coordinator.async_set_client(client)
+        if not inverter.push:
+            await coordinator.async_config_entry_first_refresh()
+        data[key] = coordinator
+    return list(coordinators.values())
+
+
+@callback
+def async_set_profile(
+    coordinators: list[DeliosCoordinator],
+    client: DeliosTransport | None,
+    profile: DeliosProfile,
+) -> None:
+    """Poll and decode what the profile of an inverter needs."""
+    for coordinator in coordinators:
+        coordinator.profile = profile
+    if client is not None:
+        inverter = coordinators[0].inverter
+        client.variables = decoded_variables(
+            inverter,
+            profile,
+            _async_enabled_catalogue(coordinators[0].hass, inverter, profile),
+        )
+
+
+@callback
+def _async_enabled_catalogue(
+    hass: HomeAssistant, inverter: DeliosInverter, profile: DeliosProfile
+) -> list[str]:
+    """Return the catalogue variables whose entity is enabled.
+
+    Enabling or disabling an entity reloads the entry, so the variables
+    are decoded from the next setup on.
+    """
+    registry = er.async_get(hass)
+    enabled = []
+    for kind, name in profile.catalogue:
+        entity_id = registry.async_get_entity_id(
+            SENSOR_DOMAIN,
+            DOMAIN,
+            f"{inverter.unique_id}-{catalogue_key(kind, name)}",
+        )
+        if entity_id is not None and not registry.async_get(entity_id).disabled:
+            enabled.append(name)
+    return enabled
+
+
+@callback
+def async_probe_profile(
+    coordinators: list[DeliosCoordinator], previous: DeliosProfile | None = None
+) -> DeliosProfile | None:
+    """Merge a first refresh without errors into the previous profile."""
+    data = {}
+    for coordinator in coordinators[:2]:
+        if coordinator.poll_errors or not coordinator.data:
+            return None
+        data.update(coordinator.data)
+    return probe_profile(coordinators[0].inverter, data, previous)
+
+
+async def async_shutdown_coordinators(data: dict[str, Any]) -> None:
+    """Stop the coordinators stored for an inverter and close their client."""
+    clients = set()
+    for value in data.values():
+        if isinstance(value, DeliosCoordinator):
+            await value.async_shutdown()
+            if value.client is not None:
+                clients.add(value.client)
+            value.async_set_client(None)
+    for client in clients:
+        await client.close()
+
+
+async def async_get_coordinators(
+    hass: HomeAssistant, inverter: DeliosInverter
+) -> list[DeliosCoordinator]:
+    """Return the coordinators shared by an inverter, creating them if needed."""
+    data = hass.data.get(DOMAIN, {}).get(inverter.unique_id, {})
+    if DATA_SENSORS_COORDINATOR in data and DATA_SYSTEM_COORDINATOR in data:
+        return [
+            data[key]
+            for key in (
+                DATA_SENSORS_COORDINATOR,
+                DATA_SYSTEM_COORDINATOR,
+                DATA_SAMPLES_COORDINATOR,
+            )
+            if key in data
+        ]
+    return await async_setup_coordinators(hass, inverter)
+
+
+def create_client(hass: HomeAssistant, inverter: DeliosInverter) -> DeliosTransport:
+    """Return a client reading the inverter in or out of process."""
+    if inverter.worker:
+        return DeliosWorkerClient(async_get_worker_pool(hass), inverter.host)
+    return DeliosClient(
+        aiohttp_client.async_get_clientsession(hass, verify_ssl=False), inverter.host
+    )
+
+
+async def async_connect(
+    hass: HomeAssistant, inverter: DeliosInverter
+) -> DeliosTransport:
+    """Return a logged in client, reusing a recently issued access token."""
+    client = create_client(hass, inverter)
+    key = (inverter.host, inverter.username, inverter.password)
+    token, expire = hass.data.get(DATA_TOKENS, {}).get(key, (None, 0.0))
+    if isinstance(client, DeliosClient) and time.monotonic() < expire:
+        client.token = token
+    elif await client.login(inverter.username, inverter.password):
+        async_cache_token(hass, inverter, client)
+    return client
+
+
+@callback
+def async_cache_token(
+    hass: HomeAssistant, inverter: DeliosInverter, client: DeliosTransport
+) -> None:
+    """Remember the access token of a client for `TOKEN_TTL` seconds.
+
+    Entries created by the config flow and reloaded entries then start
+    without another token request.
+    """
+    if (token := getattr(client, "token", None)) is None:
+        return
+    tokens = hass.data.setdefault(DATA_TOKENS, {})
+    now = time.monotonic()
+    for key in [key for key, (_, expire) in tokens.items() if expire <= now]:
+        del tokens[key]
+    tokens[(inverter.host, inverter.username, inverter.password)] = (
+        token,
+        now + TOKEN_TTL,
+    )
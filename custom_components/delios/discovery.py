@@ -0,0 +1,67 @@
+"""Delios Web Server discovery."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+
+import aiohttp
+
+from .client import ENDPOINT_STRUCTURE, VALIDATE_STRUCTURE
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_TIMEOUT = 1
+DISCOVERY_PARALLEL = 128
+DISCOVERY_MAX_HOSTS = 1024
+
+
+def network_hosts(network: str) -> list[str]:
+    """Return the host addresses of a subnet in CIDR notation."""
+    subnet = ipaddress.ip_network(network.strip(), strict=False)
+    if subnet.num_addresses > DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{network} has more than {DISCOVERY_MAX_HOSTS} addresses")
+    return [str(host) for host in subnet.hosts()]
+
+
+async def async_fingerprint(
+    session: aiohttp.ClientSession, host: str, timeout: float = DISCOVERY_TIMEOUT
+) -> bool:
+    """Check a host serves the Delios Web Server.
+
+    The web server answers its root page and refuses a token request
+    without credentials.
+    """
+    client_timeout = aiohttp.ClientTimeout(total=timeout * 2, sock_connect=timeout)
+    try:
+        async with session.get(
+            VALIDATE_STRUCTURE.format(host), timeout=client_timeout
+        ) as response:
+            if response.status != 200:
+                return False
+        async with session.get(
+            ENDPOINT_STRUCTURE.format(host, "token"), timeout=client_timeout
+        ) as response:
+            return response.status in (401, 403)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False
+
+
+async def async_discover(
+    session: aiohttp.ClientSession,
+    network: str,
+    timeout: float = DISCOVERY_TIMEOUT,
+    parallel: int = DISCOVERY_PARALLEL,
+) -> list[str]:
+    """Probe every host of a subnet concurrently, return the Delios ones."""
+    hosts = network_hosts(network)
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def async_probe(host: str) -> bool:
+        async with semaphore:
+            return await async_fingerprint(session, host, timeout)
+
+    found = await asyncio.gather(*(async_probe(host) for host in hosts))
+    _LOGGER.debug("Found %d Delios web servers in %s", sum(found), network)
+    return [host for host, is_delios in zip(hosts, found) if is_delios]
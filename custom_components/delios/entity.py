@@ -5,21 +5,33 @@ from __future__ import annotations
 import logging
 from collections.abc import Callable
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Optional
 
-from attr import dataclass
-from homeassistant.components.binary_sensor import BinarySensorDeviceClass
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from attr import Factory, dataclass, field
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntityDescription,
+)
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.const import (
     PERCENTAGE,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
+    UnitOfFrequency,
     UnitOfPower,
     UnitOfEnergy,
     UnitOfTemperature,
 )
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.util import slugify
 
 from .inverter import DeliosInverter
+from .samples import SampleAggregate
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +43,27 @@ class DeliosEntityType(Enum):
     BINARY_SENSOR = 2
 
 
-@dataclass
+def _description(attribute: DeliosInverterAttribute) -> EntityDescription:
+    """Return the entity description shared by the entities of an attribute."""
+    if attribute.type == DeliosEntityType.BINARY_SENSOR:
+        return BinarySensorEntityDescription(
+            key=attribute.key,
+            name=attribute.name,
+            device_class=attribute.device_class,
+            entity_registry_enabled_default=attribute.entity_registry_enabled_default,
+        )
+    return SensorEntityDescription(
+        key=attribute.key,
+        name=attribute.name,
+        state_class=attribute.state_class,
+        device_class=attribute.device_class,
+        native_unit_of_measurement=attribute.unit_of_measurement,
+        suggested_display_precision=attribute.suggested_display_precision,
+        entity_registry_enabled_default=attribute.entity_registry_enabled_default,
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class DeliosInverterAttribute:
     """Delios inverter attribute."""
 
@@ -43,7 +75,12 @@ class DeliosInverterAttribute:
     device_class: Optional[str] = None
     unit_of_measurement: Optional[str] = None
     suggested_display_precision: Optional[int] = None
+    entity_registry_enabled_default: bool = True
     value: Callable[[Any], Any] = lambda v: v
+    attributes: Optional[Callable[[Any], dict[str, Any]]] = None
+    description: EntityDescription = field(
+        default=Factory(_description, takes_self=True), init=False, eq=False
+    )
 
 
 class HelperFilterRangeType(Enum):
@@ -363,3 +400,206 @@ SETTINGS: list[DeliosEntityType] = [
         value=lambda data: data["totalizer"].self_consumed,
     ),
 ]
+
+SAMPLE_SENSORS: dict[str, tuple[str, str]] = {
+    "PowerPV": ("photovoltaic_power", "Photovoltaic Power"),
+    "PowerGrid": ("grid_power", "Grid Power"),
+    "PowerBatt": ("battery_power", "Battery Power"),
+    "PowerHouse": ("house_power", "House Power"),
+}
+
+
+def _watt(value: float | None) -> float | None:
+    """Convert an optional kW value to W."""
+    return None if value is None else round(value * 1000, 1)
+
+
+def _sample_aggregate_attributes(aggregate: SampleAggregate) -> dict[str, Any]:
+    """Return the state attributes of a rolling aggregate."""
+    return {
+        "min": _watt(aggregate.min),
+        "max": _watt(aggregate.max),
+        "p5": _watt(aggregate.p5),
+        "p50": _watt(aggregate.p50),
+        "p95": _watt(aggregate.p95),
+        "samples": aggregate.count,
+    }
+
+
+@lru_cache(maxsize=None)
+def sample_attributes(windows: tuple[int, ...]) -> list[DeliosInverterAttribute]:
+    """Return the rolling mean sensors of the sampled power variables."""
+    attributes = []
+    for window in windows:
+        for variable, (key, name) in SAMPLE_SENSORS.items():
+            attributes.append(
+                DeliosInverterAttribute(
+                    type=DeliosEntityType.SENSOR,
+                    key=f"{key}_mean_{window}s",
+                    name=f"{name} Mean {window}s",
+                    state_class=SensorStateClass.MEASUREMENT,
+                    device_class=SensorDeviceClass.POWER,
+                    unit_of_measurement=UnitOfPower.WATT,
+                    value=lambda data, w=window, v=variable: _watt(data[w][v].mean),
+                    attributes=lambda data, w=window, v=variable: (
+                        _sample_aggregate_attributes(data[w][v])
+                    ),
+                )
+            )
+    return attributes
+
+
+FLEET_ENERGY: dict[str, tuple[str, str]] = {
+    "photovoltaic": ("photovoltaic_energy_total", "Photovoltaic Energy Total"),
+    "buyed": ("buyed_energy_total", "Buyed Energy Total"),
+    "injected": ("injected_energy_total", "Injected Energy Total"),
+    "self_consumed": ("self_consumed_energy_total", "Self Consumed Energy Total"),
+}
+
+
+@lru_cache(maxsize=None)
+def fleet_attributes() -> list[DeliosInverterAttribute]:
+    """Return the aggregate sensors of an inverter fleet."""
+    attributes = [
+        DeliosInverterAttribute(
+            type=DeliosEntityType.SENSOR,
+            key=key,
+            name=name,
+            state_class=SensorStateClass.MEASUREMENT,
+            device_class=SensorDeviceClass.POWER,
+            unit_of_measurement=UnitOfPower.WATT,
+            value=lambda data, v=variable: _watt(data["power"][v]),
+            attributes=lambda data: {"members": data["members"]},
+        )
+        for variable, (key, name) in SAMPLE_SENSORS.items()
+    ]
+    attributes.extend(
+        DeliosInverterAttribute(
+            type=DeliosEntityType.SENSOR,
+            key=key,
+            name=name,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            device_class=SensorDeviceClass.ENERGY,
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            suggested_display_precision=2,
+            value=lambda data, t=totalizer: round(data["energy"][t], 3),
+        )
+        for totalizer, (key, name) in FLEET_ENERGY.items()
+    )
+    return attributes
+
+
+@dataclass(frozen=True, slots=True)
+class DeliosVariableOverride:
+    """Unit and scaling of a catalogued device variable."""
+
+    unit_of_measurement: Optional[str] = None
+    device_class: Optional[str] = None
+    state_class: Optional[str] = None
+    scale: float = 1
+    suggested_display_precision: Optional[int] = None
+
+
+_KW = DeliosVariableOverride(
+    UnitOfPower.WATT,
+    SensorDeviceClass.POWER,
+    SensorStateClass.MEASUREMENT,
+    scale=1000,
+)
+_VOLT = DeliosVariableOverride(
+    UnitOfElectricPotential.VOLT,
+    SensorDeviceClass.VOLTAGE,
+    SensorStateClass.MEASUREMENT,
+)
+_AMPERE = DeliosVariableOverride(
+    UnitOfElectricCurrent.AMPERE,
+    SensorDeviceClass.CURRENT,
+    SensorStateClass.MEASUREMENT,
+)
+_HERTZ = DeliosVariableOverride(
+    UnitOfFrequency.HERTZ,
+    SensorDeviceClass.FREQUENCY,
+    SensorStateClass.MEASUREMENT,
+)
+_CELSIUS = DeliosVariableOverride(
+    UnitOfTemperature.CELSIUS,
+    SensorDeviceClass.TEMPERATURE,
+    SensorStateClass.MEASUREMENT,
+)
+_KWH_DAILY = DeliosVariableOverride(
+    UnitOfEnergy.KILO_WATT_HOUR,
+    SensorDeviceClass.ENERGY,
+    SensorStateClass.TOTAL_INCREASING,
+    suggested_display_precision=2,
+)
+_PERCENT = DeliosVariableOverride(PERCENTAGE, state_class=SensorStateClass.MEASUREMENT)
+
+# Device variable -> unit and scaling of its catalogue sensor.
+VARIABLE_OVERRIDES: dict[str, DeliosVariableOverride] = {
+    "PowerPV1": _KW,
+    "PowerPV2": _KW,
+    "VPV1": _VOLT,
+    "VPV2": _VOLT,
+    "VGrid": _VOLT,
+    "VLoad": _VOLT,
+    "CellVoltMin": _VOLT,
+    "CellVoltMax": _VOLT,
+    "IPV1": _AMPERE,
+    "IPV2": _AMPERE,
+    "IGrid": _AMPERE,
+    "ILoad": _AMPERE,
+    "MaxChargeCurrent": _AMPERE,
+    "MaxDischargeCurrent": _AMPERE,
+    "FGrid": _HERTZ,
+    "FLoad": _HERTZ,
+    "DCinvTemp": _CELSIUS,
+    "PVinvTemp": _CELSIUS,
+    "CellTempMin": _CELSIUS,
+    "CellTempMax": _CELSIUS,
+    "DailyEnergyPV": _KWH_DAILY,
+    "DailyEnergyBuyed": _KWH_DAILY,
+    "DailyEnergyInjected": _KWH_DAILY,
+    "DailyEnergySelfConsumed": _KWH_DAILY,
+    "BattSOH": _PERCENT,
+    "MinSOC": _PERCENT,
+    "MaxSOC": _PERCENT,
+}
+
+
+def catalogue_key(kind: str, name: str) -> str:
+    """Return the attribute key of a catalogued device variable."""
+    return f"{kind}_{slugify(name)}"
+
+
+def _scaled(data: Any, name: str, scale: float) -> float | None:
+    """Read and scale a variable, None while it is not a number."""
+    try:
+        return data.get(name) * scale
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def catalogue_attributes(
+    variables: tuple[tuple[str, str], ...],
+) -> list[DeliosInverterAttribute]:
+    """Return disabled sensors of the device variables no other entity reads."""
+    attributes = []
+    for kind, name in variables:
+        override = VARIABLE_OVERRIDES.get(name, DeliosVariableOverride())
+        attributes.append(
+            DeliosInverterAttribute(
+                type=DeliosEntityType.SENSOR,
+                key=catalogue_key(kind, name),
+                name=name,
+                state_class=override.state_class,
+                device_class=override.device_class,
+                unit_of_measurement=override.unit_of_measurement,
+                suggested_display_precision=override.suggested_display_precision,
+                entity_registry_enabled_default=False,
+                value=lambda data, k=kind, n=name, s=override.scale: _scaled(
+                    data[k], n, s
+                ),
+            )
+        )
+    return attributes
@@ -0,0 +1,172 @@
+"""Delios columnar sample export."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .client import ParametersData, SensorsData, TotalizerData
+from .coordinator import DeliosSensorsCoordinator, DeliosSystemCoordinator
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPORT_FLUSH_ROWS = 1000
+EXPORT_MAX_ROWS = 10000
+
+TIMESTAMP = "timestamp"
+
+
+def write_rows(path: str, rows: list[dict[str, Any]]) -> str:
+    """Write rows to a Parquet file, or to a gzipped CSV file without pyarrow."""
+    columns = [TIMESTAMP]
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if pyarrow is not None:
+        path += ".parquet"
+        table = pyarrow.table(
+            {column: [row.get(column) for row in rows] for column in columns}
+        )
+        pyarrow.parquet.write_table(table, path, compression="zstd")
+        return path
+    path += ".csv.gz"
+    with gzip.open(path, "wt", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+class DeliosExporter:
+    """Buffered exporter of decoded inverter samples.
+
+    Rows are buffered per data kind and written to a new compressed file
+    in the executor once `EXPORT_FLUSH_ROWS` are pending, when the export
+    service is called and on unload. Files are rotated daily in
+    `<directory>/<YYYY-MM-DD>/`. The buffers never hold more than
+    `EXPORT_MAX_ROWS` rows; the oldest ones are dropped if writes fall
+    behind.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: str) -> None:
+        """Initialize exporter."""
+        self._hass = hass
+        self._directory = directory
+        self._buffers: dict[str, deque[dict[str, Any]]] = {}
+        self._flushing: set[str] = set()
+        self.dropped = 0
+
+    @property
+    def directory(self) -> str:
+        """Return the export directory."""
+        return self._directory
+
+    @callback
+    def async_attach(
+        self,
+        sensors_coordinator: DeliosSensorsCoordinator,
+        system_coordinator: DeliosSystemCoordinator,
+    ) -> CALLBACK_TYPE:
+        """Follow the inverter coordinators and return the detach callback."""
+
+        @callback
+        def async_sensors_updated() -> None:
+            if sensors_coordinator.data:
+                self.async_add_sensors(sensors_coordinator.data.get("sensors"))
+                self.async_add_parameters(sensors_coordinator.data.get("parameters"))
+
+        @callback
+        def async_system_updated() -> None:
+            if system_coordinator.data:
+                self.async_add_totalizer(system_coordinator.data.get("totalizer"))
+
+        remove_listeners = [
+            sensors_coordinator.async_add_listener(async_sensors_updated),
+            system_coordinator.async_add_listener(async_system_updated),
+        ]
+
+        @callback
+        def async_detach() -> None:
+            for remove_listener in remove_listeners:
+                remove_listener()
+
+        return async_detach
+
+    @callback
+    def async_add_sensors(self, sensors: SensorsData | None) -> None:
+        """Buffer a dashboard sample."""
+        if sensors is not None:
+            names = sensors.names
+            self._async_add("sensors", dict(zip(names, sensors.values(names))))
+
+    @callback
+    def async_add_parameters(self, parameters: ParametersData | None) -> None:
+        """Buffer a system parameters sample."""
+        if parameters is not None:
+            names = parameters.names
+            self._async_add("parameters", dict(zip(names, parameters.values(names))))
+
+    @callback
+    def async_add_totalizer(self, totalizer: TotalizerData | None) -> None:
+        """Buffer a totalizer sample."""
+        if totalizer is not None:
+            names = totalizer.names
+            self._async_add("totalizer", dict(zip(names, totalizer.values(names))))
+
+    @callback
+    def _async_add(self, kind: str, row: dict[str, Any]) -> None:
+        """Buffer a row and schedule a flush when enough rows are pending."""
+        buffer = self._buffers.setdefault(kind, deque(maxlen=EXPORT_MAX_ROWS))
+        if len(buffer) == EXPORT_MAX_ROWS:
+            self.dropped += 1
+        row[TIMESTAMP] = time.time()
+        buffer.append(row)
+        if len(buffer) >= EXPORT_FLUSH_ROWS and kind not in self._flushing:
+            self._flushing.add(kind)
+            self._hass.async_create_background_task(
+                self._async_write(kind), f"delios export {kind}"
+            )
+
+    async def async_flush(self) -> list[str]:
+        """Write the pending rows of every kind, return the written files."""
+        files = []
+        for kind in list(self._buffers):
+            if kind not in self._flushing:
+                self._flushing.add(kind)
+                if (path := await self._async_write(kind)) is not None:
+                    files.append(path)
+        return files
+
+    async def _async_write(self, kind: str) -> str | None:
+        """Write the pending rows of a kind to a new file in the executor."""
+        try:
+            rows = list(self._buffers[kind])
+            if not rows:
+                return None
+            self._buffers[kind].clear()
+            now = datetime.now(timezone.utc)
+            path = os.path.join(
+                self._directory,
+                now.strftime("%Y-%m-%d"),
+                f"{kind}-{now.strftime('%H%M%S%f')}",
+            )
+            return await self._hass.async_add_executor_job(write_rows, path, rows)
+        except OSError as exception:
+            _LOGGER.error("Unable to export %s data: %s", kind, exception)
+            return None
+        finally:
+            self._flushing.discard(kind)
@@ -0,0 +1,166 @@
+"""Delios fleet aggregate."""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from functools import partial
+from typing import Optional
+
+from attr import Factory, dataclass
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_SENSORS_COORDINATOR, DATA_SYSTEM_COORDINATOR, DOMAIN
+from .coordinator import DeliosCoordinator, DeliosSensor
+from .entity import FLEET_ENERGY, fleet_attributes
+from .inverter import DeliosInverter
+from .samples import SAMPLE_VARIABLES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class FleetMember:
+    """Latest contribution of an inverter to the fleet sums."""
+
+    power: dict[str, float] = Factory(dict)
+    energy: dict[str, float] = Factory(dict)
+    sensors: Optional[DeliosCoordinator] = None
+    fresh: bool = False
+
+    @property
+    def updated(self) -> float:
+        """Return when the member power values were last read."""
+        if self.sensors is None:
+            return 0.0
+        return self.sensors.updated.get("sensors", 0.0)
+
+
+def _apply(sums: dict[str, float], old: dict[str, float], new: dict[str, float]):
+    """Replace a member contribution in running sums."""
+    for name in sums:
+        sums[name] += new.get(name, 0.0) - old.get(name, 0.0)
+
+
+def _numbers(values: dict[str, float]) -> dict[str, float]:
+    """Leave out the missing values."""
+    return {name: value for name, value in values.items() if not math.isnan(value)}
+
+
+class DeliosFleetCoordinator(DeliosCoordinator):
+    """Fleet aggregate coordinator.
+
+    Follows the sensors and system coordinators of every loaded inverter
+    and applies the change of each member's values to running sums, so an
+    inverter poll costs a few additions instead of a full re-aggregation.
+    Members without a sample for `freshness` seconds stop counting towards
+    the power sums; energy totals keep their last contribution so they
+    never decrease. The sums are published once per fleet cycle, while
+    members are followed again as soon as their coordinators change.
+    """
+
+    kind = "fleet"
+
+    def __init__(
+        self, hass: HomeAssistant, inverter: DeliosInverter, freshness: int
+    ) -> None:
+        """Initialize Fleet coordinator."""
+        super().__init__(hass, inverter)
+        self._freshness = freshness
+        self._power = dict.fromkeys(SAMPLE_VARIABLES, 0.0)
+        self._energy = dict.fromkeys(FLEET_ENERGY, 0.0)
+        self._members: dict[str, FleetMember] = {}
+        self._listeners: dict[DeliosCoordinator, CALLBACK_TYPE] = {}
+
+    @property
+    def entities(self) -> list[DeliosSensor]:
+        """Return coordinator entities."""
+        return fleet_attributes()
+
+    @callback
+    def async_detach(self) -> None:
+        """Stop following the member coordinators."""
+        for remove_listener in self._listeners.values():
+            remove_listener()
+        self._listeners.clear()
+
+    async def _async_fetch_data(self):
+        """Expire stale members and publish the sums."""
+        self.async_sync_members()
+        now = time.time()
+        for member in self._members.values():
+            fresh = now - member.updated <= self._freshness
+            if member.fresh and not fresh:
+                _apply(self._power, member.power, {})
+            elif fresh and not member.fresh:
+                # An unchanged sample after an outage notifies no listener.
+                _apply(self._power, {}, member.power)
+            member.fresh = fresh
+        members = sum(member.fresh for member in self._members.values())
+        if not members:
+            # Clear the rounding errors left by the removed contributions.
+            self._power = dict.fromkeys(self._power, 0.0)
+        return {
+            "members": members,
+            "power": (
+                dict(self._power) if members else dict.fromkeys(self._power, None)
+            ),
+            "energy": (
+                dict(self._energy)
+                if any(member.energy for member in self._members.values())
+                else {}
+            ),
+        }
+
+    @callback
+    def async_sync_members(self) -> None:
+        """Follow the coordinators of the loaded inverters.
+
+        A reloaded inverter stores new coordinators under the same unique
+        id, its member keeps its contributions and follows the new ones.
+        """
+        coordinators = set()
+        for unique_id, data in self.hass.data.get(DOMAIN, {}).items():
+            for key, handler in (
+                (DATA_SENSORS_COORDINATOR, self._async_power_updated),
+                (DATA_SYSTEM_COORDINATOR, self._async_energy_updated),
+            ):
+                if (coordinator := data.get(key)) is None:
+                    continue
+                coordinators.add(coordinator)
+                if coordinator not in self._listeners:
+                    self._listeners[coordinator] = coordinator.async_add_listener(
+                        partial(handler, unique_id, coordinator)
+                    )
+                    handler(unique_id, coordinator)
+        for coordinator in set(self._listeners) - coordinators:
+            self._listeners.pop(coordinator)()
+
+    @callback
+    def _async_power_updated(
+        self, unique_id: str, coordinator: DeliosCoordinator
+    ) -> None:
+        """Apply the change of a member's power values."""
+        sensors = (coordinator.data or {}).get("sensors")
+        if sensors is None:
+            return
+        power = _numbers(dict(zip(SAMPLE_VARIABLES, sensors.values(SAMPLE_VARIABLES))))
+        member = self._members.setdefault(unique_id, FleetMember())
+        _apply(self._power, member.power if member.fresh else {}, power)
+        member.power = power
+        member.sensors = coordinator
+        member.fresh = True
+
+    @callback
+    def _async_energy_updated(
+        self, unique_id: str, coordinator: DeliosCoordinator
+    ) -> None:
+        """Apply the change of a member's energy totals."""
+        totalizer = (coordinator.data or {}).get("totalizer")
+        if totalizer is None:
+            return
+        energy = _numbers({name: getattr(totalizer, name) for name in FLEET_ENERGY})
+        member = self._members.setdefault(unique_id, FleetMember())
+        _apply(self._energy, member.energy, energy)
+        member.energy = energy
@@ -0,0 +1,94 @@
+"""Delios push ingestion."""
+
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from .client import (
+    FirmwareData,
+    ParametersData,
+    SensorsData,
+    StatusData,
+    TotalizerData,
+)
+from .const import DATA_SENSORS_COORDINATOR, DATA_SYSTEM_COORDINATOR, DOMAIN
+from .coordinator import DeliosCoordinator
+from .services import async_get_inverter_data
+
+_LOGGER = logging.getLogger(__name__)
+
+# Web server endpoint -> (coordinator, data key, parser)
+INGEST_ENDPOINTS: dict[str, tuple[str, str, type]] = {
+    "dashboard": (DATA_SENSORS_COORDINATOR, "sensors", SensorsData),
+    "info/system": (DATA_SENSORS_COORDINATOR, "parameters", ParametersData),
+    "system/status": (DATA_SYSTEM_COORDINATOR, "status", StatusData),
+    "info/totalizer": (DATA_SYSTEM_COORDINATOR, "totalizer", TotalizerData),
+    "info/firmware": (DATA_SYSTEM_COORDINATOR, "firmware", FirmwareData),
+}
+
+
+def parse_payloads(payloads: Any) -> dict[str, dict[str, Any]]:
+    """Parse web server payloads keyed by endpoint, grouped by coordinator."""
+    if not isinstance(payloads, dict):
+        raise ValueError("Payloads must be a JSON object keyed by endpoint")
+    updates: dict[str, dict[str, Any]] = {}
+    for endpoint, payload in payloads.items():
+        if endpoint not in INGEST_ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {endpoint}")
+        coordinator, key, parser = INGEST_ENDPOINTS[endpoint]
+        try:
+            updates.setdefault(coordinator, {})[key] = parser(payload)
+        except (KeyError, TypeError, ValueError) as exception:
+            raise ValueError(f"Invalid {endpoint} payload") from exception
+    return updates
+
+
+class DeliosIngestView(HomeAssistantView):
+    """Receive inverter data collected by another poller.
+
+    The body is either a single web server payload posted to
+    `/api/delios/ingest/<entry_id>/<endpoint>`, or an object of payloads
+    keyed by endpoint posted to `/api/delios/ingest/<entry_id>`. Payloads
+    are merged into the data of the coordinator that would have polled
+    them, so the entities update as soon as the data is pushed.
+    """
+
+    url = f"/api/{DOMAIN}/ingest/{{entry_id}}"
+    extra_urls = [f"/api/{DOMAIN}/ingest/{{entry_id}}/{{endpoint:.+}}"]
+    name = f"api:{DOMAIN}:ingest"
+    requires_auth = True
+
+    async def post(
+        self, request: web.Request, entry_id: str, endpoint: str | None = None
+    ) -> web.Response:
+        """Feed the pushed payloads to the inverter coordinators."""
+        hass: HomeAssistant = request.app["hass"]
+        try:
+            data = async_get_inverter_data(hass, entry_id)
+        except ServiceValidationError as exception:
+            return self.json_message(str(exception), HTTPStatus.NOT_FOUND)
+        if not data[DATA_SENSORS_COORDINATOR].inverter.push:
+            return self.json_message(
+                f"Delios entry {entry_id} is not in push mode", HTTPStatus.CONFLICT
+            )
+        try:
+            payloads = await request.json()
+        except ValueError:
+            return self.json_message("Invalid JSON", HTTPStatus.BAD_REQUEST)
+        if endpoint is not None:
+            payloads = {endpoint: payloads}
+        try:
+            updates = parse_payloads(payloads)
+        except ValueError as exception:
+            return self.json_message(str(exception), HTTPStatus.BAD_REQUEST)
+        for key, values in updates.items():
+            coordinator: DeliosCoordinator = data[key]
+            coordinator.async_set_device_data(values)
+        return self.json({"endpoints": sorted(payloads)})
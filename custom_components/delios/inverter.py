@@ -8,12 +8,31 @@ import logging
 from attr import dataclass
 
 from .const import (
+    CONF_BURST_ON_ALARM,
+    CONF_EXPORT,
+    CONF_FLEET,
     CONF_HOST,
+    CONF_JOURNAL_HOURS,
     CONF_MODEL,
     CONF_NAME,
     CONF_PASSWORD,
+    CONF_PUBLISH_INTERVAL,
+    CONF_PUSH,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SAMPLE_WINDOWS,
     CONF_SCAN_INTERVAL,
+    CONF_STALE_GRACE,
     CONF_USERNAME,
+    CONF_WORKER,
+    DEFAULT_BURST_ON_ALARM,
+    DEFAULT_EXPORT,
+    DEFAULT_JOURNAL_HOURS,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_PUSH,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SAMPLE_WINDOWS,
+    DEFAULT_STALE_GRACE,
+    DEFAULT_WORKER,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,12 +48,23 @@ class DeliosInverter:
     username: str = ""
     password: str = ""
     scan_interval: int = 10
+    sample_interval: int = 0
+    sample_windows: tuple[int, ...] = (60, 300)
+    publish_interval: int = 60
+    journal_hours: int = 0
+    export: bool = False
+    push: bool = False
+    stale_grace: int = 300
+    burst_on_alarm: bool = False
+    worker: bool = False
+    fleet: bool = False
     helper_entities: bool = False
 
     @property
     def unique_id(self) -> str:
-        """Inverter unique ID."""
-        return hashlib.sha1(self.name.encode()).hexdigest()
+        """Inverter unique ID, fleets have their own namespace."""
+        name = f"{CONF_FLEET}:{self.name}" if self.fleet else self.name
+        return hashlib.sha1(name.encode()).hexdigest()
 
 
 def inverter_from_data(data: dict) -> DeliosInverter:
@@ -46,4 +76,23 @@ def inverter_from_data(data: dict) -> DeliosInverter:
         username=data[CONF_USERNAME],
         password=data[CONF_PASSWORD],
         scan_interval=data[CONF_SCAN_INTERVAL],
+        sample_interval=data.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+        sample_windows=parse_windows(
+            data.get(CONF_SAMPLE_WINDOWS, DEFAULT_SAMPLE_WINDOWS)
+        ),
+        publish_interval=data.get(CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL),
+        journal_hours=data.get(CONF_JOURNAL_HOURS, DEFAULT_JOURNAL_HOURS),
+        export=data.get(CONF_EXPORT, DEFAULT_EXPORT),
+        push=data.get(CONF_PUSH, DEFAULT_PUSH),
+        stale_grace=data.get(CONF_STALE_GRACE, DEFAULT_STALE_GRACE),
+        burst_on_alarm=data.get(CONF_BURST_ON_ALARM, DEFAULT_BURST_ON_ALARM),
+        worker=data.get(CONF_WORKER, DEFAULT_WORKER),
+        fleet=data.get(CONF_FLEET, False),
+    )
+
+
+def parse_windows(windows: str) -> tuple[int, ...]:
+    """Return the sorted aggregate windows (seconds) from a comma separated list."""
+    return tuple(
+        sorted({int(window) for window in str(windows).split(",") if window.strip()})
     )
@@ -0,0 +1,115 @@
+"""Delios memory-mapped sample journal."""
+
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"DLSJ"
+VERSION = 1
+
+# magic, version, capacity, variables, written records
+HEADER = struct.Struct("<4sHIHQ")
+WRITTEN = struct.Struct("<Q")
+WRITTEN_OFFSET = HEADER.size - WRITTEN.size
+NAMES_OFFSET = HEADER.size
+DATA_OFFSET = 4096
+
+
+class DeliosJournal:
+    """Fixed-size ring file of raw samples.
+
+    Every record holds a float64 timestamp followed by one float32 per
+    journaled variable, packed straight into the memory-mapped file. The
+    write counter is only bumped once a record is complete, so a crash can
+    at worst lose the record being written.
+    """
+
+    def __init__(self, path: str, variables: Sequence[str], capacity: int) -> None:
+        """Initialize a journal; call `open` before use."""
+        self._path = path
+        self._variables = tuple(variables)
+        self._capacity = max(capacity, 2)
+        self._record = struct.Struct(f"<d{len(self._variables)}f")
+        self._mmap: mmap.mmap | None = None
+        self._written = 0
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        """Return the journaled variables."""
+        return self._variables
+
+    @property
+    def size(self) -> int:
+        """Return the journal file size in bytes."""
+        return DATA_OFFSET + self._capacity * self._record.size
+
+    def open(self) -> None:
+        """Map the journal file, creating or resetting it if its layout changed."""
+        names = "\0".join(self._variables).encode()
+        if NAMES_OFFSET + len(names) > DATA_OFFSET:
+            raise ValueError("Too many journal variables")
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        mode = "r+b" if os.path.exists(self._path) else "w+b"
+        with open(self._path, mode) as file:
+            if os.fstat(file.fileno()).st_size != self.size:
+                file.truncate(self.size)
+            self._mmap = mmap.mmap(file.fileno(), self.size)
+        magic, version, capacity, variables, written = HEADER.unpack_from(self._mmap)
+        if (
+            magic == MAGIC
+            and version == VERSION
+            and capacity == self._capacity
+            and variables == len(self._variables)
+            and self._mmap[NAMES_OFFSET : NAMES_OFFSET + len(names)] == names
+        ):
+            self._written = written
+            return
+        _LOGGER.debug("Initializing journal %s", self._path)
+        self._written = 0
+        self._mmap[:DATA_OFFSET] = bytes(DATA_OFFSET)
+        HEADER.pack_into(
+            self._mmap, 0, MAGIC, VERSION, self._capacity, len(self._variables), 0
+        )
+        self._mmap[NAMES_OFFSET : NAMES_OFFSET + len(names)] = names
+
+    def close(self) -> None:
+        """Flush and unmap the journal file."""
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        """Pack a sample into the next journal record."""
+        if self._mmap is None:
+            return
+        offset = DATA_OFFSET + (self._written % self._capacity) * self._record.size
+        self._record.pack_into(self._mmap, offset, timestamp, *values)
+        self._written += 1
+        WRITTEN.pack_into(self._mmap, WRITTEN_OFFSET, self._written)
+
+    def read(
+        self, start: float = 0.0, end: float = math.inf
+    ) -> list[tuple[float, ...]]:
+        """Return the records with a timestamp between start and end, oldest first.
+
+        The oldest slot is skipped once the ring has wrapped, since it is the
+        one a crashed write could have left half overwritten.
+        """
+        if self._mmap is None:
+            return []
+        count = min(self._written, self._capacity - 1)
+        records = []
+        for written in range(self._written - count, self._written):
+            offset = DATA_OFFSET + (written % self._capacity) * self._record.size
+            record = self._record.unpack_from(self._mmap, offset)
+            if start <= record[0] <= end:
+                records.append(record)
+        return records
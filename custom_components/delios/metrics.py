@@ -0,0 +1,142 @@
+"""Delios Prometheus metrics."""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DATA_METRICS, DOMAIN
+from .coordinator import DeliosCoordinator
+from .inverter import DeliosInverter
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Metric family -> (type, help)
+FAMILIES: dict[str, tuple[str, str]] = {
+    "delios_up": ("gauge", "Whether the last poll succeeded."),
+    "delios_dashboard_value": ("gauge", "Dashboard variable reported by the inverter."),
+    "delios_parameter_value": ("gauge", "System parameter reported by the inverter."),
+    "delios_energy_kwh_total": ("counter", "Inverter energy totalizer in kWh."),
+    "delios_poll_duration_seconds": ("gauge", "Duration of the last poll."),
+    "delios_polls_total": ("counter", "Number of polls."),
+    "delios_poll_errors_total": ("counter", "Number of failed polls."),
+}
+
+TOTALIZERS = ("photovoltaic", "buyed", "injected", "self_consumed")
+
+
+def _label(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class DeliosMetrics:
+    """Prometheus samples of an inverter, rendered once per poll.
+
+    Coordinators skip their listeners when a poll changes nothing or
+    fails, so the samples are rendered by a poll listener to keep the
+    poll counters current.
+    """
+
+    def __init__(
+        self, inverter: DeliosInverter, coordinators: Iterable[DeliosCoordinator]
+    ) -> None:
+        """Initialize metrics."""
+        self._inverter = f'inverter="{_label(inverter.name)}"'
+        self._coordinators = list(coordinators)
+        self.families: dict[str, str] = {}
+
+    @callback
+    def async_attach(self) -> CALLBACK_TYPE:
+        """Render on every poll and return the detach callback."""
+        remove_listeners = [
+            coordinator.async_add_poll_listener(self.async_render)
+            for coordinator in self._coordinators
+        ]
+        self.async_render()
+
+        @callback
+        def async_detach() -> None:
+            for remove_listener in remove_listeners:
+                remove_listener()
+
+        return async_detach
+
+    @callback
+    def async_render(self) -> None:
+        """Render the latest coordinator data."""
+        lines: dict[str, list[str]] = {family: [] for family in FAMILIES}
+        for coordinator in self._coordinators:
+            labels = f'{self._inverter},coordinator="{coordinator.kind}"'
+            lines["delios_up"].append(
+                f"delios_up{{{labels}}} {int(coordinator.last_poll_success)}"
+            )
+            lines["delios_polls_total"].append(
+                f"delios_polls_total{{{labels}}} {coordinator.poll_count}"
+            )
+            lines["delios_poll_errors_total"].append(
+                f"delios_poll_errors_total{{{labels}}} {coordinator.poll_errors}"
+            )
+            if coordinator.poll_duration is not None:
+                lines["delios_poll_duration_seconds"].append(
+                    f"delios_poll_duration_seconds{{{labels}}} "
+                    f"{coordinator.poll_duration:.6f}"
+                )
+            data = coordinator.data if isinstance(coordinator.data, dict) else {}
+            for family, key in (
+                ("delios_dashboard_value", "sensors"),
+                ("delios_parameter_value", "parameters"),
+            ):
+                if data.get(key) is None:
+                    continue
+                names = data[key].names
+                for name, value in zip(names, data[key].values(names)):
+                    if not math.isnan(value):
+                        lines[family].append(
+                            f'{family}{{{self._inverter},variable="{_label(name)}"}}'
+                            f" {value!r}"
+                        )
+            if data.get("totalizer") is not None:
+                for name in TOTALIZERS:
+                    value = getattr(data["totalizer"], name)
+                    lines["delios_energy_kwh_total"].append(
+                        f"delios_energy_kwh_total{{{self._inverter},"
+                        f'totalizer="{name}"}} {value!r}'
+                    )
+        self.families = {
+            family: "".join(f"{line}\n" for line in family_lines)
+            for family, family_lines in lines.items()
+        }
+
+
+class DeliosMetricsView(HomeAssistantView):
+    """Prometheus text exposition of every Delios inverter."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the cached metrics of every inverter."""
+        hass: HomeAssistant = request.app["hass"]
+        metrics = [
+            data[DATA_METRICS]
+            for data in hass.data.get(DOMAIN, {}).values()
+            if DATA_METRICS in data
+        ]
+        parts = []
+        for family, (metric_type, description) in FAMILIES.items():
+            parts.append(
+                f"# HELP {family} {description}\n# TYPE {family} {metric_type}\n"
+            )
+            parts.extend(metric.families.get(family, "") for metric in metrics)
+        return web.Response(
+            body="".join(parts).encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
@@ -0,0 +1,218 @@
+"""Delios inverter profiles."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from attr import dataclass
+
+from .client import InvalidAttribute
+from .const import MODELS
+from .entity import SENSORS, SETTINGS
+from .inverter import DeliosInverter
+from .samples import SAMPLE_VARIABLES
+
+_LOGGER = logging.getLogger(__name__)
+
+ENDPOINTS: tuple[str, ...] = (
+    "sensors",
+    "parameters",
+    "status",
+    "totalizer",
+    "firmware",
+)
+# Data kinds holding the `ctrl_name` variables decoded on demand.
+VARIABLE_KINDS: tuple[str, ...] = ("sensors", "parameters")
+# Probes in a row an endpoint, entity or variable must be missing from
+# before the profile leaves it out.
+PROBE_MISSES = 3
+
+
+@dataclass(frozen=True, slots=True)
+class DeliosProfile:
+    """Endpoints polled, variables decoded and entities created for an inverter."""
+
+    model: str = ""
+    endpoints: tuple[str, ...] = ENDPOINTS
+    variables: Optional[tuple[str, ...]] = None
+    entities: Optional[tuple[str, ...]] = None
+    catalogue: tuple[tuple[str, str], ...] = ()
+    # Probes in a row each endpoint, entity or catalogue variable was missing.
+    misses: tuple[tuple[str, int], ...] = ()
+    # Variables read by each entity the last time it was probed.
+    reads: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+    def polls(self, endpoint: str) -> bool:
+        """Return whether an endpoint is polled."""
+        return endpoint in self.endpoints
+
+    def creates(self, key: str) -> bool:
+        """Return whether the entity of an attribute key is created."""
+        return self.entities is None or key in self.entities
+
+
+# Known models read every endpoint until the probes of their setups narrow it.
+MODEL_PROFILES: dict[str, DeliosProfile] = {
+    model: DeliosProfile(model=model) for model in MODELS
+}
+
+
+def model_profile(inverter: DeliosInverter) -> DeliosProfile:
+    """Return the static profile of an inverter model."""
+    return MODEL_PROFILES.get(inverter.model, DeliosProfile(model=inverter.model))
+
+
+def profile_from_data(
+    data: dict | None, inverter: DeliosInverter
+) -> DeliosProfile | None:
+    """Return the profile cached in an entry, None when missing or outdated."""
+    if not data or data.get("model") != inverter.model:
+        return None
+    return DeliosProfile(
+        model=data["model"],
+        endpoints=tuple(data["endpoints"]),
+        variables=_tuple(data.get("variables")),
+        entities=_tuple(data.get("entities")),
+        catalogue=tuple((kind, name) for kind, name in data.get("catalogue", ())),
+        misses=tuple((item, count) for item, count in data.get("misses", ())),
+        reads=tuple((key, tuple(names)) for key, names in data.get("reads", ())),
+    )
+
+
+def _tuple(value: list[str] | None) -> tuple[str, ...] | None:
+    """Return a stored list as tuple."""
+    return None if value is None else tuple(value)
+
+
+class _VariableReads:
+    """Variables read from sensors or parameters data while probing."""
+
+    __slots__ = ("_data", "_variables")
+
+    def __init__(self, data: Any, variables: set[str]) -> None:
+        """Initialize variable reads."""
+        self._data = data
+        self._variables = variables
+
+    def get(self, name: str) -> Any:
+        """Record the variable and read it."""
+        self._variables.add(name)
+        return self._data.get(name)
+
+
+class _ProbeData(dict):
+    """Coordinator data recording the variables an attribute reads."""
+
+    __slots__ = ("variables",)
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """Initialize probe data."""
+        super().__init__(data)
+        self.variables: set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the data of a kind, recording variable reads."""
+        value = super().__getitem__(key)
+        if key in VARIABLE_KINDS:
+            return _VariableReads(value, self.variables)
+        return value
+
+
+def probe_profile(
+    inverter: DeliosInverter,
+    data: dict[str, Any],
+    previous: DeliosProfile | None = None,
+) -> DeliosProfile | None:
+    """Merge the data of a refresh polling every endpoint into a profile.
+
+    Endpoints, entities and catalogue variables missing from `PROBE_MISSES`
+    probes in a row are no longer polled, created or catalogued, and come
+    back as soon as the inverter reports them again. Only the variables
+    read by the created entities are decoded, the reported variables no
+    entity reads make up the catalogue.
+    """
+    if data.get("sensors") is None:
+        return None
+    profile = model_profile(inverter)
+    previous = previous or profile
+    misses = dict(previous.misses)
+    reads = dict(previous.reads)
+
+    def kept(item: str, present: bool) -> bool:
+        """Count a probe of an item, return whether the profile keeps it."""
+        if present:
+            misses.pop(item, None)
+            return True
+        misses[item] = min(misses.get(item, 0) + 1, PROBE_MISSES)
+        return misses[item] < PROBE_MISSES
+
+    endpoints = tuple(
+        endpoint
+        for endpoint in profile.endpoints
+        if kept(f"endpoint:{endpoint}", data.get(endpoint) is not None)
+    )
+    entities = []
+    for attribute in (*SENSORS, *SETTINGS):
+        if not profile.creates(attribute.key):
+            continue
+        probe = _ProbeData(data)
+        present = True
+        try:
+            attribute.value(probe)
+        except (KeyError, InvalidAttribute):
+            present = False
+        except (TypeError, ValueError):
+            # Reported, but not a number right now.
+            pass
+        if present:
+            reads[attribute.key] = tuple(sorted(probe.variables))
+        else:
+            # Keep what it read while reported, to decode it on its return.
+            known = {*reads.get(attribute.key, ()), *probe.variables}
+            reads[attribute.key] = tuple(sorted(known))
+        if kept(f"entity:{attribute.key}", present):
+            entities.append(attribute.key)
+    variables = {name for key in entities for name in reads[key]}
+    reported = {
+        (kind, name): None
+        for kind in VARIABLE_KINDS
+        if data.get(kind) is not None
+        for name in data[kind].names
+    }
+    catalogue = tuple(
+        (kind, name)
+        for kind, name in dict.fromkeys((*previous.catalogue, *reported))
+        if name not in variables and kept(f"{kind}:{name}", (kind, name) in reported)
+    )
+    probed = DeliosProfile(
+        model=profile.model,
+        endpoints=endpoints,
+        variables=tuple(sorted(variables)),
+        entities=tuple(entities),
+        catalogue=catalogue,
+        misses=tuple(sorted(misses.items())),
+        reads=tuple(sorted(reads.items())),
+    )
+    _LOGGER.debug(
+        "Profile of %s polls %s, creates %d entities and catalogues %d variables",
+        inverter.name,
+        probed.endpoints,
+        len(probed.entities),
+        len(probed.catalogue),
+    )
+    return probed
+
+
+def decoded_variables(
+    inverter: DeliosInverter, profile: DeliosProfile, enabled: Iterable[str] = ()
+) -> frozenset[str] | None:
+    """Return the variables the client decodes, None for every variable.
+
+    Catalogue variables are only decoded once their entity is `enabled`,
+    while the export and the journal record every reported variable.
+    """
+    if profile.variables is None or inverter.export or inverter.journal_hours > 0:
+        return None
+    return frozenset((*profile.variables, *SAMPLE_VARIABLES, *enabled))
@@ -0,0 +1,149 @@
+"""Delios poll path profiling."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager
+
+_LOGGER = logging.getLogger(__name__)
+
+STAGES: tuple[str, ...] = ("request", "decode", "compute", "write")
+PACKAGE_DIR = os.path.dirname(__file__)
+TOP_FUNCTIONS = 15
+
+
+class DeliosProfiler:
+    """Profile of the next refreshes of some inverters.
+
+    cProfile only runs while a profiled coordinator refreshes and its
+    entities handle the new data, and the saved stats keep the functions
+    of this integration only. Refreshes are counted on the sensors
+    coordinators, the others are profiled while the profile runs.
+    """
+
+    def __init__(self, refreshes: int, inverters: set[str]) -> None:
+        """Initialize a profile of `refreshes` polls of each inverter."""
+        self.refreshes = refreshes
+        self.counts = dict.fromkeys(inverters, 0)
+        self.wall = dict.fromkeys(STAGES, 0.0)
+        self.cpu = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.done = asyncio.Event()
+        self._profile = cProfile.Profile()
+        self._active = 0
+        self._enabled = False
+
+    def async_refresh_started(self) -> None:
+        """Profile until the end of the refresh."""
+        self._active += 1
+        if self._active == 1 and not self.done.is_set():
+            try:
+                self._profile.enable()
+                self._enabled = True
+            except ValueError as exception:
+                # Another profiler owns the interpreter, keep the stage timings.
+                _LOGGER.warning("Unable to start cProfile: %s", exception)
+
+    def async_refresh_finished(self, kind: str, unique_id: str) -> None:
+        """Count a refresh, pausing once its entities handled the data."""
+        if kind == "sensors" and unique_id in self.counts:
+            self.counts[unique_id] += 1
+            if min(self.counts.values()) >= self.refreshes:
+                self.done.set()
+        # Listeners run right after the refresh, in the same loop iteration.
+        asyncio.get_running_loop().call_soon(self._async_pause)
+
+    def _async_pause(self) -> None:
+        """Stop profiling when no refresh is running."""
+        self._active -= 1
+        if self._active == 0:
+            self.async_stop()
+
+    def async_stop(self) -> None:
+        """Stop profiling."""
+        if self._enabled:
+            self._profile.disable()
+            self._enabled = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the wall and CPU time of a poll path stage."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.wall[name] += time.perf_counter() - wall
+            self.cpu[name] += time.thread_time() - cpu
+            self.calls[name] += 1
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return the time spent in each stage.
+
+        The request stage excludes decoding. Its CPU time is unknown since
+        other tasks run while it waits for the inverter.
+        """
+        stages = {}
+        for name in STAGES:
+            wall, cpu = self.wall[name], self.cpu[name]
+            if name == "request":
+                wall, cpu = wall - self.wall["decode"], None
+            stages[name] = {
+                "calls": self.calls[name],
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": None if cpu is None else round(cpu * 1000, 3),
+            }
+        return stages
+
+    def save(self, path: str) -> list[dict[str, Any]] | None:
+        """Save the stats of the integration functions, return the slowest.
+
+        Returns None when nothing was profiled.
+        """
+        self.async_stop()
+        try:
+            stats = pstats.Stats(self._profile)
+        except TypeError:
+            return None
+        stats.stats = {
+            function: (cc, nc, tt, ct, _own(callers))
+            for function, (cc, nc, tt, ct, callers) in stats.stats.items()
+            if _own_function(function)
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stats.dump_stats(path)
+        slowest = sorted(stats.stats.items(), key=lambda item: -item[1][3])
+        return [
+            {
+                "function": f"{os.path.basename(file)}:{line}({name})",
+                "calls": nc,
+                "total_ms": round(tt * 1000, 3),
+                "cumulative_ms": round(ct * 1000, 3),
+            }
+            for (file, line, name), (_, nc, tt, ct, _) in slowest[:TOP_FUNCTIONS]
+        ]
+
+
+def _own_function(function: tuple[str, int, str]) -> bool:
+    """Return whether a profiled function belongs to the integration."""
+    return function[0].startswith(PACKAGE_DIR)
+
+
+def _own(callers: dict) -> dict:
+    """Keep the callers belonging to the integration."""
+    return {
+        function: value
+        for function, value in callers.items()
+        if _own_function(function)
+    }
+
+
+def stage(profiler: DeliosProfiler | None, name: str) -> ContextManager:
+    """Time a poll path stage while a profile runs."""
+    return nullcontext() if profiler is None else profiler.stage(name)
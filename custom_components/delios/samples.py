@@ -0,0 +1,105 @@
+"""Delios high-rate sample buffer."""
+
+from __future__ import annotations
+
+import logging
+import math
+from array import array
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+from attr import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+SAMPLE_VARIABLES: tuple[str, ...] = ("PowerPV", "PowerGrid", "PowerBatt", "PowerHouse")
+
+
+@dataclass(frozen=True, slots=True)
+class SampleAggregate:
+    """Rolling aggregate of a sampled variable."""
+
+    count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    p5: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of sorted values, linearly interpolated."""
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class SampleRing:
+    """Fixed-size ring buffer of timestamped samples.
+
+    Every variable is stored in its own preallocated `array('d')`, so memory
+    use only depends on the buffer size and never grows with uptime.
+    """
+
+    def __init__(self, variables: Iterable[str], size: int) -> None:
+        """Initialize an empty ring buffer."""
+        self._size = max(size, 1)
+        self._times = array("d", [math.nan]) * self._size
+        self._values = {
+            variable: array("d", [math.nan]) * self._size for variable in variables
+        }
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """Return the ring buffer capacity."""
+        return self._size
+
+    @property
+    def variables(self) -> tuple[str, ...]:
+        """Return the sampled variables."""
+        return tuple(self._values)
+
+    def append(self, timestamp: float, values: Mapping[str, float]) -> None:
+        """Store a sample, overwriting the oldest one when full."""
+        index = self._index
+        self._times[index] = timestamp
+        for variable, column in self._values.items():
+            column[index] = values.get(variable, math.nan)
+        self._index = (index + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def window(self, variable: str, since: float) -> list[float]:
+        """Return the values of a variable sampled at or after `since`."""
+        column = self._values[variable]
+        values = []
+        index = self._index
+        for _ in range(self._count):
+            index = (index - 1) % self._size
+            if self._times[index] < since:
+                break
+            if not math.isnan(column[index]):
+                values.append(column[index])
+        return values
+
+    def aggregate(self, variable: str, since: float) -> SampleAggregate:
+        """Return min, max, mean and percentiles of a variable since `since`."""
+        values = sorted(self.window(variable, since))
+        if not values:
+            return SampleAggregate()
+        return SampleAggregate(
+            count=len(values),
+            min=values[0],
+            max=values[-1],
+            mean=math.fsum(values) / len(values),
+            p5=percentile(values, 5),
+            p50=percentile(values, 50),
+            p95=percentile(values, 95),
+        )
@@ -9,8 +9,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
-from .coordinator import DeliosSensorsCoordinator, DeliosSystemCoordinator
+from .const import CONF_FLEET, DATA_FLEET_COORDINATOR, DOMAIN
+from .coordinator import async_get_coordinators
 from .entity import DeliosEntityType
 from .inverter import inverter_from_data
 
@@ -23,20 +23,18 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Add sensors for passed config_entry in HA."""
-    inverter = inverter_from_data(config_entry.data)
+    inverter = inverter_from_data({**config_entry.data, **config_entry.options})
     hass.data.setdefault(DOMAIN, {})
     if inverter.unique_id not in hass.data[DOMAIN]:
         hass.data[DOMAIN][inverter.unique_id] = {}
     if SENSOR_DOMAIN not in hass.data[DOMAIN][inverter.unique_id]:
         hass.data[DOMAIN][inverter.unique_id][SENSOR_DOMAIN] = {}
-    sensors_coordinator = DeliosSensorsCoordinator(hass, inverter)
-    await sensors_coordinator.setup()
-    await sensors_coordinator.async_config_entry_first_refresh()
-    sensors_coordinator.add_entities(async_add_entities, DeliosEntityType.SENSOR)
-    system_coordinator = DeliosSystemCoordinator(hass, inverter)
-    await system_coordinator.setup()
-    await system_coordinator.async_config_entry_first_refresh()
-    system_coordinator.add_entities(async_add_entities, DeliosEntityType.SENSOR)
+    if config_entry.data.get(CONF_FLEET):
+        coordinators = [hass.data[DOMAIN][inverter.unique_id][DATA_FLEET_COORDINATOR]]
+    else:
+        coordinators = await async_get_coordinators(hass, inverter)
+    for coordinator in coordinators:
+        coordinator.add_entities(async_add_entities, DeliosEntityType.SENSOR)
 
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
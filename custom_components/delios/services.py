@@ -0,0 +1,312 @@
+"""Delios services."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.json import save_json
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .analysis import analyze, load_export, load_journal
+from .const import (
+    ATTR_CLIPPING_LIMIT,
+    ATTR_CONFIG_ENTRY,
+    ATTR_DURATION,
+    ATTR_END,
+    ATTR_INTERVAL,
+    ATTR_REFRESHES,
+    ATTR_SAVE,
+    ATTR_SOURCE,
+    ATTR_START,
+    ATTR_TIMEOUT,
+    CONF_FLEET,
+    DATA_BURST,
+    DATA_EXPORTER,
+    DATA_JOURNAL,
+    DATA_PROFILER,
+    DATA_SENSORS_COORDINATOR,
+    DEFAULT_BURST_DURATION,
+    DEFAULT_BURST_INTERVAL,
+    DEFAULT_PROFILE_REFRESHES,
+    DEFAULT_PROFILE_TIMEOUT,
+    DOMAIN,
+    SERVICE_ANALYZE,
+    SERVICE_BURST_SAMPLE,
+    SERVICE_EXPORT,
+    SERVICE_PROFILE,
+    SERVICE_READ_JOURNAL,
+    SOURCE_EXPORT,
+    SOURCE_JOURNAL,
+)
+from .coordinator import DeliosCoordinator
+from .inverter import inverter_from_data
+from .profiler import DeliosProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_JOURNAL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+EXPORT_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY): cv.string})
+
+ANALYZE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_SOURCE): vol.In([SOURCE_EXPORT, SOURCE_JOURNAL]),
+        vol.Optional(ATTR_CLIPPING_LIMIT): vol.Coerce(float),
+        vol.Optional(ATTR_SAVE, default=False): cv.boolean,
+    }
+)
+
+BURST_SAMPLE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): cv.string,
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_BURST_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.2, max=60)
+        ),
+        vol.Optional(ATTR_DURATION, default=DEFAULT_BURST_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_REFRESHES, default=DEFAULT_PROFILE_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_PROFILE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+
+def timestamp(value: datetime) -> float:
+    """Return the POSIX timestamp of a datetime, naive ones being local time."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return value.timestamp()
+
+
+def async_get_inverter_data(hass: HomeAssistant, entry_id: str) -> dict:
+    """Return the runtime data of a loaded Delios config entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        raise ServiceValidationError(f"Delios entry {entry_id} is not loaded")
+    if entry.data.get(CONF_FLEET):
+        raise ServiceValidationError(f"Delios entry {entry_id} is a fleet")
+    return hass.data[DOMAIN][inverter_from_data(entry.data).unique_id]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Delios services."""
+
+    async def async_read_journal(call: ServiceCall) -> ServiceResponse:
+        """Read back a time range of journaled samples."""
+        data = async_get_inverter_data(hass, call.data[ATTR_CONFIG_ENTRY])
+        if (journal := data.get(DATA_JOURNAL)) is None:
+            raise ServiceValidationError("The sample journal is not enabled")
+        start = timestamp(call.data[ATTR_START]) if ATTR_START in call.data else 0
+        end = timestamp(call.data[ATTR_END]) if ATTR_END in call.data else math.inf
+        records = await hass.async_add_executor_job(journal.read, start, end)
+        return {
+            "variables": list(journal.variables),
+            "samples": [list(record) for record in records],
+        }
+
+    async def async_export(call: ServiceCall) -> ServiceResponse:
+        """Flush the buffered export rows to files."""
+        if ATTR_CONFIG_ENTRY in call.data:
+            inverters = [async_get_inverter_data(hass, call.data[ATTR_CONFIG_ENTRY])]
+        else:
+            inverters = list(hass.data.get(DOMAIN, {}).values())
+        files = []
+        for data in inverters:
+            if (exporter := data.get(DATA_EXPORTER)) is not None:
+                files.extend(await exporter.async_flush())
+        return {"files": files}
+
+    async def async_analyze(call: ServiceCall) -> ServiceResponse:
+        """Summarize the exported or journaled samples of a date range."""
+        entry_id = call.data[ATTR_CONFIG_ENTRY]
+        data = async_get_inverter_data(hass, entry_id)
+        end = (
+            timestamp(call.data[ATTR_END])
+            if ATTR_END in call.data
+            else dt_util.utcnow().timestamp()
+        )
+        start = (
+            timestamp(call.data[ATTR_START])
+            if ATTR_START in call.data
+            else end - timedelta(days=1).total_seconds()
+        )
+        source = call.data.get(
+            ATTR_SOURCE, SOURCE_EXPORT if DATA_EXPORTER in data else SOURCE_JOURNAL
+        )
+        exporter = data.get(DATA_EXPORTER)
+        journal = data.get(DATA_JOURNAL)
+        if source == SOURCE_EXPORT and exporter is None:
+            raise ServiceValidationError("The sample export is not enabled")
+        if source == SOURCE_JOURNAL and journal is None:
+            raise ServiceValidationError("The sample journal is not enabled")
+        name = hass.config_entries.async_get_entry(entry_id).title
+        path = hass.config.path(
+            DOMAIN, "reports", f"{slugify(name)}-{int(start)}-{int(end)}.json"
+        )
+
+        def run() -> dict:
+            if source == SOURCE_EXPORT:
+                sensors = load_export(exporter.directory, "sensors", start, end)
+                parameters = load_export(exporter.directory, "parameters", start, end)
+                totalizer = load_export(exporter.directory, "totalizer", start, end)
+            else:
+                sensors = load_journal(journal, start, end)
+                parameters = totalizer = {}
+            report = {
+                "start": dt_util.utc_from_timestamp(start).isoformat(),
+                "end": dt_util.utc_from_timestamp(end).isoformat(),
+                "source": source,
+                **analyze(
+                    sensors, parameters, totalizer, call.data.get(ATTR_CLIPPING_LIMIT)
+                ),
+            }
+            if call.data[ATTR_SAVE]:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                save_json(path, report)
+                report["report"] = path
+            return report
+
+        return await hass.async_add_executor_job(run)
+
+    async def async_burst_sample(call: ServiceCall) -> ServiceResponse:
+        """Capture the dashboard at a high rate for a short time."""
+        data = async_get_inverter_data(hass, call.data[ATTR_CONFIG_ENTRY])
+        if (burst := data.get(DATA_BURST)) is None:
+            raise ServiceValidationError("Burst sampling needs a polled inverter")
+        if burst.running:
+            raise ServiceValidationError("A burst is already running")
+        task = burst.async_start(call.data[ATTR_INTERVAL], call.data[ATTR_DURATION])
+        if call.return_response:
+            return await task
+        return None
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next refreshes of some inverters."""
+        if hass.data.get(DATA_PROFILER) is not None:
+            raise ServiceValidationError("A profile is already running")
+        inverters = {
+            entry_id: async_get_inverter_data(hass, entry_id)
+            for entry_id in call.data[ATTR_CONFIG_ENTRY]
+        }
+        entries = {}
+        coordinators: list[DeliosCoordinator] = []
+        for entry_id, data in inverters.items():
+            inverter = data[DATA_SENSORS_COORDINATOR].inverter
+            if inverter.push:
+                raise ServiceValidationError(f"Delios entry {entry_id} is not polled")
+            entries[inverter.unique_id] = entry_id
+            coordinators.extend(
+                value for value in data.values() if isinstance(value, DeliosCoordinator)
+            )
+        profiler = DeliosProfiler(call.data[ATTR_REFRESHES], set(entries))
+        hass.data[DATA_PROFILER] = profiler
+        path = hass.config.path(DOMAIN, "profiles", f"profile-{int(time.time())}.prof")
+
+        def async_attach(attached: DeliosProfiler | None) -> None:
+            for coordinator in coordinators:
+                coordinator.profiler = attached
+                if coordinator.client is not None:
+                    coordinator.client.profiler = attached
+
+        async def run() -> dict:
+            async_attach(profiler)
+            try:
+                for data in inverters.values():
+                    await data[DATA_SENSORS_COORDINATOR].async_request_refresh()
+                await asyncio.wait_for(profiler.done.wait(), call.data[ATTR_TIMEOUT])
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Profile timed out, saving the refreshes so far")
+            finally:
+                async_attach(None)
+                profiler.async_stop()
+                hass.data.pop(DATA_PROFILER, None)
+            functions = await hass.async_add_executor_job(profiler.save, path)
+            return {
+                "file": path if functions is not None else None,
+                "refreshes": {
+                    entries[unique_id]: count
+                    for unique_id, count in profiler.counts.items()
+                },
+                "stages": profiler.summary(),
+                "functions": functions or [],
+            }
+
+        if call.return_response:
+            return await run()
+        hass.async_create_background_task(run(), f"{DOMAIN} profile")
+        return None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ANALYZE,
+        async_analyze,
+        schema=ANALYZE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        async_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BURST_SAMPLE,
+        async_burst_sample,
+        schema=BURST_SAMPLE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_JOURNAL,
+        async_read_journal,
+        schema=READ_JOURNAL_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
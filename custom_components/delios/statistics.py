@@ -0,0 +1,251 @@
+"""Delios long-term energy statistics."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .client import InvalidAttribute, SensorsData, TotalizerData
+from .const import DOMAIN
+from .coordinator import DeliosSensorsCoordinator, DeliosSystemCoordinator
+from .inverter import DeliosInverter
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+
+STATISTIC_ID_FORMAT = DOMAIN + ":{}_{}"
+
+# Totalizer attribute -> (statistic key, statistic name)
+TOTALIZERS: dict[str, tuple[str, str]] = {
+    "photovoltaic": ("photovoltaic_energy_total", "Photovoltaic Energy Total"),
+    "buyed": ("buyed_energy_total", "Buyed Energy Total"),
+    "injected": ("injected_energy_total", "Injected Energy Total"),
+    "self_consumed": ("self_consumed_energy_total", "Self Consumed Energy Total"),
+}
+
+# Totalizer attribute -> dashboard power variable (kW) used to shape the gap
+POWER_VARIABLES: dict[str, str] = {
+    "photovoltaic": "PowerPV",
+}
+
+
+def interpolate_hourly(
+    start: datetime,
+    start_value: float,
+    end: datetime,
+    end_value: float,
+    weights: dict[datetime, float] | None = None,
+) -> list[tuple[datetime, float]]:
+    """Interpolate a totalizer at every hour boundary between two readings.
+
+    `weights` maps hour starts to the energy integrated locally during that
+    hour; hours without a weight share what is left of the delta
+    proportionally to their duration. Return the totalizer value at the end
+    of every complete hour, keyed by the hour start.
+    """
+    weights = weights or {}
+    delta = max(end_value - start_value, 0.0)
+    buckets: list[tuple[datetime, float, float | None]] = []
+    hour = start.replace(minute=0, second=0, microsecond=0)
+    while hour < end:
+        duration = (min(hour + HOUR, end) - max(hour, start)) / HOUR
+        buckets.append((hour, duration, weights.get(hour)))
+        hour += HOUR
+    if not buckets:
+        return []
+
+    measured = sum(weight for _, _, weight in buckets if weight is not None)
+    unmeasured = sum(duration for _, duration, weight in buckets if weight is None)
+    residual = max(delta - measured, 0.0)
+    shares = [
+        weight if weight is not None else residual * duration / unmeasured
+        for _, duration, weight in buckets
+    ]
+    total = sum(shares)
+    if total <= 0:
+        shares = [duration for _, duration, _ in buckets]
+        total = sum(shares)
+
+    result: list[tuple[datetime, float]] = []
+    value = start_value
+    for (hour, _, _), share in zip(buckets, shares):
+        if hour + HOUR > end:
+            break
+        value += delta * share / total
+        result.append((hour, value))
+    return result
+
+
+class DeliosStatistics:
+    """Hourly energy statistics importer for a Delios inverter."""
+
+    def __init__(self, hass: HomeAssistant, inverter: DeliosInverter) -> None:
+        """Initialize statistics importer."""
+        self._hass = hass
+        self._inverter = inverter
+        self._anchors: dict[str, tuple[datetime, float, float]] = {}
+        self._weights: dict[str, dict[datetime, float]] = {
+            attribute: {} for attribute in POWER_VARIABLES
+        }
+        self._last_sample: tuple[datetime, dict[str, float]] | None = None
+
+    @callback
+    def async_attach(
+        self,
+        sensors_coordinator: DeliosSensorsCoordinator,
+        system_coordinator: DeliosSystemCoordinator,
+    ) -> CALLBACK_TYPE:
+        """Follow the inverter coordinators and return the detach callback."""
+
+        @callback
+        def async_sensors_updated() -> None:
+            if sensors_coordinator.data:
+                self.async_add_power_sample(sensors_coordinator.data.get("sensors"))
+
+        @callback
+        def async_system_updated() -> None:
+            if system_coordinator.data:
+                self._hass.async_create_task(
+                    self.async_import(system_coordinator.data.get("totalizer"))
+                )
+
+        remove_listeners = [
+            sensors_coordinator.async_add_listener(async_sensors_updated),
+            system_coordinator.async_add_listener(async_system_updated),
+        ]
+        async_system_updated()
+
+        @callback
+        def async_detach() -> None:
+            for remove_listener in remove_listeners:
+                remove_listener()
+
+        return async_detach
+
+    def statistic_id(self, attribute: str) -> str:
+        """Return the external statistic ID of a totalizer."""
+        return STATISTIC_ID_FORMAT.format(
+            slugify(self._inverter.name), TOTALIZERS[attribute][0]
+        )
+
+    @callback
+    def async_add_power_sample(
+        self, sensors: SensorsData | None, now: datetime | None = None
+    ) -> None:
+        """Integrate a dashboard sample into the hourly energy weights."""
+        if sensors is None:
+            return
+        now = now or dt_util.utcnow()
+        values = {}
+        for attribute, variable in POWER_VARIABLES.items():
+            try:
+                values[attribute] = max(sensors.get(variable), 0.0)
+            except InvalidAttribute:
+                continue
+        if self._last_sample is not None:
+            previous_time, previous_values = self._last_sample
+            for attribute, value in values.items():
+                if attribute in previous_values:
+                    self._integrate(
+                        attribute,
+                        previous_time,
+                        now,
+                        (previous_values[attribute] + value) / 2,
+                    )
+        self._last_sample = (now, values)
+
+    def _integrate(
+        self, attribute: str, start: datetime, end: datetime, power: float
+    ) -> None:
+        """Split a constant power interval (kW) into hourly energy buckets."""
+        weights = self._weights[attribute]
+        while start < end:
+            hour = start.replace(minute=0, second=0, microsecond=0)
+            stop = min(hour + HOUR, end)
+            weights[hour] = weights.get(hour, 0.0) + power * (stop - start) / HOUR
+            start = stop
+
+    async def async_import(
+        self, totalizer: TotalizerData | None, now: datetime | None = None
+    ) -> None:
+        """Import the hours elapsed since the last statistic in one bulk insert."""
+        if totalizer is None:
+            return
+        now = now or dt_util.utcnow()
+        for attribute in TOTALIZERS:
+            value = getattr(totalizer, attribute)
+            anchor = self._anchors.get(attribute)
+            if anchor is None:
+                anchor = await self._async_load_anchor(attribute)
+            if anchor is None:
+                self._anchors[attribute] = (now, value, 0.0)
+                continue
+            start, start_value, start_sum = anchor
+            rows = interpolate_hourly(
+                start, start_value, now, value, self._weights.get(attribute)
+            )
+            if not rows:
+                continue
+            statistics: list[StatisticData] = []
+            for hour, state in rows:
+                statistics.append(
+                    StatisticData(
+                        start=hour,
+                        state=state,
+                        sum=start_sum + state - start_value,
+                    )
+                )
+            async_add_external_statistics(
+                self._hass, self._metadata(attribute), statistics
+            )
+            last_hour, last_state = rows[-1]
+            self._anchors[attribute] = (
+                last_hour + HOUR,
+                last_state,
+                start_sum + last_state - start_value,
+            )
+            weights = self._weights.get(attribute, {})
+            for hour in [hour for hour in weights if hour <= last_hour]:
+                del weights[hour]
+
+    async def _async_load_anchor(
+        self, attribute: str
+    ) -> tuple[datetime, float, float] | None:
+        """Load the end of the last imported hour from the recorder."""
+        statistic_id = self.statistic_id(attribute)
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, False, {"state", "sum"}
+        )
+        if statistic_id not in last or not last[statistic_id]:
+            return None
+        row = last[statistic_id][0]
+        anchor = (
+            dt_util.utc_from_timestamp(row["start"]) + HOUR,
+            row["state"] or 0.0,
+            row["sum"] or 0.0,
+        )
+        self._anchors[attribute] = anchor
+        return anchor
+
+    def _metadata(self, attribute: str) -> StatisticMetaData:
+        """Return the statistic metadata of a totalizer."""
+        return StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            name=f"{self._inverter.name} {TOTALIZERS[attribute][1]}",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(attribute),
+            unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        )
@@ -0,0 +1,201 @@
+"""Delios websocket API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+
+from .client import InvalidAttribute, SensorsData, UnauthorizedClient
+from .const import (
+    ATTR_CONFIG_ENTRY,
+    DATA_LIVE_POLL,
+    DATA_SENSORS_COORDINATOR,
+    DOMAIN,
+)
+from .coordinator import DeliosSensorsCoordinator
+from .services import async_get_inverter_data
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_FIELDS = "fields"
+ATTR_MIN_INTERVAL = "min_interval"
+ATTR_SCAN_INTERVAL = "scan_interval"
+
+# Live field -> (dashboard variable, scale)
+LIVE_FIELDS: dict[str, tuple[str, float]] = {
+    "photovoltaic_power": ("PowerPV", 1000),
+    "grid_power": ("PowerGrid", 1000),
+    "battery_power": ("PowerBatt", 1000),
+    "house_power": ("PowerHouse", 1000),
+    "battery_percent": ("PercentBattery", 1),
+}
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the Delios websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def live_sample(sensors: SensorsData, fields: list[str]) -> dict[str, Any]:
+    """Return the selected live fields of a dashboard sample."""
+    variables = [LIVE_FIELDS[field][0] for field in fields]
+    return {
+        field: value * LIVE_FIELDS[field][1]
+        for field, value in zip(fields, sensors.values(variables))
+        if not math.isnan(value)
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_CONFIG_ENTRY): str,
+        vol.Optional(ATTR_FIELDS, default=list(LIVE_FIELDS)): [vol.In(LIVE_FIELDS)],
+        vol.Optional(ATTR_MIN_INTERVAL, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_SCAN_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Push every decoded dashboard sample of an inverter to the subscriber.
+
+    Samples go straight from the coordinator to the connection, so they
+    never touch the state machine nor the recorder. `min_interval` drops
+    samples received sooner than that after the previous push, and
+    `scan_interval` moves the subscriber to the live poll of the inverter,
+    leaving the coordinator and its entities at their own interval.
+    """
+    try:
+        data = async_get_inverter_data(hass, msg[ATTR_CONFIG_ENTRY])
+    except ServiceValidationError as exception:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(exception))
+        return
+    coordinator: DeliosSensorsCoordinator = data[DATA_SENSORS_COORDINATOR]
+    fields = msg[ATTR_FIELDS]
+    min_interval = msg[ATTR_MIN_INTERVAL]
+    last_push = -min_interval
+
+    @callback
+    def async_forward(sensors: SensorsData | None) -> None:
+        nonlocal last_push
+        if sensors is None:
+            return
+        now = time.monotonic()
+        if now - last_push < min_interval:
+            return
+        last_push = now
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {"timestamp": time.time(), **live_sample(sensors, fields)},
+            )
+        )
+
+    @callback
+    def async_forward_sample() -> None:
+        async_forward((coordinator.data or {}).get("sensors"))
+
+    if ATTR_SCAN_INTERVAL in msg and coordinator.update_interval is not None:
+        if DATA_LIVE_POLL not in data:
+            entry = hass.config_entries.async_get_entry(msg[ATTR_CONFIG_ENTRY])
+            data[DATA_LIVE_POLL] = DeliosLivePoll(hass, entry, coordinator)
+        async_unsubscribe = data[DATA_LIVE_POLL].async_subscribe(
+            async_forward, msg[ATTR_SCAN_INTERVAL]
+        )
+    else:
+        async_unsubscribe = coordinator.async_add_listener(async_forward_sample)
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    async_forward_sample()
+
+
+class DeliosLivePoll:
+    """Dashboard reads shared by the subscribers asking for a faster interval.
+
+    A single task polls at the smallest interval requested by the current
+    subscribers and stops with the last of them. Like bursts, the reads go
+    through the coordinator client without touching the coordinator data.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: DeliosSensorsCoordinator,
+    ) -> None:
+        """Initialize the live poll."""
+        self._hass = hass
+        self._entry = entry
+        self._coordinator = coordinator
+        self._subscribers: dict[Callable[[SensorsData | None], None], int] = {}
+        self._interval: int | None = None
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_subscribe(
+        self, forward: Callable[[SensorsData | None], None], interval: int
+    ) -> CALLBACK_TYPE:
+        """Forward the samples read at most `interval` seconds apart."""
+        self._subscribers[forward] = interval
+        self._async_schedule()
+
+        @callback
+        def async_unsubscribe() -> None:
+            self._subscribers.pop(forward, None)
+            self._async_schedule()
+
+        return async_unsubscribe
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Restart the poll when the smallest requested interval changes."""
+        interval = min(self._subscribers.values(), default=None)
+        if interval == self._interval:
+            return
+        self._interval = interval
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if interval is not None:
+            self._task = self._entry.async_create_background_task(
+                self._hass,
+                self._async_poll(interval),
+                f"{DOMAIN} live poll {self._coordinator.inverter.name}",
+            )
+
+    async def _async_poll(self, interval: int) -> None:
+        """Read the dashboard every `interval` seconds for the subscribers."""
+        deadline = time.monotonic()
+        while True:
+            try:
+                sensors = await self._coordinator.client.sensors()
+            except (
+                UnauthorizedClient,
+                InvalidAttribute,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as exception:
+                _LOGGER.debug("Live sample failed: %r", exception)
+            else:
+                for forward in list(self._subscribers):
+                    forward(sensors)
+            now = time.monotonic()
+            deadline += interval * max(1, math.ceil((now - deadline) / interval))
+            await asyncio.sleep(max(deadline - now, 0))
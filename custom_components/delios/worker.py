@@ -0,0 +1,456 @@
+"""Delios poller worker processes.
+
+In worker mode the web server requests, the JSON decoding and the login
+of an inverter run in a subprocess shared with other inverters:
+
+    python -m custom_components.delios.worker
+
+Requests are JSON lines on the worker stdin, replies are binary frames on
+its stdout. Dashboard and parameter values travel as packed doubles, their
+names only when they change, so the event loop only unpacks them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import struct
+import sys
+from typing import Any
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .client import (
+    DEFAULT_TIMEOUT,
+    DeliosClient,
+    DeliosTransport,
+    FirmwareData,
+    InvalidAttribute,
+    ParametersData,
+    SensorsData,
+    StatusData,
+    TotalizerData,
+    UnauthorizedClient,
+    json_loads,
+)
+from .const import DATA_WORKERS, WORKER_POOL_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Body length, request id and status of a reply.
+FRAME_HEADER = struct.Struct("<IIB")
+# Whether the names follow and the number of values of a variables body.
+VARIABLES_HEADER = struct.Struct("<?H")
+NAMES_LENGTH = struct.Struct("<I")
+
+STATUS_OK = 0
+STATUS_NONE = 1
+STATUS_UNAUTHORIZED = 2
+STATUS_UNREACHABLE = 3
+STATUS_ERROR = 4
+
+VARIABLE_DATA: dict[str, type] = {"sensors": SensorsData, "parameters": ParametersData}
+RECORD_DATA: dict[str, type] = {
+    "status": StatusData,
+    "totalizer": TotalizerData,
+    "firmware": FirmwareData,
+}
+# Extra time a worker gets on top of its own request timeout.
+WORKER_TIMEOUT = DEFAULT_TIMEOUT + 5
+WORKER_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+class DeliosWorkerError(Exception):
+    """Unexpected worker failure."""
+
+
+def pack_variables(data: Any, sent: tuple[str, ...] | None) -> tuple[bytes, tuple]:
+    """Pack dashboard or parameter values, with their names if not `sent`."""
+    names = tuple(data.names)
+    values = data.values(names)
+    body = VARIABLES_HEADER.pack(names != sent, len(names))
+    if names != sent:
+        encoded = json.dumps(names).encode()
+        body += NAMES_LENGTH.pack(len(encoded)) + encoded
+    return body + struct.pack(f"<{len(values)}d", *values), names
+
+
+def unpack_variables(
+    data_class: type, body: bytes, sent: tuple[str, ...] | None
+) -> tuple[Any, tuple]:
+    """Unpack dashboard or parameter values, returning them and their names."""
+    changed, count = VARIABLES_HEADER.unpack_from(body)
+    offset = VARIABLES_HEADER.size
+    names = sent
+    if changed:
+        (length,) = NAMES_LENGTH.unpack_from(body, offset)
+        offset += NAMES_LENGTH.size
+        names = tuple(json_loads(body[offset : offset + length]))
+        offset += length
+    if names is None or len(names) != count:
+        raise DeliosWorkerError("Values received before their names")
+    values = struct.unpack_from(f"<{count}d", body, offset)
+    return data_class.from_values(names, values), names
+
+
+def pack_record(data: Any) -> bytes:
+    """Pack status, totalizer or firmware data."""
+    return json.dumps({slot: getattr(data, slot) for slot in data.__slots__}).encode()
+
+
+def unpack_record(data_class: type, body: bytes) -> Any:
+    """Unpack status, totalizer or firmware data."""
+    data = data_class.__new__(data_class)
+    for slot, value in json_loads(body).items():
+        setattr(data, slot, value)
+    return data
+
+
+class DeliosWorkerServer:
+    """Serve the requests of Home Assistant inside a worker process."""
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize the worker server."""
+        self._session = session
+        self._clients: dict[int, DeliosClient] = {}
+        self._names: dict[tuple[int, str], tuple[str, ...]] = {}
+
+    async def async_handle(self, request: dict[str, Any]) -> tuple[int, bytes]:
+        """Run a request and return the reply status and body."""
+        client_id = request["client"]
+        if request["op"] == "close":
+            self._clients.pop(client_id, None)
+            for key in [key for key in self._names if key[0] == client_id]:
+                del self._names[key]
+            return STATUS_OK, b""
+        if (client := self._clients.get(client_id)) is None:
+            client = self._clients[client_id] = DeliosClient(
+                self._session, request["host"]
+            )
+        try:
+            return await self._async_run(client, client_id, request)
+        except UnauthorizedClient:
+            return STATUS_UNAUTHORIZED, b""
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exception:
+            return STATUS_UNREACHABLE, repr(exception).encode()
+        except (InvalidAttribute, KeyError, TypeError, ValueError) as exception:
+            return STATUS_ERROR, repr(exception).encode()
+
+    async def _async_run(
+        self, client: DeliosClient, client_id: int, request: dict[str, Any]
+    ) -> tuple[int, bytes]:
+        """Run a request with a client."""
+        if request["op"] == "validate":
+            return (STATUS_OK if await client.validate() else STATUS_NONE), b""
+        if request["op"] == "login":
+            if await client.login(request["username"], request["password"]):
+                return STATUS_OK, b""
+            return STATUS_NONE, b""
+        endpoint = request["endpoint"]
+        variables = request.get("variables")
+        variables = None if variables is None else frozenset(variables)
+        if client.variables != variables:
+            client.variables = variables
+        if (data := await getattr(client, endpoint)()) is None:
+            return STATUS_NONE, b""
+        if endpoint in VARIABLE_DATA:
+            key = (client_id, endpoint)
+            body, self._names[key] = pack_variables(data, self._names.get(key))
+            return STATUS_OK, body
+        return STATUS_OK, pack_record(data)
+
+
+async def async_serve(lines: asyncio.StreamReader, write) -> None:
+    """Answer the request lines until the end of the input."""
+    tasks: set[asyncio.Task] = set()
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False)
+    ) as session:
+        server = DeliosWorkerServer(session)
+
+        async def async_reply(request: dict[str, Any]) -> None:
+            try:
+                status, body = await server.async_handle(request)
+            except Exception as exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Worker request failed")
+                status, body = STATUS_ERROR, repr(exception).encode()
+            write(FRAME_HEADER.pack(len(body), request["id"], status) + body)
+
+        while line := await lines.readline():
+            task = asyncio.create_task(async_reply(json_loads(line)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+
+
+async def _async_main() -> None:
+    """Serve requests from stdin to stdout."""
+    loop = asyncio.get_running_loop()
+    lines = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(lines), sys.stdin.buffer
+    )
+    output = sys.stdout.buffer
+
+    def write(frame: bytes) -> None:
+        output.write(frame)
+        output.flush()
+
+    await async_serve(lines, write)
+
+
+class DeliosWorker:
+    """Worker process, started on the first request."""
+
+    def __init__(self) -> None:
+        """Initialize a worker."""
+        self.clients: set[int] = set()
+        self._process: asyncio.subprocess.Process | None = None
+        self._reader: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[int, tuple[asyncio.Future, int, str | None]] = {}
+        self._names: dict[tuple[int, str], tuple[str, ...]] = {}
+
+    @property
+    def running(self) -> bool:
+        """Return whether the worker process is running."""
+        return self._process is not None and self._process.returncode is None
+
+    async def async_request(
+        self, request: dict[str, Any], endpoint: str | None = None
+    ) -> tuple[int, Any]:
+        """Send a request and wait for its status and decoded reply."""
+        async with self._lock:
+            if not self.running:
+                await self._async_start()
+            request_id = next(self._ids)
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = (future, request["client"], endpoint)
+            self._process.stdin.write(
+                json.dumps({"id": request_id, **request}).encode() + b"\n"
+            )
+            await self._process.stdin.drain()
+        return await asyncio.wait_for(future, WORKER_TIMEOUT)
+
+    async def _async_start(self) -> None:
+        """Start the worker process and read its replies."""
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            __name__,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            cwd=WORKER_ROOT,
+        )
+        self._names.clear()
+        self._reader = asyncio.create_task(self._async_read(self._process))
+        _LOGGER.debug("Started Delios worker %s", self._process.pid)
+
+    async def _async_read(self, process: asyncio.subprocess.Process) -> None:
+        """Resolve the pending requests with the replies of the worker."""
+        try:
+            while True:
+                header = await process.stdout.readexactly(FRAME_HEADER.size)
+                length, request_id, status = FRAME_HEADER.unpack(header)
+                body = await process.stdout.readexactly(length)
+                if (pending := self._pending.pop(request_id, None)) is None:
+                    continue
+                future, client_id, endpoint = pending
+                try:
+                    reply = self._decode(status, body, client_id, endpoint)
+                except DeliosWorkerError as exception:
+                    status, reply = STATUS_ERROR, exception
+                if not future.done():
+                    future.set_result((status, reply))
+        except asyncio.IncompleteReadError:
+            if self._process is process:
+                _LOGGER.warning("Delios worker exited, restarting on the next request")
+                self._process = None
+                await process.wait()
+        finally:
+            for future, _, _ in self._pending.values():
+                if not future.done():
+                    future.set_exception(
+                        aiohttp.ClientConnectionError("Delios worker exited")
+                    )
+            self._pending.clear()
+
+    def _decode(
+        self, status: int, body: bytes, client_id: int, endpoint: str | None
+    ) -> Any:
+        """Decode a reply body.
+
+        Replies are decoded even after their request timed out, so the
+        names of the values stay in sync with the worker.
+        """
+        if status != STATUS_OK:
+            return body.decode()
+        if endpoint in VARIABLE_DATA:
+            key = (client_id, endpoint)
+            data, self._names[key] = unpack_variables(
+                VARIABLE_DATA[endpoint], body, self._names.get(key)
+            )
+            return data
+        if endpoint in RECORD_DATA:
+            return unpack_record(RECORD_DATA[endpoint], body)
+        return None
+
+    @callback
+    def async_forget(self, client_id: int) -> None:
+        """Drop the value names of a closed client."""
+        for key in [key for key in self._names if key[0] == client_id]:
+            del self._names[key]
+
+    async def async_stop(self) -> None:
+        """Stop the worker process."""
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        if process.returncode is None:
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), DEFAULT_TIMEOUT)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+        _LOGGER.debug("Stopped Delios worker %s", process.pid)
+
+
+class DeliosWorkerPool:
+    """Worker processes shared by the inverters in worker mode."""
+
+    def __init__(self, size: int = WORKER_POOL_SIZE) -> None:
+        """Initialize a worker pool."""
+        self.workers = [DeliosWorker() for _ in range(size)]
+        self._ids = itertools.count(1)
+
+    @callback
+    def async_acquire(self) -> tuple[DeliosWorker, int]:
+        """Return the least busy worker and a new client id."""
+        worker = min(self.workers, key=lambda worker: len(worker.clients))
+        client_id = next(self._ids)
+        worker.clients.add(client_id)
+        return worker, client_id
+
+    async def async_release(self, worker: DeliosWorker, client_id: int) -> None:
+        """Release a client, stopping its worker once unused."""
+        worker.clients.discard(client_id)
+        worker.async_forget(client_id)
+        if not worker.clients:
+            await worker.async_stop()
+
+    async def async_stop(self) -> None:
+        """Stop every worker process."""
+        for worker in self.workers:
+            await worker.async_stop()
+
+
+@callback
+def async_get_worker_pool(hass: HomeAssistant) -> DeliosWorkerPool:
+    """Return the worker pool, stopped with Home Assistant."""
+    if (pool := hass.data.get(DATA_WORKERS)) is None:
+        pool = hass.data[DATA_WORKERS] = DeliosWorkerPool()
+
+        async def async_stop(event: Event) -> None:
+            await pool.async_stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop)
+    return pool
+
+
+class DeliosWorkerClient(DeliosTransport):
+    """Transport reading an inverter through a worker process."""
+
+    def __init__(self, pool: DeliosWorkerPool, host: str) -> None:
+        """Initialize a worker client."""
+        self._pool = pool
+        self._host = host
+        self._worker, self._id = pool.async_acquire()
+
+    @property
+    def host(self) -> str:
+        """Return the Web Server host."""
+        return self._host
+
+    async def validate(self) -> bool:
+        """Check the inverter is reachable from the worker."""
+        status, _ = await self._async_request({"op": "validate"})
+        return status == STATUS_OK
+
+    async def login(self, username: str, password: str) -> bool:
+        """Log the worker client in."""
+        status, _ = await self._async_request(
+            {"op": "login", "username": username, "password": password}
+        )
+        return status == STATUS_OK
+
+    async def close(self) -> None:
+        """Drop the worker client."""
+        if self._worker.running:
+            with contextlib.suppress(aiohttp.ClientError, asyncio.TimeoutError):
+                await self._async_request({"op": "close"})
+        await self._pool.async_release(self._worker, self._id)
+
+    async def sensors(self) -> SensorsData | None:
+        """Read sensors data through the worker."""
+        return await self._async_read("sensors")
+
+    async def status(self) -> StatusData | None:
+        """Read status data through the worker."""
+        return await self._async_read("status")
+
+    async def parameters(self) -> ParametersData | None:
+        """Read parameters data through the worker."""
+        return await self._async_read("parameters")
+
+    async def totalizer(self) -> TotalizerData | None:
+        """Read totalizer data through the worker."""
+        return await self._async_read("totalizer")
+
+    async def firmware(self) -> FirmwareData | None:
+        """Read firmware data through the worker."""
+        return await self._async_read("firmware")
+
+    async def _async_read(self, endpoint: str) -> Any:
+        """Read and decode an endpoint in the worker."""
+        status, reply = await self._async_request(
+            {
+                "op": "read",
+                "endpoint": endpoint,
+                "variables": None if self.variables is None else sorted(self.variables),
+            },
+            endpoint,
+        )
+        if status == STATUS_UNAUTHORIZED:
+            raise UnauthorizedClient
+        if status == STATUS_UNREACHABLE:
+            raise aiohttp.ClientConnectionError(reply)
+        if status == STATUS_ERROR:
+            raise DeliosWorkerError(reply)
+        return reply if status == STATUS_OK else None
+
+    async def _async_request(
+        self, request: dict[str, Any], endpoint: str | None = None
+    ) -> tuple[int, Any]:
+        """Send a request about this client to its worker."""
+        return await self._worker.async_request(
+            {"client": self._id, "host": self._host, **request}, endpoint
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    asyncio.run(_async_main())
@@ -0,0 +1,27 @@
+"""Headless Delios collector, runnable without Home Assistant.
+
+    python -m delios_collector 192.168.1.10 user:secret@192.168.1.11
+
+Importing the integration package runs its __init__, which needs Home
+Assistant. The collector and the modules it uses do not, so they are
+imported here as `delios_collector.delios`, a package sharing the
+integration directory whose __init__ is never executed.
+"""
+
+import importlib.util
+import os
+import sys
+
+INTEGRATION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "delios",
+)
+
+if f"{__name__}.delios" not in sys.modules:
+    _spec = importlib.util.spec_from_file_location(
+        f"{__name__}.delios",
+        os.path.join(INTEGRATION_DIR, "__init__.py"),
+        submodule_search_locations=[INTEGRATION_DIR],
+    )
+    sys.modules[_spec.name] = importlib.util.module_from_spec(_spec)
@@ -0,0 +1,7 @@
+"""Run the headless Delios collector."""
+
+import sys
+
+from .delios.collector import main
+
+sys.exit(main())
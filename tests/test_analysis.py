@@ -0,0 +1,47 @@
+"""Tests for the historical sample analysis."""
+
+import numpy as np
+import pytest
+
+from custom_components.delios.analysis import analyze
+
+HOUR = np.arange(0, 3601, 60, dtype=float)
+
+
+def test_analyze_summary():
+    """Test the summary report of a synthetic hour."""
+    sensors = {
+        "timestamp": HOUR,
+        "PowerPV": np.where(HOUR < 1800, 2.0, 4.0),
+        "PowerHouse": np.full(HOUR.shape, 1.0),
+        "IS1": np.full(HOUR.shape, 5.0),
+        "VS1": np.full(HOUR.shape, 300.0),
+        "IS2": np.full(HOUR.shape, 5.0),
+        "VS2": np.full(HOUR.shape, 100.0),
+    }
+    parameters = {
+        "timestamp": np.array([0.0, 86400.0, 172800.0]),
+        "Riso1": np.array([1000.0, 990.0, 980.0]),
+    }
+    totalizer = {
+        "timestamp": np.array([0.0, 3600.0]),
+        "photovoltaic": np.array([100.0, 103.0]),
+        "self_consumed": np.array([50.0, 51.5]),
+    }
+    report = analyze(sensors, parameters, totalizer)
+    assert report["samples"] == len(HOUR)
+    assert report["photovoltaic_energy"] == pytest.approx(3.0, abs=0.05)
+    assert report["house_energy"] == pytest.approx(1.0)
+    assert report["self_consumption_ratio"] == pytest.approx(0.5)
+    assert report["clipping"]["limit"] == pytest.approx(3.92)
+    assert report["clipping"]["hours"] == pytest.approx(0.5, abs=0.02)
+    assert report["string_imbalance"]["mean"] == pytest.approx(0.5)
+    assert report["riso_drift"]["Riso1"]["slope_per_day"] == pytest.approx(-10.0)
+
+
+def test_analyze_empty():
+    """Test an empty range yields an empty report."""
+    report = analyze({}, {}, {})
+    assert report["samples"] == 0
+    assert report["clipping"] is None
+    assert report["riso_drift"] is None
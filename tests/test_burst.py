@@ -0,0 +1,54 @@
+"""Tests for burst sampling."""
+
+import csv
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.delios.burst import DeliosBurst
+from custom_components.delios.client import SensorsData
+from custom_components.delios.inverter import DeliosInverter
+
+
+def _sensors(alarm: int = 0) -> SensorsData:
+    """Return dashboard data."""
+    return SensorsData(
+        {
+            "variables": [
+                {"ctrl_name": "PowerPV", "value": 1.5},
+                {"ctrl_name": "InvAlarm", "value": alarm},
+            ]
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_capture(hass):
+    """Test a burst writes every sample to a CSV file."""
+    coordinator = Mock(client=Mock(sensors=AsyncMock(return_value=_sensors())))
+    burst = DeliosBurst(hass, Mock(), DeliosInverter(name="test"), coordinator)
+    result = await burst._async_capture(0.01, 0.1)
+    assert result["errors"] == 0
+    assert 5 <= result["samples"] <= 11
+    with open(result["file"], encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["timestamp", "PowerPV", "InvAlarm"]
+    assert len(rows) == result["samples"] + 1
+    assert rows[1][1:] == ["1.5", "0.0"]
+
+
+def test_alarm_edge(hass):
+    """Test only the rising edge of an alarm starts a burst."""
+    coordinator = Mock(data={"sensors": _sensors(0)})
+    burst = DeliosBurst(hass, Mock(), DeliosInverter(name="test"), coordinator)
+    with patch.object(burst, "async_start") as start:
+        burst._async_alarm_updated()
+        coordinator.data = {"sensors": _sensors(3)}
+        burst._async_alarm_updated()
+        burst._async_alarm_updated()
+        assert start.call_count == 1
+        coordinator.data = {"sensors": _sensors(0)}
+        burst._async_alarm_updated()
+        coordinator.data = {"sensors": _sensors(2)}
+        burst._async_alarm_updated()
+        assert start.call_count == 2
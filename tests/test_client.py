@@ -0,0 +1,99 @@
+"""Tests for the Web Server client."""
+
+import json
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.delios.client import (
+    DEFAULT_TIMEOUT,
+    MIN_TIMEOUT,
+    AccessToken,
+    DeliosClient,
+    DeliosTransport,
+    ParametersData,
+    RequestLatency,
+    SensorsData,
+    json_loads,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_request_latency():
+    """Test timeouts follow the observed latency within the clamps."""
+    latency = RequestLatency()
+    assert latency.timeout == DEFAULT_TIMEOUT
+    for _ in range(20):
+        latency.observe(0.05)
+    assert latency.timeout == MIN_TIMEOUT
+    for _ in range(20):
+        latency.observe(1.5)
+    assert 1.5 < latency.timeout < DEFAULT_TIMEOUT
+
+    timeout = latency.timeout
+    latency.backoff = 1
+    assert latency.timeout == min(timeout * 2, DEFAULT_TIMEOUT)
+    latency.observe(1.5)
+    assert latency.backoff == 0
+
+
+def test_transport_methods():
+    """Test a transport missing a reader cannot be built."""
+
+    class PartialTransport(DeliosTransport):
+        async def validate(self):
+            return True
+
+        async def login(self, username, password):
+            return True
+
+    with pytest.raises(TypeError):
+        PartialTransport()
+
+
+def test_decode_fixtures():
+    """Test the fixture responses decode from bytes like from text."""
+    for name, data_class in (
+        ("dashboard.json", SensorsData),
+        ("info_system.json", ParametersData),
+    ):
+        body = (FIXTURES / name).read_bytes()
+        decoded = data_class(json_loads(body))
+        expected = data_class(json.loads(body.decode()))
+        assert decoded.names == expected.names
+        assert decoded.values(decoded.names) == expected.values(expected.names)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_responses(socket_enabled):
+    """Test unchanged bodies and 304 responses reuse the decoded object."""
+    body = (FIXTURES / "dashboard.json").read_bytes()
+    conditional = []
+
+    async def dashboard(request):
+        conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        if len(conditional) < 3:
+            return web.Response(body=body, content_type="application/json")
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": '"v1"'}
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/v1/dashboard", dashboard)
+    server = TestServer(app)
+    await server.start_server()
+    async with aiohttp.ClientSession() as session:
+        client = DeliosClient(session, f"{server.host}:{server.port}")
+        client.token = AccessToken(api_key="key")
+        first = await client.sensors()
+        assert await client.sensors() is first
+        assert await client.sensors() is first
+        assert await client.sensors() is first
+    await server.close()
+    assert conditional == [None, None, None, '"v1"']
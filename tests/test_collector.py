@@ -0,0 +1,125 @@
+"""Tests for the headless collector."""
+
+import asyncio
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.delios.client import AccessToken, DeliosClient
+from custom_components.delios.collector import (
+    CollectorTarget,
+    async_bench,
+    async_collect,
+    format_line,
+    parse_target,
+)
+
+# Run the collector with any Home Assistant import failing.
+WITHOUT_HOMEASSISTANT = """
+import runpy, sys
+sys.modules["homeassistant"] = None
+sys.argv[0] = "delios_collector"
+runpy.run_module("delios_collector", run_name="__main__", alter_sys=True)
+"""
+
+
+def test_parse_target():
+    """Test the target credentials default to the command line ones."""
+    assert parse_target("10.0.0.1", "user", "pw") == CollectorTarget(
+        host="10.0.0.1", username="user", password="pw"
+    )
+    assert parse_target("admin:secret@10.0.0.2", "user", "pw") == CollectorTarget(
+        host="10.0.0.2", username="admin", password="secret"
+    )
+
+
+def test_format_line():
+    """Test samples are formatted in line protocol."""
+    assert format_line("host 1", "sensors", 1.5, {"PowerPV": 2.0, "V=1": 3.0}) == (
+        "delios,host=host\\ 1,kind=sensors PowerPV=2.0,V\\=1=3.0 1500000000"
+    )
+
+
+@pytest.fixture
+async def web_server(socket_enabled, monkeypatch):
+    """Serve a fake Delios Web Server."""
+
+    # pylint: disable=unused-argument
+    async def login(self, username, password):
+        self._token = AccessToken(api_key="key")
+        return True
+
+    async def token(request):
+        return web.json_response(
+            {"api_key": "key", "expire": 0, "level": 1, "username": "user"}
+        )
+
+    async def dashboard(request):
+        assert request.headers["x-access-token"] == "key"
+        return web.json_response(
+            {
+                "variables": [
+                    {"ctrl_name": "PowerPV", "value": "1.5"},
+                    {"ctrl_name": "Alarm", "value": ""},
+                ]
+            }
+        )
+
+    monkeypatch.setattr(DeliosClient, "login", login)
+    app = web.Application()
+    app.router.add_get("/api/v1/token", token)
+    app.router.add_get("/api/v1/dashboard", dashboard)
+    server = TestServer(app)
+    await server.start_server()
+    yield f"{server.host}:{server.port}"
+    await server.close()
+
+
+@pytest.mark.asyncio
+async def test_collect(web_server):
+    """Test every poll of every target is written as a JSON line."""
+    output = io.StringIO()
+    await async_collect(
+        [CollectorTarget(host=web_server)] * 2, output=output, interval=0, count=2
+    )
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(lines) == 4
+    assert lines[0]["host"] == web_server
+    assert lines[0]["kind"] == "sensors"
+    assert lines[0]["PowerPV"] == 1.5
+    assert "Alarm" not in lines[0]
+
+
+@pytest.mark.asyncio
+async def test_bench(web_server):
+    """Test the benchmark reports the rate and latency of every target."""
+    results = await async_bench([CollectorTarget(host=web_server)], requests=5)
+    assert results[web_server]["requests"] == 5
+    assert results[web_server]["errors"] == 0
+    assert results[web_server]["rps"] > 0
+    assert results[web_server]["p50_ms"] <= results[web_server]["p99_ms"]
+
+
+@pytest.mark.asyncio
+async def test_collector_without_homeassistant(web_server):
+    """Test the collector command runs without Home Assistant."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        WITHOUT_HOMEASSISTANT,
+        web_server,
+        "--count",
+        "1",
+        cwd=Path(__file__).parent.parent,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    assert process.returncode == 0, stderr.decode()
+    (line,) = stdout.decode().splitlines()
+    assert json.loads(line)["PowerPV"] == 1.5
@@ -1,11 +1,13 @@
 """Tests for the config flow."""
 
-from unittest.mock import ANY, patch
+from unittest.mock import ANY, AsyncMock, patch
 
 import pytest
 import voluptuous as vol
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.delios.client import DeliosClient
+from custom_components.delios.config_flow import _valid_windows
 from custom_components.delios.const import (
     CONF_HOST,
     CONF_MODEL,
@@ -13,6 +15,7 @@ from custom_components.delios.const import (
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
+    CONF_WORKER,
     DOMAIN,
 )
 
@@ -94,3 +97,50 @@ async def test_flow_user_init(hass):
         assert False
     except vol.MultipleInvalid:
         pass
+
+
+@pytest.mark.asyncio
+async def test_options_worker(hass):
+    """Test the options are validated without starting a worker process."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        version=1,
+        title="test",
+        data={
+            CONF_NAME: "test",
+            CONF_MODEL: "IBRIDO DLS",
+            CONF_HOST: "localhost",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "user",
+            CONF_SCAN_INTERVAL: 10,
+        },
+        options={},
+    )
+    entry.add_to_hass(hass)
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    user_input = result["data_schema"]({CONF_WORKER: True})
+    with (
+        patch.multiple(
+            DeliosClient,
+            validate=AsyncMock(return_value=True),
+            login=AsyncMock(return_value=True),
+        ),
+        patch(
+            "custom_components.delios.coordinator.async_get_worker_pool"
+        ) as worker_pool,
+    ):
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input
+        )
+    assert result["type"] == "create_entry"
+    assert entry.options[CONF_WORKER] is True
+    worker_pool.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ("windows", "valid"),
+    [("60", True), ("300, 60", True), ("", False), (" , ", False), ("0", False)],
+)
+def test_valid_windows(windows, valid):
+    """Test the aggregate windows need at least one positive window."""
+    assert _valid_windows(windows) is valid
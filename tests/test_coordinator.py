@@ -0,0 +1,71 @@
+"""Tests for the coordinators."""
+
+import asyncio
+import itertools
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.helpers import issue_registry as ir
+
+from custom_components.delios.const import DOMAIN
+from custom_components.delios.coordinator import (
+    OVERRUN_POLLS,
+    DeliosCoordinator,
+    DeliosSensorsCoordinator,
+)
+from custom_components.delios.inverter import DeliosInverter
+
+
+@pytest.mark.asyncio
+async def test_interval_guard(hass):
+    """Test overrunning refreshes stretch the interval and raise an issue."""
+    coordinator = DeliosSensorsCoordinator(
+        hass, DeliosInverter(name="test", scan_interval=10)
+    )
+    issues = ir.async_get(hass)
+    with patch.object(coordinator, "async_request_refresh"):
+        for _ in range(OVERRUN_POLLS - 1):
+            coordinator._async_guard_interval(12)
+        assert coordinator.update_interval == timedelta(seconds=10)
+        coordinator._async_guard_interval(12)
+    assert coordinator.update_interval == timedelta(seconds=18)
+    issue_id = f"interval_overrun_{coordinator.inverter.unique_id}_sensors"
+    assert issues.async_get_issue(DOMAIN, issue_id) is not None
+
+    for _ in range(30):
+        coordinator._async_guard_interval(1)
+    assert coordinator.update_interval == timedelta(seconds=10)
+    assert issues.async_get_issue(DOMAIN, issue_id) is None
+
+
+@pytest.mark.asyncio
+async def test_interval_guard_failures(hass):
+    """Test only successful refreshes are measured against the interval."""
+    coordinator = DeliosSensorsCoordinator(
+        hass, DeliosInverter(name="test", scan_interval=10)
+    )
+    # Every refresh takes 12 seconds.
+    clock = Mock(monotonic=Mock(side_effect=itertools.count(0, 12)), time=time.time)
+    fetch = AsyncMock(side_effect=asyncio.TimeoutError)
+    with (
+        patch.object(coordinator, "_async_fetch_data", fetch),
+        patch("custom_components.delios.coordinator.time", clock),
+    ):
+        for _ in range(OVERRUN_POLLS * 2):
+            await coordinator._async_update_data()
+        assert coordinator.poll_errors == OVERRUN_POLLS * 2
+        assert coordinator.update_interval == timedelta(seconds=10)
+
+        fetch.side_effect = None
+        fetch.return_value = {}
+        for _ in range(OVERRUN_POLLS):
+            await coordinator._async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=18)
+
+
+def test_abstract_coordinator(hass):
+    """Test a coordinator without a fetch method cannot be built."""
+    with pytest.raises(TypeError):
+        DeliosCoordinator(hass, DeliosInverter(name="test"))
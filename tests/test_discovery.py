@@ -0,0 +1,102 @@
+"""Tests for the web server discovery."""
+
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.delios import discovery
+from custom_components.delios.const import (
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    DOMAIN,
+)
+
+
+def test_network_hosts():
+    """Test subnets are expanded to their host addresses."""
+    assert len(discovery.network_hosts("192.168.1.0/24")) == 254
+    assert discovery.network_hosts("192.168.1.7/30") == ["192.168.1.5", "192.168.1.6"]
+    with pytest.raises(ValueError):
+        discovery.network_hosts("10.0.0.0/8")
+    with pytest.raises(ValueError):
+        discovery.network_hosts("not a subnet")
+
+
+@pytest.mark.asyncio
+async def test_fingerprint(socket_enabled):
+    """Test only servers refusing anonymous tokens are Delios web servers."""
+
+    async def root(request):
+        return web.Response(text="Delios")
+
+    async def token(request):
+        return web.Response(status=401)
+
+    delios = web.Application()
+    delios.router.add_get("/", root)
+    delios.router.add_get("/api/v1/token", token)
+    other = web.Application()
+    other.router.add_get("/", root)
+    async with aiohttp.ClientSession() as session:
+        for app, expected in ((delios, True), (other, False)):
+            server = TestServer(app)
+            await server.start_server()
+            host = f"{server.host}:{server.port}"
+            assert await discovery.async_fingerprint(session, host) is expected
+            await server.close()
+
+
+@pytest.mark.asyncio
+async def test_discover():
+    """Test every host is probed and the Delios ones are returned in order."""
+    probed = []
+
+    async def fingerprint(session, host, timeout):
+        probed.append(host)
+        return host.endswith((".3", ".9"))
+
+    with patch.object(discovery, "async_fingerprint", fingerprint):
+        found = await discovery.async_discover(None, "10.1.2.0/28", parallel=4)
+    assert found == ["10.1.2.3", "10.1.2.9"]
+    assert len(probed) == 14
+
+
+@pytest.fixture(autouse=True)
+# pylint: disable=unused-argument
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Auto enable custom integrations."""
+    yield
+
+
+@pytest.mark.asyncio
+async def test_flow_discover(hass):
+    """Test a subnet entered as host shows the discovered web servers."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    with patch(
+        "custom_components.delios.config_flow.async_discover",
+        return_value=["192.168.1.20", "192.168.1.21"],
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {
+                CONF_NAME: "test",
+                CONF_MODEL: "IBRIDO DLS",
+                CONF_HOST: "192.168.1.0/24",
+                CONF_USERNAME: "user",
+                CONF_PASSWORD: "user",
+                CONF_SCAN_INTERVAL: 10,
+            },
+        )
+    assert result["step_id"] == "discover"
+    assert result["data_schema"]({CONF_HOST: "192.168.1.21"}) == {
+        CONF_HOST: "192.168.1.21"
+    }
@@ -0,0 +1,24 @@
+"""Tests for the columnar sample export."""
+
+import csv
+import gzip
+
+from custom_components.delios import export
+from custom_components.delios.export import write_rows
+
+
+def test_write_rows_csv_fallback(tmp_path, monkeypatch):
+    """Test rows are written to a gzipped CSV file without pyarrow."""
+    monkeypatch.setattr(export, "pyarrow", None)
+    path = write_rows(
+        str(tmp_path / "2024-01-01" / "sensors-000000"),
+        [
+            {"PowerPV": 1.5, "timestamp": 1.0},
+            {"PowerPV": 2.0, "PowerGrid": -0.5, "timestamp": 2.0},
+        ],
+    )
+    assert path.endswith(".csv.gz")
+    with gzip.open(path, "rt", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == ["timestamp", "PowerPV", "PowerGrid"]
+    assert rows[1] == {"timestamp": "2.0", "PowerPV": "2.0", "PowerGrid": "-0.5"}
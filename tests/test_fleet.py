@@ -0,0 +1,161 @@
+"""Tests for the fleet aggregate."""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.delios.client import SensorsData, TotalizerData
+from custom_components.delios.const import (
+    CONF_FLEET,
+    CONF_FRESHNESS,
+    CONF_HOST,
+    CONF_NAME,
+    CONF_SCAN_INTERVAL,
+    DATA_SENSORS_COORDINATOR,
+    DATA_SYSTEM_COORDINATOR,
+    DOMAIN,
+    SIGNAL_MEMBERS,
+)
+from custom_components.delios.fleet import DeliosFleetCoordinator
+from custom_components.delios.inverter import DeliosInverter
+
+
+def _sensors(power_pv: float) -> dict:
+    """Return sensors coordinator data."""
+    return {
+        "sensors": SensorsData(
+            {
+                "variables": [
+                    {"ctrl_name": "PowerPV", "value": power_pv},
+                    {"ctrl_name": "PowerGrid", "value": "n/a"},
+                ]
+            }
+        )
+    }
+
+
+def _totalizer(photovoltaic: float) -> dict:
+    """Return system coordinator data."""
+    return {
+        "totalizer": TotalizerData(
+            {
+                "totalizers": {
+                    "TotalEnergyPV": photovoltaic,
+                    "TotalEnergyBuyed": 1,
+                    "TotalEnergyInjected": 2,
+                    "TotalEnergySelfConsumed": 3,
+                }
+            }
+        )
+    }
+
+
+def _member(hass, name: str, power_pv: float, photovoltaic: float) -> dict:
+    """Store the coordinators of a fake inverter."""
+    listeners = []
+    remove_listener = Mock()
+    sensors = Mock(data=_sensors(power_pv), updated={"sensors": time.time()})
+    sensors.async_add_listener = (
+        lambda listener: listeners.append(listener) or remove_listener
+    )
+    system = Mock(data=_totalizer(photovoltaic))
+    system.async_add_listener = lambda listener: Mock()
+    hass.data.setdefault(DOMAIN, {})[name] = {
+        DATA_SENSORS_COORDINATOR: sensors,
+        DATA_SYSTEM_COORDINATOR: system,
+    }
+    return {
+        "sensors": sensors,
+        "listeners": listeners,
+        "remove_listener": remove_listener,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fleet_sums(hass):
+    """Test member changes are applied to the sums and stale members dropped."""
+    fleet = DeliosFleetCoordinator(hass, DeliosInverter(name="fleet"), 60)
+    first = _member(hass, "first", 1.5, 100)
+    _member(hass, "second", 2.0, 50)
+    data = await fleet._async_fetch_data()
+    assert data["members"] == 2
+    assert data["power"]["PowerPV"] == 3.5
+    assert data["power"]["PowerGrid"] == 0
+    assert data["energy"]["photovoltaic"] == 150
+    assert data["energy"]["self_consumed"] == 6
+
+    first["sensors"].data = _sensors(0.5)
+    for listener in first["listeners"]:
+        listener()
+    data = await fleet._async_fetch_data()
+    assert data["power"]["PowerPV"] == 2.5
+
+    with patch("custom_components.delios.fleet.time.time", return_value=1e12):
+        data = await fleet._async_fetch_data()
+    assert data["members"] == 0
+    assert data["power"]["PowerPV"] is None
+    assert data["energy"]["photovoltaic"] == 150
+
+
+@pytest.mark.asyncio
+# pylint: disable=unused-argument
+async def test_flow_fleet(hass, enable_custom_integrations):
+    """Test the fleet is offered once an inverter is configured."""
+    MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "localhost"}).add_to_hass(hass)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    assert result["type"] == "menu"
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": "fleet"}
+    )
+    assert result["step_id"] == "fleet"
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_NAME: "Site", CONF_SCAN_INTERVAL: 10, CONF_FRESHNESS: 60},
+    )
+    await hass.async_block_till_done()
+    assert result["type"] == "create_entry"
+    assert result["data"][CONF_FLEET] is True
+    assert hass.states.get("sensor.site_photovoltaic_power") is not None
+
+
+@pytest.mark.asyncio
+async def test_fleet_member_reload(hass):
+    """Test a reloaded member is followed again right away."""
+    fleet = DeliosFleetCoordinator(hass, DeliosInverter(name="fleet"), 60)
+    old = _member(hass, "first", 1.5, 100)
+    await fleet._async_fetch_data()
+    unsubscribe = async_dispatcher_connect(
+        hass, SIGNAL_MEMBERS, fleet.async_sync_members
+    )
+
+    hass.data[DOMAIN].pop("first")
+    async_dispatcher_send(hass, SIGNAL_MEMBERS)
+    old["remove_listener"].assert_called_once()
+
+    new = _member(hass, "first", 2.5, 100)
+    async_dispatcher_send(hass, SIGNAL_MEMBERS)
+    assert new["listeners"]
+    new["sensors"].data = _sensors(3.0)
+    for listener in new["listeners"]:
+        listener()
+    data = await fleet._async_fetch_data()
+    assert data["members"] == 1
+    assert data["power"]["PowerPV"] == 3.0
+    assert data["energy"]["photovoltaic"] == 100
+    unsubscribe()
+
+
+def test_fleet_unique_id():
+    """Test a fleet named like an inverter has its own unique id."""
+    assert (
+        DeliosInverter(name="Site", fleet=True).unique_id
+        != DeliosInverter(name="Site").unique_id
+    )
@@ -0,0 +1,80 @@
+"""Tests for the push ingestion."""
+
+from datetime import timedelta
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.delios.client import SensorsData, TotalizerData
+from custom_components.delios.const import (
+    DATA_SENSORS_COORDINATOR,
+    DATA_SYSTEM_COORDINATOR,
+)
+from custom_components.delios.coordinator import async_setup_coordinators
+from custom_components.delios.ingest import parse_payloads
+from custom_components.delios.inverter import DeliosInverter
+
+
+def test_parse_payloads():
+    """Test the payloads are parsed and grouped by coordinator."""
+    updates = parse_payloads(
+        {
+            "dashboard": {"variables": [{"ctrl_name": "PowerPV", "value": "1.5"}]},
+            "info/totalizer": {
+                "totalizers": {
+                    "TotalEnergyPV": "10",
+                    "TotalEnergyBuyed": "2",
+                    "TotalEnergyInjected": "3",
+                    "TotalEnergySelfConsumed": "4",
+                }
+            },
+        }
+    )
+    assert set(updates) == {DATA_SENSORS_COORDINATOR, DATA_SYSTEM_COORDINATOR}
+    assert isinstance(updates[DATA_SENSORS_COORDINATOR]["sensors"], SensorsData)
+    assert updates[DATA_SENSORS_COORDINATOR]["sensors"].get("PowerPV") == 1.5
+    assert isinstance(updates[DATA_SYSTEM_COORDINATOR]["totalizer"], TotalizerData)
+
+
+def test_parse_invalid_payloads():
+    """Test unknown endpoints and malformed payloads are rejected."""
+    with pytest.raises(ValueError):
+        parse_payloads({"info/unknown": {}})
+    with pytest.raises(ValueError):
+        parse_payloads({"info/totalizer": {"totalizers": {}}})
+    with pytest.raises(ValueError):
+        parse_payloads([])
+
+
+@pytest.mark.asyncio
+async def test_push_coordinators(hass):
+    """Test pushed inverters are never polled."""
+    inverter = DeliosInverter(name="push", host="localhost", push=True)
+    coordinators = await async_setup_coordinators(hass, inverter)
+    assert len(coordinators) == 2
+    for coordinator in coordinators:
+        assert coordinator.update_interval is None
+        assert coordinator.data is None
+
+
+@pytest.mark.asyncio
+async def test_push_expiry(hass, freezer):
+    """Test pushed data is dropped when the other poller stops pushing."""
+    inverter = DeliosInverter(
+        name="push", host="localhost", push=True, scan_interval=10, stale_grace=30
+    )
+    coordinator = (await async_setup_coordinators(hass, inverter))[0]
+    coordinator.async_set_device_data(
+        {"sensors": SensorsData({"variables": [{"ctrl_name": "PowerPV", "value": 1}]})}
+    )
+
+    freezer.tick(timedelta(seconds=35))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert "sensors" in coordinator.data
+
+    freezer.tick(timedelta(seconds=6))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert "sensors" not in coordinator.data
+    await coordinator.async_shutdown()
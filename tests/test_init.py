@@ -0,0 +1,157 @@
+"""Tests for the integration setup."""
+
+import gc
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.delios.client import AccessToken, DeliosClient
+from custom_components.delios.const import (
+    CONF_HOST,
+    CONF_JOURNAL_HOURS,
+    CONF_MODEL,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_SAMPLE_WINDOWS,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    DATA_SENSORS_COORDINATOR,
+    DOMAIN,
+)
+from custom_components.delios.coordinator import DeliosCoordinator, DeliosSensor
+
+DATA = {
+    CONF_NAME: "test",
+    CONF_MODEL: "IBRIDO DLS",
+    CONF_HOST: "localhost",
+    CONF_USERNAME: "user",
+    CONF_PASSWORD: "user",
+    CONF_SCAN_INTERVAL: 10,
+}
+
+
+@pytest.fixture(autouse=True)
+# pylint: disable=unused-argument
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Auto enable custom integrations."""
+    yield
+
+
+async def _async_setup(hass) -> MockConfigEntry:
+    """Set up an inverter entry."""
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_live_options(hass):
+    """Test interval and credentials changes are applied without a reload."""
+    entry = await _async_setup(hass)
+    data = next(iter(hass.data[DOMAIN].values()))
+    coordinator = data[DATA_SENSORS_COORDINATOR]
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry, options={CONF_SCAN_INTERVAL: 30, CONF_PASSWORD: "secret"}
+        )
+        await hass.async_block_till_done()
+        reload.assert_not_called()
+        assert data[DATA_SENSORS_COORDINATOR] is coordinator
+        assert coordinator.update_interval == timedelta(seconds=30)
+        assert coordinator.inverter.password == "secret"
+
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_SAMPLE_WINDOWS: "30"}
+        )
+        await hass.async_block_till_done()
+        reload.assert_called_once_with(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_journal_interval(hass):
+    """Test an interval change reloads a journaled entry to resize the journal."""
+    entry = await _async_setup(hass)
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        hass.config_entries.async_update_entry(entry, options={CONF_JOURNAL_HOURS: 1})
+        await hass.async_block_till_done()
+        reload.assert_called_once_with(entry.entry_id)
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch.object(hass.config_entries, "async_schedule_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_SCAN_INTERVAL: 30}
+        )
+        await hass.async_block_till_done()
+        reload.assert_called_once_with(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_token_reuse(hass):
+    """Test setup reuses the token of the config flow and of the last setup."""
+    logins = []
+
+    async def login(self, username, password):
+        logins.append(username)
+        self.token = AccessToken(api_key="key")
+        return True
+
+    with (
+        patch.object(DeliosClient, "login", login),
+        patch.object(DeliosClient, "validate", return_value=True),
+        patch.object(DeliosClient, "_DeliosClient__request", return_value=None),
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": "user"}
+        )
+        result = await hass.config_entries.flow.async_configure(result["flow_id"], DATA)
+        await hass.async_block_till_done()
+        assert result["type"] == "create_entry"
+        assert len(logins) == 1
+        data = next(iter(hass.data[DOMAIN].values()))
+        clients = {data[key].client for key in data if key.endswith("coordinator")}
+        assert len(clients) == 1
+
+        await hass.config_entries.async_reload(result["result"].entry_id)
+        await hass.async_block_till_done()
+        assert len(logins) == 1
+
+
+def _count(cls: type) -> int:
+    """Return the number of live instances of a class."""
+    gc.collect()
+    return sum(isinstance(obj, cls) for obj in gc.get_objects())
+
+
+def _timers(hass) -> int:
+    """Return the number of pending timers."""
+    return sum(
+        not timer.cancelled()
+        for timer in hass.loop._scheduled  # pylint: disable=protected-access
+    )
+
+
+@pytest.mark.asyncio
+async def test_reload_leak(hass):
+    """Test reloading an entry many times leaves no objects or timers behind."""
+    entry = await _async_setup(hass)
+    await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinators = _count(DeliosCoordinator)
+    sensors = _count(DeliosSensor)
+    timers = _timers(hass)
+    for _ in range(10):
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+    assert _count(DeliosCoordinator) == coordinators
+    assert _count(DeliosSensor) == sensors
+    assert _timers(hass) <= timers
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert DOMAIN not in hass.data or not hass.data[DOMAIN]
+    assert _count(DeliosCoordinator) == 0
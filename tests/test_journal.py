@@ -0,0 +1,47 @@
+"""Tests for the memory-mapped sample journal."""
+
+import pytest
+
+from custom_components.delios.journal import DeliosJournal
+
+
+def test_journal_survives_reopen(tmp_path):
+    """Test samples are read back after the journal is reopened."""
+    path = str(tmp_path / "inverter.journal")
+    journal = DeliosJournal(path, ["PowerPV", "PowerGrid"], 10)
+    journal.open()
+    journal.append(1.0, [1.5, -0.5])
+    journal.append(2.0, [2.5, 0.25])
+    journal.close()
+
+    journal = DeliosJournal(path, ["PowerPV", "PowerGrid"], 10)
+    journal.open()
+    assert journal.read() == [(1.0, 1.5, -0.5), (2.0, 2.5, 0.25)]
+    assert journal.read(start=1.5) == [(2.0, 2.5, 0.25)]
+    journal.close()
+
+
+def test_journal_wraps(tmp_path):
+    """Test the journal keeps a fixed number of records."""
+    journal = DeliosJournal(str(tmp_path / "inverter.journal"), ["PowerPV"], 4)
+    journal.open()
+    for second in range(10):
+        journal.append(float(second), [float(second)])
+    assert [record[0] for record in journal.read()] == [7.0, 8.0, 9.0]
+    journal.close()
+
+
+def test_journal_layout_change(tmp_path):
+    """Test a journal with different variables is reset."""
+    path = str(tmp_path / "inverter.journal")
+    journal = DeliosJournal(path, ["PowerPV"], 4)
+    journal.open()
+    journal.append(1.0, [1.0])
+    journal.close()
+
+    journal = DeliosJournal(path, ["PowerPV", "PowerBatt"], 4)
+    journal.open()
+    assert journal.read() == []
+    journal.append(2.0, [1.0, 2.0])
+    assert journal.read() == [(2.0, pytest.approx(1.0), pytest.approx(2.0))]
+    journal.close()
@@ -0,0 +1,89 @@
+"""Tests for the Prometheus metrics."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.delios.client import SensorsData, TotalizerData
+from custom_components.delios.const import DATA_METRICS, DOMAIN
+from custom_components.delios.coordinator import DeliosSensorsCoordinator
+from custom_components.delios.inverter import DeliosInverter
+from custom_components.delios.metrics import DeliosMetrics, DeliosMetricsView
+
+
+def _sensors() -> SensorsData:
+    """Return dashboard data."""
+    return SensorsData({"variables": [{"ctrl_name": "PowerPV", "value": "1.5"}]})
+
+
+def test_render_metrics():
+    """Test the latest coordinator data is rendered per metric family."""
+    coordinator = Mock(
+        kind="sensors",
+        last_poll_success=True,
+        poll_count=3,
+        poll_errors=1,
+        poll_duration=0.25,
+        data={
+            "sensors": _sensors(),
+            "parameters": None,
+            "totalizer": TotalizerData(
+                {
+                    "totalizers": {
+                        "TotalEnergyPV": "10",
+                        "TotalEnergyBuyed": "2",
+                        "TotalEnergyInjected": "3",
+                        "TotalEnergySelfConsumed": "4",
+                    }
+                }
+            ),
+        },
+    )
+    metrics = DeliosMetrics(DeliosInverter(name='roof "east"'), [coordinator])
+    metrics.async_render()
+    labels = 'inverter="roof \\"east\\""'
+    assert metrics.families["delios_up"] == (
+        f'delios_up{{{labels},coordinator="sensors"}} 1\n'
+    )
+    assert metrics.families["delios_dashboard_value"] == (
+        f'delios_dashboard_value{{{labels},variable="PowerPV"}} 1.5\n'
+    )
+    assert (
+        f'delios_energy_kwh_total{{{labels},totalizer="photovoltaic"}} 10.0\n'
+        in metrics.families["delios_energy_kwh_total"]
+    )
+    assert metrics.families["delios_parameter_value"] == ""
+
+
+@pytest.mark.asyncio
+async def test_scrape_failed_polls(hass):
+    """Test every poll renders once, failed ones included, scrapes only read."""
+    inverter = DeliosInverter(name="test")
+    coordinator = DeliosSensorsCoordinator(hass, inverter)
+    client = Mock(parameters=AsyncMock(return_value=None))
+    client.sensors = AsyncMock(return_value=_sensors())
+    coordinator.async_set_client(client)
+    await coordinator.async_refresh()
+    metrics = DeliosMetrics(inverter, [coordinator])
+    hass.data[DOMAIN] = {inverter.unique_id: {DATA_METRICS: metrics}}
+    view = DeliosMetricsView()
+    request = Mock(app={"hass": hass})
+    labels = 'inverter="test",coordinator="sensors"'
+
+    with patch.object(metrics, "async_render", wraps=metrics.async_render) as render:
+        detach = metrics.async_attach()
+        body = (await view.get(request)).body.decode()
+        assert f"delios_up{{{labels}}} 1\n" in body
+        client.sensors.side_effect = asyncio.TimeoutError
+        for errors in range(1, 4):
+            await coordinator.async_refresh()
+            for _ in range(2):
+                body = (await view.get(request)).body.decode()
+            assert render.call_count == errors + 1
+            assert f"delios_up{{{labels}}} 0\n" in body
+            assert f"delios_polls_total{{{labels}}} {errors + 1}\n" in body
+            assert f"delios_poll_errors_total{{{labels}}} {errors}\n" in body
+    detach()
+    await coordinator.async_refresh()
+    assert (await view.get(request)).body.decode() == body
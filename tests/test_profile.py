@@ -0,0 +1,189 @@
+"""Tests for the inverter profiles."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.delios.client import (
+    DeliosClient,
+    ParametersData,
+    SensorsData,
+    TotalizerData,
+    json_loads,
+)
+from custom_components.delios.const import (
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_PROFILE,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    DATA_SENSORS_COORDINATOR,
+    DATA_SYSTEM_COORDINATOR,
+    DOMAIN,
+)
+from custom_components.delios.entity import catalogue_attributes
+from custom_components.delios.inverter import inverter_from_data
+from custom_components.delios.profile import PROBE_MISSES, profile_from_data
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+DATA = {
+    CONF_NAME: "test",
+    CONF_MODEL: "IBRIDO DLS",
+    CONF_HOST: "localhost",
+    CONF_USERNAME: "user",
+    CONF_PASSWORD: "user",
+    CONF_SCAN_INTERVAL: 10,
+}
+
+
+@pytest.fixture(autouse=True)
+# pylint: disable=unused-argument
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Auto enable custom integrations."""
+    yield
+
+
+def _client() -> dict[str, AsyncMock]:
+    """Return client readers serving the fixture responses."""
+    dashboard = json_loads((FIXTURES / "dashboard.json").read_bytes())
+    system = json_loads((FIXTURES / "info_system.json").read_bytes())
+    totalizer = TotalizerData(
+        {
+            "totalizers": {
+                "TotalEnergyPV": 1,
+                "TotalEnergyBuyed": 2,
+                "TotalEnergyInjected": 3,
+                "TotalEnergySelfConsumed": 4,
+            }
+        }
+    )
+    return {
+        "sensors": AsyncMock(return_value=SensorsData(dashboard)),
+        "parameters": AsyncMock(return_value=ParametersData(system)),
+        "status": AsyncMock(return_value=None),
+        "totalizer": AsyncMock(return_value=totalizer),
+        "firmware": AsyncMock(return_value=None),
+    }
+
+
+@pytest.mark.asyncio
+async def test_probe_profile(hass):
+    """Test setups narrow the profile to what stays reported."""
+    dashboard = json_loads((FIXTURES / "dashboard.json").read_bytes())
+    client = _client()
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    inverter = inverter_from_data(DATA)
+    registry = er.async_get(hass)
+    with patch.multiple(DeliosClient, **client):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        # A single probe leaves nothing out.
+        profile = profile_from_data(entry.data[CONF_PROFILE], inverter)
+        assert profile.polls("status")
+        assert profile.creates("string_1_current")
+        assert hass.states.get("sensor.test_string_1_current") is not None
+
+        for _ in range(PROBE_MISSES - 1):
+            await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+
+        profile = profile_from_data(entry.data[CONF_PROFILE], inverter)
+        assert profile.endpoints == ("sensors", "parameters", "totalizer")
+        assert profile.creates("battery_power")
+        assert not profile.creates("string_1_current")
+        assert not profile.creates("usb")
+        assert "PowerBatt" in profile.variables
+        assert "FanSpeed" not in profile.variables
+        assert hass.states.get("sensor.test_battery_power") is not None
+        # Left out entities stay registered, without a state.
+        assert registry.async_get("sensor.test_string_1_current") is not None
+        assert hass.states.get("sensor.test_string_1_current").state == "unavailable"
+
+        # The client only decodes what the profile needs.
+        coordinators = hass.data[DOMAIN][inverter.unique_id]
+        coordinator = coordinators[DATA_SENSORS_COORDINATOR]
+        names = SensorsData(dashboard, coordinator.client.variables).names
+        assert "PowerBatt" in names
+        assert "VPV1" not in names
+
+        # Dropped endpoints are not polled after the probe.
+        client["status"].reset_mock()
+        await coordinators[DATA_SYSTEM_COORDINATOR].async_refresh()
+        client["status"].assert_not_called()
+
+        # Reported again, the entity comes back on the next setup.
+        client["sensors"].return_value = SensorsData(
+            {
+                "variables": [
+                    *dashboard["variables"],
+                    {"ctrl_name": "IS1", "value": 6.2},
+                ]
+            }
+        )
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert profile_from_data(entry.data[CONF_PROFILE], inverter).creates(
+            "string_1_current"
+        )
+        assert hass.states.get("sensor.test_string_1_current").state == "6.2"
+
+    assert (
+        profile_from_data(
+            entry.data[CONF_PROFILE],
+            inverter_from_data({**DATA, CONF_MODEL: "IBRIDO DLS-C"}),
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_catalogue(hass):
+    """Test unclaimed variables are disabled entities decoded once enabled."""
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    inverter = inverter_from_data(DATA)
+    registry = er.async_get(hass)
+    with patch.multiple(DeliosClient, **_client()):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        entity = registry.async_get("sensor.test_sensors_powerpv1")
+        assert entity.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+        assert hass.states.get("sensor.test_sensors_powerpv1") is None
+        assert registry.async_get("sensor.test_sensors_powerbatt") is None
+        client = hass.data[DOMAIN][inverter.unique_id][DATA_SENSORS_COORDINATOR].client
+        assert "PowerPV1" not in client.variables
+
+        registry.async_update_entity(entity.entity_id, disabled_by=None)
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+
+        client = hass.data[DOMAIN][inverter.unique_id][DATA_SENSORS_COORDINATOR].client
+        assert "PowerPV1" in client.variables
+        state = hass.states.get("sensor.test_sensors_powerpv1")
+        assert state.attributes["unit_of_measurement"] == "W"
+        assert state.attributes["state_class"] == "measurement"
+        # Variables without an override are not recorded as measurements.
+        entity = registry.async_get("sensor.test_sensors_statusinverter")
+        assert entity.capabilities is None
+        assert float(state.state) == pytest.approx(
+            SensorsData(json_loads((FIXTURES / "dashboard.json").read_bytes())).get(
+                "PowerPV1"
+            )
+            * 1000
+        )
+
+
+def test_catalogue_null_value():
+    """Test a catalogue variable reported as null has no value."""
+    attribute = catalogue_attributes((("sensors", "PowerPV1"),))[0]
+    sensors = SensorsData({"variables": [{"ctrl_name": "PowerPV1", "value": None}]})
+    assert attribute.value({"sensors": sensors}) is None
@@ -0,0 +1,96 @@
+"""Tests for the poll path profiling service."""
+
+import asyncio
+import os
+import pstats
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.delios.client import DeliosClient, SensorsData
+from custom_components.delios.const import (
+    ATTR_CONFIG_ENTRY,
+    ATTR_REFRESHES,
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    DATA_PROFILER,
+    DATA_SENSORS_COORDINATOR,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
+from custom_components.delios.inverter import inverter_from_data
+from custom_components.delios.profiler import PACKAGE_DIR
+
+DATA = {
+    CONF_NAME: "test",
+    CONF_MODEL: "IBRIDO DLS",
+    CONF_HOST: "localhost",
+    CONF_USERNAME: "user",
+    CONF_PASSWORD: "user",
+    CONF_SCAN_INTERVAL: 10,
+}
+
+
+@pytest.fixture(autouse=True)
+# pylint: disable=unused-argument
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Auto enable custom integrations."""
+    yield
+
+
+@pytest.mark.asyncio
+async def test_profile_service(hass):
+    """Test the next refreshes are profiled and summarized by stage."""
+    power = iter(range(1000))
+    readers = {
+        "sensors": AsyncMock(
+            side_effect=lambda: SensorsData(
+                {"variables": [{"ctrl_name": "PowerBatt", "value": next(power)}]}
+            )
+        ),
+        "parameters": AsyncMock(return_value=None),
+        "status": AsyncMock(return_value=None),
+        "totalizer": AsyncMock(return_value=None),
+        "firmware": AsyncMock(return_value=None),
+    }
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    with patch.multiple(DeliosClient, **readers):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][inverter_from_data(DATA).unique_id][
+            DATA_SENSORS_COORDINATOR
+        ]
+
+        call = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                SERVICE_PROFILE,
+                {ATTR_CONFIG_ENTRY: entry.entry_id, ATTR_REFRESHES: 3},
+                blocking=True,
+                return_response=True,
+            )
+        )
+        while hass.data.get(DATA_PROFILER) is None:
+            await asyncio.sleep(0)
+        for _ in range(3):
+            await coordinator.async_refresh()
+        response = await call
+
+    assert hass.data.get(DATA_PROFILER) is None
+    assert coordinator.profiler is None
+    assert response["refreshes"][entry.entry_id] >= 3
+    stages = response["stages"]
+    assert stages["request"]["calls"] >= 3
+    assert stages["request"]["cpu_ms"] is None
+    assert stages["compute"]["calls"] > 0
+    assert stages["write"]["calls"] > 0
+    assert os.path.exists(response["file"])
+    files = {file for file, _, _ in pstats.Stats(response["file"]).stats}
+    assert all(file.startswith(PACKAGE_DIR) for file in files)
+    assert os.path.join(PACKAGE_DIR, "coordinator.py") in files
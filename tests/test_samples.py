@@ -0,0 +1,29 @@
+"""Tests for the high-rate sample buffer."""
+
+import pytest
+
+from custom_components.delios.samples import SampleRing
+
+
+def test_ring_fixed_size():
+    """Test the oldest samples are overwritten once the buffer is full."""
+    ring = SampleRing(["PowerPV"], 3)
+    for second in range(5):
+        ring.append(float(second), {"PowerPV": float(second)})
+    assert len(ring) == 3
+    assert ring.window("PowerPV", 0.0) == [4.0, 3.0, 2.0]
+
+
+def test_ring_aggregate():
+    """Test rolling aggregates over a window."""
+    ring = SampleRing(["PowerPV", "PowerGrid"], 10)
+    for second in range(10):
+        ring.append(float(second), {"PowerPV": float(second)})
+    aggregate = ring.aggregate("PowerPV", 5.0)
+    assert aggregate.count == 5
+    assert aggregate.min == 5.0
+    assert aggregate.max == 9.0
+    assert aggregate.mean == pytest.approx(7.0)
+    assert aggregate.p50 == pytest.approx(7.0)
+    assert aggregate.p95 == pytest.approx(8.8)
+    assert ring.aggregate("PowerGrid", 0.0).count == 0
@@ -1,11 +1,14 @@
 """Tests for the sensor entity."""
 
-from unittest.mock import Mock
+import time
+from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.delios.client import SensorsData
 from custom_components.delios.const import (
     CONF_HOST,
     CONF_MODEL,
@@ -15,7 +18,12 @@ from custom_components.delios.const import (
     CONF_USERNAME,
     DOMAIN,
 )
-from custom_components.delios.coordinator import DeliosSensor
+from custom_components.delios.coordinator import (
+    DeliosSensor,
+    DeliosSensorsCoordinator,
+)
+from custom_components.delios.entity import SENSORS
+from custom_components.delios.inverter import DeliosInverter
 from custom_components.delios.sensor import async_setup_entry
 
 
@@ -41,3 +49,63 @@ async def test_init_entry(hass):
         ],
         DeliosSensor,
     )
+
+
+@pytest.mark.asyncio
+async def test_stale_data(hass):
+    """Test failed polls keep the last values until the grace window passes."""
+    coordinator = DeliosSensorsCoordinator(
+        hass, DeliosInverter(name="test", scan_interval=10, stale_grace=30)
+    )
+    client = Mock()
+    client.sensors = AsyncMock(
+        return_value=SensorsData(
+            {"variables": [{"ctrl_name": "PowerBatt", "value": 1.5}]}
+        )
+    )
+    client.parameters = AsyncMock(return_value=None)
+    coordinator.async_set_client(client)
+    await coordinator.async_refresh()
+    sensor = DeliosSensor(coordinator, SENSORS[0])
+    sensor.async_write_ha_state = Mock()
+    remove_stale_listener = coordinator.async_add_stale_listener(
+        sensor._handle_stale_update
+    )
+    listener = Mock()
+    remove_listener = coordinator.async_add_listener(listener)
+    assert sensor.available
+    assert sensor.native_value == 1500
+    assert sensor.extra_state_attributes is None
+
+    client.sensors.side_effect = aiohttp.ClientError
+    await coordinator.async_refresh()
+    # Only the entities reading the stale kind refresh, samples are not
+    # published again.
+    listener.assert_not_called()
+    sensor.async_write_ha_state.assert_called_once()
+    remove_listener()
+    remove_stale_listener()
+    sensor._handle_coordinator_update()
+    assert coordinator.last_update_success
+    assert sensor.available
+    assert sensor.native_value == 1500
+    assert "last_updated_from_device" in sensor.extra_state_attributes
+
+    with patch(
+        "custom_components.delios.coordinator.time.time",
+        return_value=time.time() + 60,
+    ):
+        await coordinator.async_refresh()
+    sensor._handle_coordinator_update()
+    assert "sensors" not in coordinator.data
+    assert not sensor.available
+
+
+def test_shared_metadata():
+    """Test entities share their description and device info."""
+    coordinator = Mock(inverter=DeliosInverter(name="test"), data=None)
+    first = DeliosSensor(coordinator, SENSORS[0])
+    second = DeliosSensor(coordinator, SENSORS[0])
+    assert first.entity_description is second.entity_description
+    assert first.device_info is second.device_info
+    assert first.entity_description.key == SENSORS[0].key
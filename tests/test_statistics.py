@@ -0,0 +1,103 @@
+"""Tests for the long-term statistics importer."""
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pytest
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    get_metadata,
+    statistics_during_period,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.delios.client import SensorsData, TotalizerData
+from custom_components.delios.inverter import DeliosInverter
+from custom_components.delios.statistics import DeliosStatistics, interpolate_hourly
+
+START = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _totalizer(photovoltaic: float) -> TotalizerData:
+    """Return totalizer data in kWh."""
+    return TotalizerData(
+        {
+            "totalizers": {
+                "TotalEnergyPV": photovoltaic,
+                "TotalEnergyBuyed": 0,
+                "TotalEnergyInjected": 0,
+                "TotalEnergySelfConsumed": 0,
+            }
+        }
+    )
+
+
+def test_interpolate_linear():
+    """Test a gap without power samples is spread evenly."""
+    rows = interpolate_hourly(START, 100.0, START + timedelta(hours=4), 104.0)
+    assert [hour for hour, _ in rows] == [START + timedelta(hours=h) for h in range(4)]
+    assert [value for _, value in rows] == pytest.approx([101.0, 102.0, 103.0, 104.0])
+
+
+def test_interpolate_partial_hours():
+    """Test only complete hours are returned."""
+    rows = interpolate_hourly(
+        START + timedelta(minutes=30),
+        100.0,
+        START + timedelta(hours=2, minutes=30),
+        102.0,
+    )
+    assert [hour for hour, _ in rows] == [START, START + timedelta(hours=1)]
+    assert [value for _, value in rows] == pytest.approx([100.5, 101.5])
+
+
+def test_interpolate_weighted():
+    """Test integrated power shapes the gap."""
+    weights = {START: 3.0, START + timedelta(hours=1): 1.0}
+    rows = interpolate_hourly(
+        START, 100.0, START + timedelta(hours=3), 108.0, weights=weights
+    )
+    assert [value for _, value in rows] == pytest.approx([103.0, 104.0, 108.0])
+
+
+@pytest.mark.asyncio
+async def test_import_statistics(recorder_mock, hass):
+    """Test the imported hours split the kWh deltas by the kW power samples."""
+    statistics = DeliosStatistics(hass, DeliosInverter(name="test"))
+    await statistics.async_import(_totalizer(100.0), now=START)
+    # 2 kW of photovoltaic power for the first hour, nothing measured after.
+    for minutes in (0, 30, 60):
+        statistics.async_add_power_sample(
+            SensorsData({"variables": [{"ctrl_name": "PowerPV", "value": 2.0}]}),
+            now=START + timedelta(minutes=minutes),
+        )
+    await statistics.async_import(_totalizer(108.0), now=START + timedelta(hours=3))
+    await async_wait_recording_done(hass)
+
+    statistic_id = statistics.statistic_id("photovoltaic")
+    assert statistic_id == "delios:test_photovoltaic_energy_total"
+    rows = (
+        await get_instance(hass).async_add_executor_job(
+            statistics_during_period,
+            hass,
+            START,
+            None,
+            {statistic_id},
+            "hour",
+            None,
+            {"state", "sum"},
+        )
+    )[statistic_id]
+    assert [row["start"] for row in rows] == [
+        (START + timedelta(hours=hour)).timestamp() for hour in range(3)
+    ]
+    assert [row["state"] for row in rows] == pytest.approx([102.0, 105.0, 108.0])
+    assert [row["sum"] for row in rows] == pytest.approx([2.0, 5.0, 8.0])
+
+    metadata = await get_instance(hass).async_add_executor_job(
+        partial(get_metadata, hass, statistic_ids={statistic_id})
+    )
+    assert metadata[statistic_id][1]["unit_of_measurement"] == "kWh"
+    assert metadata[statistic_id][1]["has_sum"]
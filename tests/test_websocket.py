@@ -0,0 +1,148 @@
+"""Tests for the Delios websocket API."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.delios.client import DeliosClient, SensorsData
+from custom_components.delios.const import (
+    CONF_HOST,
+    CONF_MODEL,
+    CONF_NAME,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    DATA_SENSORS_COORDINATOR,
+    DOMAIN,
+)
+from custom_components.delios.inverter import inverter_from_data
+
+DATA = {
+    CONF_NAME: "test",
+    CONF_MODEL: "IBRIDO DLS",
+    CONF_HOST: "localhost",
+    CONF_USERNAME: "user",
+    CONF_PASSWORD: "user",
+    CONF_SCAN_INTERVAL: 10,
+}
+
+
+@pytest.fixture(autouse=True)
+# pylint: disable=unused-argument
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Auto enable custom integrations."""
+    yield
+
+
+@pytest.mark.asyncio
+async def test_subscribe_scan_interval(hass, hass_ws_client):
+    """Test a faster subscriber poll leaves the coordinator interval alone."""
+    power = iter(range(1000))
+    readers = {
+        "sensors": AsyncMock(
+            side_effect=lambda: SensorsData(
+                {"variables": [{"ctrl_name": "PowerPV", "value": next(power)}]}
+            )
+        ),
+        "parameters": AsyncMock(return_value=None),
+        "status": AsyncMock(return_value=None),
+        "totalizer": AsyncMock(return_value=None),
+        "firmware": AsyncMock(return_value=None),
+    }
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    with patch.multiple(DeliosClient, **readers):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][inverter_from_data(DATA).unique_id][
+            DATA_SENSORS_COORDINATOR
+        ]
+        cached = coordinator.data["sensors"].get("PowerPV")
+        entity_state = hass.states.get("sensor.test_photovoltaic_power")
+        assert entity_state is not None
+
+        client = await hass_ws_client(hass)
+        await client.send_json(
+            {
+                "id": 1,
+                "type": f"{DOMAIN}/subscribe",
+                "config_entry": entry.entry_id,
+                "fields": ["photovoltaic_power"],
+                "scan_interval": 1,
+            }
+        )
+        assert (await client.receive_json())["success"]
+        first = (await client.receive_json())["event"]
+        polled = (await client.receive_json())["event"]
+
+        assert first["photovoltaic_power"] == cached * 1000
+        assert polled["photovoltaic_power"] > first["photovoltaic_power"]
+        assert coordinator.update_interval == timedelta(seconds=10)
+        assert coordinator.data["sensors"].get("PowerPV") == cached
+        assert hass.states.get("sensor.test_photovoltaic_power") == entity_state
+
+        await client.send_json(
+            {"id": 2, "type": "unsubscribe_events", "subscription": 1}
+        )
+        assert (await client.receive_json())["success"]
+        await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_live_poll(hass, hass_ws_client):
+    """Test subscribers asking for a faster interval share one poll."""
+    power = iter(range(1000))
+    readers = {
+        "sensors": AsyncMock(
+            side_effect=lambda: SensorsData(
+                {"variables": [{"ctrl_name": "PowerPV", "value": next(power)}]}
+            )
+        ),
+        "parameters": AsyncMock(return_value=None),
+        "status": AsyncMock(return_value=None),
+        "totalizer": AsyncMock(return_value=None),
+        "firmware": AsyncMock(return_value=None),
+    }
+    entry = MockConfigEntry(domain=DOMAIN, title="test", data=DATA, options={})
+    entry.add_to_hass(hass)
+    with patch.multiple(DeliosClient, **readers):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        readers["sensors"].reset_mock()
+
+        client = await hass_ws_client(hass)
+        for subscription, interval in ((1, 2), (2, 1)):
+            await client.send_json(
+                {
+                    "id": subscription,
+                    "type": f"{DOMAIN}/subscribe",
+                    "config_entry": entry.entry_id,
+                    "fields": ["photovoltaic_power"],
+                    "scan_interval": interval,
+                }
+            )
+        events: dict[int, list[float]] = {1: [], 2: []}
+        while len(events[1]) < 4 or len(events[2]) < 4:
+            message = await client.receive_json()
+            if message["type"] == "event":
+                events[message["id"]].append(message["event"]["photovoltaic_power"])
+
+        # Both subscribers receive the same reads, one per second.
+        assert events[1][-2:] == events[2][-2:]
+        assert readers["sensors"].await_count <= len(set(events[1] + events[2]))
+
+        for subscription in (1, 2):
+            await client.send_json(
+                {
+                    "id": subscription + 2,
+                    "type": "unsubscribe_events",
+                    "subscription": subscription,
+                }
+            )
+        await hass.async_block_till_done()
+        reads = readers["sensors"].await_count
+        await asyncio.sleep(1.1)
+        assert readers["sensors"].await_count == reads
@@ -0,0 +1,90 @@
+"""Tests for the poller worker processes."""
+
+import math
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.delios.client import SensorsData, TotalizerData, json_loads
+from custom_components.delios.worker import (
+    DeliosWorkerClient,
+    DeliosWorkerPool,
+    pack_record,
+    pack_variables,
+    unpack_record,
+    unpack_variables,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+TOTALIZERS = {
+    "totalizers": {
+        "TotalEnergyPV": 1.5,
+        "TotalEnergyBuyed": 2,
+        "TotalEnergyInjected": 3,
+        "TotalEnergySelfConsumed": 4,
+    }
+}
+
+
+def test_frames():
+    """Test values travel as doubles with their names sent once."""
+    sensors = SensorsData(json_loads((FIXTURES / "dashboard.json").read_bytes()))
+    body, names = pack_variables(sensors, None)
+    again, _ = pack_variables(sensors, names)
+    assert len(again) < len(body)
+    assert len(again) == 3 + 8 * len(names)
+
+    unpacked, received = unpack_variables(SensorsData, body, None)
+    assert received == names
+    unpacked, _ = unpack_variables(SensorsData, again, received)
+    expected = [value for value in sensors.values(names) if not math.isnan(value)]
+    assert unpacked.values(unpacked.names) == expected
+
+    totalizer = unpack_record(TotalizerData, pack_record(TotalizerData(TOTALIZERS)))
+    assert totalizer.photovoltaic == 1.5
+    assert totalizer.self_consumed == 4
+
+
+@pytest.mark.asyncio
+async def test_worker_client(socket_enabled):
+    """Test a worker process logs in, reads and decodes for the client."""
+    body = (FIXTURES / "dashboard.json").read_bytes()
+
+    async def token(request):
+        return web.json_response(
+            {"api_key": "key", "expire": 0, "level": 1, "username": "user"}
+        )
+
+    async def dashboard(request):
+        if request.headers.get("x-access-token") != "key":
+            return web.Response(status=401)
+        return web.Response(body=body, content_type="application/json")
+
+    async def totalizer(request):
+        return web.json_response(TOTALIZERS)
+
+    app = web.Application()
+    app.router.add_get("/api/v1/token", token)
+    app.router.add_get("/api/v1/dashboard", dashboard)
+    app.router.add_get("/api/v1/info/totalizer", totalizer)
+    server = TestServer(app)
+    await server.start_server()
+    pool = DeliosWorkerPool(1)
+    client = DeliosWorkerClient(pool, f"{server.host}:{server.port}")
+    try:
+        assert await client.login("user", "user")
+        sensors = await client.sensors()
+        assert sensors.names == SensorsData(json_loads(body)).names
+        assert (await client.sensors()).names == sensors.names
+        assert (await client.totalizer()).buyed == 2
+
+        client.variables = frozenset({"PowerPV"})
+        assert (await client.sensors()).names == ["PowerPV"]
+        assert await client.status() is None
+    finally:
+        await client.close()
+        await server.close()
+    assert not pool.workers[0].running